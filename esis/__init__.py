@@ -1,15 +1,18 @@
 """Model the ESIS optical system and invert images captured during flight."""
 
-from ._caching import memory
+from ._caching import memory, cache
 from . import optics
 from . import nsroc
 from . import data
+from . import inversions
 from . import flights
 
 __all__ = [
     "memory",
+    "cache",
     "optics",
     "nsroc",
     "data",
+    "inversions",
     "flights",
 ]
@@ -1,11 +1,289 @@
+from typing import Any, Callable, Iterable
+import os
+import glob
+import hashlib
+import inspect
 import pathlib
+import importlib.metadata
+import functools
+import dataclasses
 import joblib
 
 __all__ = [
     "memory",
+    "Cache",
+    "cache",
 ]
 
 _path_cache = pathlib.Path.home() / ".esis/cache"
 
 memory = joblib.Memory(location=_path_cache, mmap_mode="r", verbose=0)
 """A representation of the cache which stores intermediate results."""
+
+_hashes: dict[tuple[str, int, int], str] = dict()
+"""
+The content hash of each file which has been read by this process,
+keyed on the path, size, and modification time of the file.
+"""
+
+
+def _hash_file(path: str) -> str:
+    """
+    Compute the SHA-256 hash of the contents of a file.
+
+    The result is memoized on the size and modification time of the file,
+    so each file is only read once per process unless it changes.
+
+    Parameters
+    ----------
+    path
+        The file to hash.
+    """
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if key not in _hashes:
+        with open(path, "rb") as f:
+            _hashes[key] = hashlib.file_digest(f, "sha256").hexdigest()
+    return _hashes[key]
+
+
+def _fields(a: Any) -> Any:
+    """
+    Replace every dataclass in an object with the values of its fields.
+
+    Cached properties and other state stored in the ``__dict__`` of a dataclass
+    are not part of its value,
+    so they are dropped before hashing the arguments of a cached function.
+
+    Parameters
+    ----------
+    a
+        The object to convert.
+    """
+    if dataclasses.is_dataclass(a) and not isinstance(a, type):
+        fields = {f.name: _fields(getattr(a, f.name)) for f in dataclasses.fields(a)}
+        return type(a).__module__, type(a).__qualname__, fields
+    if isinstance(a, dict):
+        return {k: _fields(a[k]) for k in a}
+    if isinstance(a, (list, tuple)):
+        return type(a).__name__, [_fields(v) for v in a]
+    return a
+
+
+@dataclasses.dataclass(eq=False)
+class Cache:
+    """
+    A persistent cache keyed on the content of the inputs of each function.
+
+    Unlike :obj:`memory`, which is only keyed on the arguments of a function,
+    the key of each result also contains the source code of the
+    module which defines the function and the contents of the files it
+    depends on.
+    Code in other modules is not tracked automatically,
+    so functions which wrap code from other modules should list those
+    modules in the `paths` argument of :meth:`memoize`,
+    and the installed packages they depend on in the `packages` argument.
+    So modifying the raw data, the optical constants, or the fitting code
+    invalidates the result instead of silently returning a stale copy.
+
+    The total size of the cache is bounded by :attr:`size_max`,
+    and the least-recently used results are evicted first.
+
+    Examples
+    --------
+    Cache the result of a function which reads a file.
+
+    .. code-block:: python
+
+        import pathlib
+        import esis
+
+        path = pathlib.Path("data.txt")
+
+        @esis.cache.memoize(paths=[path])
+        def read():
+            return path.read_text()
+
+        read()
+        print(esis.cache.hits, esis.cache.misses)
+    """
+
+    location: pathlib.Path = _path_cache / "content"
+    """The directory where the cached results are stored."""
+
+    size_max: int = 10 * 2**30
+    """The maximum total size of the cached results in bytes."""
+
+    mmap_mode: None | str = "r"
+    """The mode used by :func:`joblib.load` to memory-map cached arrays."""
+
+    hits: int = 0
+    """The number of results which were loaded from the cache."""
+
+    misses: int = 0
+    """The number of results which had to be recomputed."""
+
+    @property
+    def size(self) -> int:
+        """The current total size of the cached results in bytes."""
+        return sum(p.stat().st_size for p in self._files())
+
+    def _files(self) -> list[pathlib.Path]:
+        return list(pathlib.Path(self.location).glob("*/*.pkl"))
+
+    def key(
+        self,
+        func: Callable,
+        paths: Iterable[str | pathlib.Path],
+        args: tuple,
+        kwargs: dict[str, Any],
+        packages: Iterable[str] = (),
+    ) -> str:
+        """
+        Compute the key of a single call to a cached function.
+
+        Dataclass arguments are hashed using only the values of their fields,
+        so state cached on an argument, such as a
+        :func:`functools.cached_property`, does not change the key.
+
+        Parameters
+        ----------
+        func
+            The function being called.
+        paths
+            Files or glob patterns matching the files which `func` depends on.
+        args
+            The positional arguments passed to `func`.
+        kwargs
+            The keyword arguments passed to `func`.
+        packages
+            The names of the installed distributions which `func` depends on,
+            whose versions are part of the key.
+        """
+        signature = inspect.signature(func).bind(*args, **kwargs)
+        signature.apply_defaults()
+
+        files = sorted(
+            file
+            for path in paths
+            for file in glob.glob(str(path), recursive=True)
+            if os.path.isfile(file)
+        )
+
+        h = hashlib.sha256()
+        h.update(func.__module__.encode())
+        h.update(func.__qualname__.encode())
+        h.update(_hash_file(inspect.getsourcefile(func)).encode())
+        h.update(joblib.hash(_fields(signature.arguments)).encode())
+        for file in files:
+            h.update(os.path.basename(file).encode())
+            h.update(_hash_file(file).encode())
+        for package in sorted(packages):
+            version = importlib.metadata.version(package)
+            h.update(f"{package}=={version}".encode())
+
+        return h.hexdigest()
+
+    def memoize(
+        self,
+        func: None | Callable = None,
+        paths: Iterable[str | pathlib.Path] = (),
+        packages: Iterable[str] = (),
+        mmap_mode: None | str = dataclasses.MISSING,
+    ) -> Callable:
+        """
+        Decorate a function so that its results are stored in this cache.
+
+        Parameters
+        ----------
+        func
+            The function to decorate.
+            If :obj:`None`, this method returns a decorator.
+        paths
+            Files or glob patterns matching the files which `func` depends on.
+        packages
+            The names of the installed distributions which `func` depends on,
+            such as ``"optika"``, so that upgrading them invalidates the
+            cached results.
+        mmap_mode
+            The mode used to memory-map the arrays in the cached results.
+            If not given, :attr:`mmap_mode` is used.
+            Results which are modified after they are loaded should use
+            :obj:`None`, since memory-mapped arrays are read-only.
+        """
+        if func is None:
+            return functools.partial(
+                self.memoize,
+                paths=paths,
+                packages=packages,
+                mmap_mode=mmap_mode,
+            )
+
+        paths = tuple(paths)
+        packages = tuple(packages)
+
+        if mmap_mode is dataclasses.MISSING:
+            mmap_mode = self.mmap_mode
+
+        directory = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = self.key(func, paths, args, kwargs, packages)
+            path = pathlib.Path(self.location) / directory / f"{key}.pkl"
+
+            if path.exists():
+                self.hits += 1
+                os.utime(path)
+                return joblib.load(path, mmap_mode=mmap_mode)
+
+            self.misses += 1
+            result = func(*args, **kwargs)
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path_tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            joblib.dump(result, path_tmp)
+            os.replace(path_tmp, path)
+
+            self.evict(keep=path)
+
+            return result
+
+        return wrapper
+
+    def evict(
+        self,
+        keep: None | pathlib.Path = None,
+    ) -> None:
+        """
+        Remove the least-recently used results until the cache is small enough.
+
+        Parameters
+        ----------
+        keep
+            A result which should never be removed,
+            usually the one which was just stored.
+        """
+        files = [(p.stat(), p) for p in self._files()]
+        files.sort(key=lambda f: f[0].st_mtime_ns)
+
+        size = sum(stat.st_size for stat, _ in files)
+
+        for stat, p in files:
+            if size <= self.size_max:
+                break
+            if p == keep:
+                continue
+            p.unlink(missing_ok=True)
+            size -= stat.st_size
+
+    def clear(self) -> None:
+        """Remove every result from the cache and reset the statistics."""
+        for p in self._files():
+            p.unlink(missing_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+
+cache = Cache()
+"""The cache which stores results keyed on the content of their inputs."""
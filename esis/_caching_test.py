@@ -0,0 +1,86 @@
+import pathlib
+import functools
+import dataclasses
+import esis
+
+
+def test_cache(tmp_path: pathlib.Path):
+    cache = esis._caching.Cache(location=tmp_path / "cache")
+
+    path = tmp_path / "data.txt"
+    path.write_text("a")
+
+    @cache.memoize(paths=[tmp_path / "*.txt"])
+    def read(suffix: str = "") -> str:
+        return path.read_text() + suffix
+
+    assert read() == "a"
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    assert read() == "a"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert read(suffix="b") == "ab"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    path.write_text("aa")
+    assert read() == "aa"
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    assert cache.size > 0
+    cache.clear()
+    assert cache.size == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_cache_evict(tmp_path: pathlib.Path):
+    cache = esis._caching.Cache(location=tmp_path / "cache", size_max=0)
+
+    @cache.memoize
+    def square(x: int) -> int:
+        return x * x
+
+    assert square(2) == 4
+    assert square(3) == 9
+    assert len(list((tmp_path / "cache").glob("*/*.pkl"))) == 1
+
+    assert square(3) == 9
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_key(tmp_path: pathlib.Path):
+    cache = esis._caching.Cache(location=tmp_path / "cache")
+
+    @dataclasses.dataclass
+    class A:
+        x: int
+
+        @functools.cached_property
+        def y(self) -> int:
+            return 2 * self.x
+
+    def f(a: A) -> int:
+        return a.x
+
+    a = A(1)
+    key = cache.key(f, paths=[], args=(a,), kwargs=dict())
+    assert a.y == 2
+    assert cache.key(f, paths=[], args=(a,), kwargs=dict()) == key
+    assert cache.key(f, paths=[], args=(A(2),), kwargs=dict()) != key
+
+
+def test_key_packages(tmp_path: pathlib.Path):
+    cache = esis._caching.Cache(location=tmp_path / "cache")
+
+    def f(x: int) -> int:
+        return x
+
+    key = cache.key(f, paths=[], args=(1,), kwargs=dict())
+    key_packages = cache.key(
+        f,
+        paths=[],
+        args=(1,),
+        kwargs=dict(),
+        packages=["named_arrays"],
+    )
+    assert key_packages != key
@@ -27,12 +27,14 @@ dataset:
 * Cosmic ray removal
 """
 
+from ._despike import despike
 from . import abc
 from . import synth
 from ._level_0 import Level_0
 from ._level_1 import Level_1
 
 __all__ = [
+    "despike",
     "abc",
     "synth",
     "Level_0",
@@ -0,0 +1,5 @@
+from ._despike import despike
+
+__all__ = [
+    "despike",
+]
@@ -0,0 +1,101 @@
+from typing import TypeVar
+import os
+import functools
+import multiprocessing
+import concurrent.futures
+import named_arrays as na
+
+__all__ = [
+    "despike",
+]
+
+ArrayT = TypeVar("ArrayT", bound=na.AbstractArray)
+
+
+def despike(
+    array: ArrayT,
+    axis: tuple[str, str],
+    workers: None | int = None,
+    **kwargs,
+) -> ArrayT:
+    """
+    Remove cosmic ray spikes from each image in parallel.
+
+    Each image, defined by the two logical axes in `axis`, is independent,
+    so the images are distributed across a pool of processes which each call
+    :func:`named_arrays.despike`, and the results are written back into a
+    single output array.
+
+    The pool is started using the ``"forkserver"`` method,
+    since forking a process after the threads started by :mod:`esis`
+    and its dependencies can deadlock the children.
+
+    Parameters
+    ----------
+    array
+        The images to despike.
+        If this is an instance of :class:`named_arrays.AbstractFunctionArray`,
+        only the outputs are despiked.
+    axis
+        The two axes defining the logical axes of each image.
+    workers
+        The number of processes used to despike the images.
+        If :obj:`None` (the default), the number of CPUs is used.
+        If ``1``, the images are despiked serially in this process.
+    kwargs
+        Additional scalar keyword arguments passed to :func:`named_arrays.despike`.
+    """
+    if isinstance(array, na.AbstractFunctionArray):
+        return array.replace(
+            outputs=despike(
+                array=array.outputs,
+                axis=axis,
+                workers=workers,
+                **kwargs,
+            ),
+        )
+
+    if workers is None:
+        workers = os.cpu_count()
+
+    array = na.as_named_array(array)
+
+    shape = array.shape
+    index = list(na.ndindex(shape, axis_ignored=axis))
+
+    func = functools.partial(na.despike, axis=axis, **kwargs)
+    frames = (array[i] for i in index)
+
+    if workers == 1 or len(index) == 1:
+        results = map(func, frames)
+        return _assemble(array, index, results)
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("forkserver"),
+    ) as executor:
+        results = executor.map(func, frames)
+        return _assemble(array, index, results)
+
+
+def _assemble(
+    array: na.AbstractScalarArray,
+    index: list[dict[str, int]],
+    results,
+) -> na.ScalarArray:
+    """
+    Write each despiked image back into a copy of the original array.
+
+    Parameters
+    ----------
+    array
+        The original array of images.
+    index
+        The index of each image in `array`.
+    results
+        The despiked version of each image, in the same order as `index`.
+    """
+    result = array.copy()
+    for i, frame in zip(index, results):
+        result[i] = frame
+    return result
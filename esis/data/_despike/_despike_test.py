@@ -0,0 +1,28 @@
+import pytest
+import numpy as np
+import named_arrays as na
+import esis
+
+
+@pytest.mark.parametrize(
+    argnames="array",
+    argvalues=[
+        na.random.normal(
+            loc=100,
+            scale=5,
+            shape_random=dict(t=3, x=64, y=64),
+            seed=42,
+        ),
+    ],
+)
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.timeout(300)
+def test_despike(array: na.AbstractScalarArray, workers: int):
+    array = array.copy()
+    array[dict(t=1, x=32, y=32)] = 1e5
+    axis = ("x", "y")
+    result = esis.data.despike(array, axis=axis, workers=workers)
+    expected = na.despike(array, axis=axis)
+    assert result.shape == array.shape
+    assert np.allclose(result, expected)
+    assert result[dict(t=1, x=32, y=32)] < 1e4
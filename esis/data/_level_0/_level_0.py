@@ -1,19 +1,388 @@
 from typing_extensions import Self
+import os
+import hashlib
+import shutil
+import json
 import dataclasses
 import pathlib
+import concurrent.futures
 import numpy as np
 import astropy.units as u
 import astropy.time
+import astropy.io.fits
 import named_arrays as na
 import msfc_ccd
 import esis
 from .. import abc
+from .._despike import despike
 
 __all__ = [
     "Level_0",
 ]
 
 
+_keywords = dict(
+    time_start="IMG_TS",
+    timedelta="MEAS_EXP",
+    timedelta_requested="IMG_EXP",
+    serial_number="CAM_SN",
+    camera_id="CAM_ID",
+    sequence_number="IMG_ISN",
+    count="IMG_CNT",
+    run_mode="RUN_MODE",
+    status="IMG_STAT",
+    voltage_fpga_vccint="FPGAVINT",
+    voltage_fpga_vccaux="FPGAVAUX",
+    voltage_fpga_vccbram="FPGAVBRM",
+    temperature_fpga="FPGATEMP",
+    temperature_adc_1="ADCTEMP1",
+    temperature_adc_2="ADCTEMP2",
+    temperature_adc_3="ADCTEMP3",
+    temperature_adc_4="ADCTEMP4",
+)
+"""The FITS keyword of each field of :class:`msfc_ccd.ImageHeader`."""
+
+_keywords_optional = ("CAM_SN", "CAM_ID", "RUN_MODE", "IMG_STAT")
+"""The FITS keywords which may be missing from older files."""
+
+_calibrations = dict(
+    timedelta="calibrate_timedelta_exposure",
+    voltage_fpga_vccint="calibrate_voltage_fpga",
+    voltage_fpga_vccaux="calibrate_voltage_fpga",
+    voltage_fpga_vccbram="calibrate_voltage_fpga",
+    temperature_fpga="calibrate_temperature_fpga",
+    temperature_adc_1="calibrate_temperature_adc_1",
+    temperature_adc_2="calibrate_temperature_adc_234",
+    temperature_adc_3="calibrate_temperature_adc_234",
+    temperature_adc_4="calibrate_temperature_adc_234",
+)
+"""
+The method of :class:`msfc_ccd.Camera` used to convert the raw value of each
+field of :class:`msfc_ccd.ImageHeader` into physical units.
+"""
+
+
+def _read(
+    path: na.AbstractScalarArray,
+    camera: msfc_ccd.abc.AbstractCamera,
+    axis_x: str,
+    axis_y: str,
+    pixel: None | na.AbstractCartesian2dVectorArray = None,
+    header: bool = True,
+    data: bool = True,
+    workers: None | int = None,
+) -> tuple[None | msfc_ccd.ImageHeader, None | na.ScalarArray]:
+    """
+    Read the headers and the pixel data of the given FITS files in one pass.
+
+    Each file is opened only once by a pool of threads,
+    which copies the raw header values into one array per keyword
+    and writes the pixel data directly into its frame of a single
+    ``float32`` array.
+    The header values are then calibrated using :func:`_header`.
+    Decompression and the conversion to ``float32`` are done by :mod:`zlib`
+    and :mod:`numpy`, which release the GIL, so the threads run concurrently
+    without copying each frame between processes.
+
+    Parameters
+    ----------
+    path
+        An array of paths pointing to the FITS files to read.
+    camera
+        A model of the camera used to calibrate the header values.
+    axis_x
+        The name of the logical axis representing the horizontal dimension of
+        the images.
+    axis_y
+        The name of the logical axis representing the vertical dimension of
+        the images.
+    pixel
+        The indices of the pixels to read from each frame.
+        If :obj:`None` (the default), every pixel is read.
+    header
+        Whether to read the raw header values.
+    data
+        Whether to read the pixel data.
+    workers
+        The number of threads used to read the files.
+        If :obj:`None` (the default), the number of CPUs is used.
+    """
+    if workers is None:
+        workers = os.cpu_count()
+
+    path = na.as_named_array(path)
+
+    values = None
+    if header:
+        values = {
+            field: na.ScalarArray.empty(path.shape, dtype=object)
+            for field in _keywords
+        }
+
+    item = None
+    if pixel is None:
+        first = astropy.io.fits.getheader(path.ndarray.flat[0])
+        pixel = na.indices({axis_x: first["NAXIS1"], axis_y: first["NAXIS2"]})
+        pixel = na.Cartesian2dVectorArray(pixel[axis_x], pixel[axis_y])
+    else:
+        item = {
+            axis_x: na.explicit(pixel.x),
+            axis_y: na.explicit(pixel.y),
+        }
+
+    result = None
+    if data:
+        shape = na.broadcast_shapes(
+            path.shape,
+            na.shape(pixel.y),
+            na.shape(pixel.x),
+        )
+        result = na.ScalarArray.empty(shape, dtype=np.float32)
+
+    def _read_file(index: dict[str, int]) -> None:
+        with astropy.io.fits.open(path[index].ndarray) as hdul:
+            hdu = hdul[0]
+            if header:
+                for field, keyword in _keywords.items():
+                    if keyword in _keywords_optional:
+                        values[field][index] = hdu.header.get(keyword)
+                    else:
+                        values[field][index] = hdu.header[keyword]
+            if data:
+                frame = na.ScalarArray(hdu.data, axes=(axis_y, axis_x))
+                if item is not None:
+                    frame = frame[{ax: item[ax][index] for ax in item}]
+                result[index] = frame
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(_read_file, path.ndindex()):
+            pass
+
+    if header:
+        header = _header(values, camera, pixel)
+    else:
+        header = None
+
+    return header, result
+
+
+def _header(
+    values: dict[str, na.ScalarArray],
+    camera: msfc_ccd.abc.AbstractCamera,
+    pixel: na.AbstractCartesian2dVectorArray,
+) -> msfc_ccd.ImageHeader:
+    """
+    Convert the raw header values read by :func:`_read` into physical units.
+
+    The conversions are the same as :meth:`msfc_ccd.SensorData.from_fits`.
+
+    Parameters
+    ----------
+    values
+        The raw value of each field of :class:`msfc_ccd.ImageHeader`.
+    camera
+        A model of the camera used to calibrate the header values.
+    pixel
+        The indices of the pixels in each frame.
+    """
+    fields = dict()
+
+    for field, value in values.items():
+        if field == "time_start":
+            jd = astropy.time.Time(value.ndarray.astype(str)).jd
+            t = astropy.time.Time(val=jd, format="jd")
+            t.format = "isot"
+            value = na.ScalarArray(t, axes=value.axes)
+        elif field == "timedelta_requested":
+            value = (value.astype(float) * u.ms).to(u.s)
+        elif field in _calibrations:
+            value = getattr(camera, _calibrations[field])(value.astype(np.int64))
+        elif field in ("serial_number", "camera_id", "run_mode", "status"):
+            value = value.astype(str)
+        else:
+            value = value.astype(int)
+        fields[field] = value
+
+    for field in ("serial_number", "camera_id"):
+        for axis in fields[field].shape:
+            value_0 = fields[field][{axis: 0}]
+            if np.all(value_0 == fields[field]):
+                fields[field] = value_0
+
+    return msfc_ccd.ImageHeader(
+        pixel=pixel,
+        **fields,
+    )
+
+
+def _encode(
+    value: None | str | float | u.Quantity | na.AbstractArray,
+    name: str,
+    arrays: dict[str, np.ndarray],
+) -> dict:
+    """
+    Describe a field of :class:`msfc_ccd.ImageHeader` using only JSON types.
+
+    The values of the field are stored in `arrays`,
+    so that they can be saved using :func:`numpy.savez` without pickling.
+
+    Parameters
+    ----------
+    value
+        The value of the field.
+    name
+        The name of the field, used as the prefix of the keys in `arrays`.
+    arrays
+        The arrays to be saved alongside the JSON description.
+    """
+    if value is None:
+        return dict(kind="none")
+
+    if isinstance(value, na.AbstractCartesian2dVectorArray):
+        return dict(
+            kind="cartesian_2d",
+            x=_encode(value.x, f"{name}.x", arrays),
+            y=_encode(value.y, f"{name}.y", arrays),
+        )
+
+    value = na.as_named_array(value)
+    ndarray = value.ndarray
+    result = dict(axes=list(value.axes))
+
+    if isinstance(ndarray, astropy.time.Time):
+        result |= dict(kind="time", format=ndarray.format, scale=ndarray.scale)
+        arrays[f"{name}.jd1"] = np.asarray(ndarray.jd1)
+        arrays[f"{name}.jd2"] = np.asarray(ndarray.jd2)
+        return result
+
+    if isinstance(ndarray, u.Quantity):
+        result |= dict(kind="quantity", unit=ndarray.unit.to_string())
+        ndarray = ndarray.value
+    else:
+        result |= dict(kind="array")
+
+    arrays[name] = np.asarray(ndarray)
+
+    return result
+
+
+def _decode(
+    description: dict,
+    name: str,
+    arrays: dict[str, np.ndarray],
+) -> None | na.AbstractArray:
+    """
+    Rebuild a field of :class:`msfc_ccd.ImageHeader` saved using :func:`_encode`.
+
+    Parameters
+    ----------
+    description
+        The JSON description of the field.
+    name
+        The name of the field.
+    arrays
+        The arrays saved alongside the JSON description.
+    """
+    kind = description["kind"]
+
+    if kind == "none":
+        return None
+
+    if kind == "cartesian_2d":
+        return na.Cartesian2dVectorArray(
+            x=_decode(description["x"], f"{name}.x", arrays),
+            y=_decode(description["y"], f"{name}.y", arrays),
+        )
+
+    if kind == "time":
+        ndarray = astropy.time.Time(
+            val=arrays[f"{name}.jd1"],
+            val2=arrays[f"{name}.jd2"],
+            format="jd",
+            scale=description["scale"],
+        )
+        ndarray.format = description["format"]
+    elif kind == "quantity":
+        ndarray = arrays[name] << u.Unit(description["unit"])
+    else:
+        ndarray = arrays[name]
+
+    return na.ScalarArray(ndarray, axes=tuple(description["axes"]))
+
+
+_kwargs_despike = dict(
+    sigclip=6,
+    objlim=3,
+)
+"""The keyword arguments passed to :func:`esis.data.despike` by :class:`Level_0`."""
+
+
+def _digest(a: na.AbstractScalarArray) -> str:
+    """
+    Compute a digest of every element of the given array.
+
+    This is used as a key for cached results that depend on pixel data
+    which is already in memory, such as the result of a processing step,
+    so it must change if any pixel changes.
+
+    Parameters
+    ----------
+    a
+        The array to digest.
+    """
+    a = na.as_named_array(a)
+    h = hashlib.blake2b(digest_size=32)
+    h.update(repr(a.axes).encode())
+    h.update(str(na.unit(a)).encode())
+    ndarray = np.ascontiguousarray(na.value(a).ndarray)
+    h.update(repr((ndarray.shape, ndarray.dtype.str)).encode())
+    h.update(memoryview(ndarray).cast("B"))
+    return h.hexdigest()
+
+
+@esis.memory.cache(ignore=["a"])
+def _despiked_mean(
+    a: "Level_0",
+    serial_number: na.AbstractScalarArray,
+    sequence_number: na.AbstractScalarArray,
+    pixel: na.AbstractCartesian2dVectorArray,
+    source: str | na.AbstractScalarArray,
+    kwargs_despike: dict,
+) -> "Level_0":
+    """
+    Despike the given frames and average them along the time axis.
+
+    The result is stored in :obj:`esis.memory`, and `a` itself is not part of
+    the key since it is larger than what joblib can hash quickly.
+    Instead, the remaining arguments identify the frames and every
+    parameter used to process them.
+
+    Parameters
+    ----------
+    a
+        The sequence of frames to average.
+    serial_number
+        The serial number of the camera that captured each frame.
+    sequence_number
+        The index of each frame in the sequence captured since the camera was
+        powered on.
+    pixel
+        The indices of the pixels in each frame.
+    source
+        Either the paths of the FITS files which have not been read yet,
+        or a digest of every pixel value of each frame,
+        as computed by :func:`_digest`.
+    kwargs_despike
+        The keyword arguments passed to :func:`esis.data.despike`.
+    """
+    result = despike(
+        array=a.load(),
+        axis=(a.axis_x, a.axis_y),
+        **kwargs_despike,
+    )
+    return result.mean(axis=a.axis_time)
+
+
 @dataclasses.dataclass(eq=False, repr=False)
 class Level_0(
     msfc_ccd.SensorData,
@@ -30,6 +399,54 @@ class Level_0(
     timeline: None | esis.nsroc.Timeline = None
     """The sequence of NSROC events associated with these images."""
 
+    path: None | na.AbstractScalarArray = None
+    """
+    The FITS file containing each image if the pixel data has not been read yet.
+
+    If this is not :obj:`None`, the pixel data is read from these files the
+    first time :attr:`outputs` is accessed, or when :meth:`load` is called.
+    """
+
+    def __post_init__(self) -> None:
+        # the fields of a lazy sequence are checked against the pixel data,
+        # which would read every frame before it can be indexed
+        if self.path is None:
+            super().__post_init__()
+
+    @property
+    def outputs(self) -> na.AbstractScalarArray:
+        """
+        The pixel values of each image.
+
+        If the pixel data has not been read yet, it is read from :attr:`path`
+        and kept, so that it is only read once.
+        """
+        # the value is kept in the instance dictionary under the name of the
+        # field, so that pickled instances are unchanged
+        if self.path is not None:
+            self.__dict__["outputs"] = self.load().outputs
+            self.path = None
+        return self.__dict__["outputs"]
+
+    @outputs.setter
+    def outputs(self, value: na.AbstractScalarArray) -> None:
+        self.__dict__["outputs"] = value
+
+    def _getitem(
+        self,
+        item: dict[str, int | slice | na.AbstractArray] | na.AbstractArray,
+    ) -> Self:
+        if self.path is None or not isinstance(item, dict):
+            return super()._getitem(item)
+
+        # select the headers and the paths without reading any pixels
+        return dataclasses.replace(
+            self,
+            inputs=self.inputs[item],
+            outputs=None,
+            path=self.path[item],
+        )
+
     @classmethod
     def from_fits(
         cls,
@@ -38,20 +455,230 @@ class Level_0(
         axis_x: str = "detector_x",
         axis_y: str = "detector_y",
         timeline: None | esis.nsroc.Timeline = None,
+        workers: None | int = None,
+        lazy: bool = False,
     ) -> Self:
+        """
+        Load an image or an array of images from a FITS file or an array of files.
+
+        Each file is opened once by a pool of threads,
+        which reads its header and writes its image directly into a single
+        preallocated ``float32`` array.
+
+        If `lazy` is :obj:`True`, only the headers are read,
+        and the pixel data is not read until :attr:`outputs` is accessed
+        or :meth:`load` is called.
+        This allows the sequence to be indexed, or selected using
+        :attr:`lights` or :attr:`darks`, so that only the surviving frames
+        are read from disk.
+
+        Parameters
+        ----------
+        path
+            Either a single path or an array of paths pointing to the FITS files
+            to load.
+        camera
+            A model of the camera used to capture these images.
+        axis_x
+            The name of the logical axis representing the horizontal dimension of
+            the images.
+        axis_y
+            The name of the logical axis representing the vertical dimension of
+            the images.
+        timeline
+            The sequence of NSROC events associated with these images.
+        workers
+            The number of threads used to read the files.
+            If :obj:`None` (the default), the number of CPUs is used.
+        lazy
+            Whether to defer reading the pixel data until it is needed.
+        """
+        path = na.as_named_array(path)
 
-        self = super().from_fits(
+        inputs, outputs = _read(
             path=path,
             camera=camera,
             axis_x=axis_x,
             axis_y=axis_y,
+            data=not lazy,
+            workers=workers,
         )
 
-        self.timeline = timeline
+        if lazy:
+            return cls(
+                inputs=inputs,
+                outputs=None,
+                camera=camera,
+                axis_x=axis_x,
+                axis_y=axis_y,
+                timeline=timeline,
+                path=path,
+            )
+
+        return cls(
+            inputs=inputs,
+            outputs=outputs << u.DN,
+            camera=camera,
+            axis_x=axis_x,
+            axis_y=axis_y,
+            timeline=timeline,
+        )
 
-        self.outputs = self.outputs.astype(np.float32)
+    @classmethod
+    def from_store(
+        cls,
+        path: str | pathlib.Path,
+        camera: msfc_ccd.abc.AbstractCamera,
+        timeline: None | esis.nsroc.Timeline = None,
+        mmap_mode: None | str = "r",
+    ) -> Self:
+        """
+        Open a store of images written by :meth:`to_store`.
+
+        The pixel data is opened using :class:`numpy.memmap`,
+        so opening the store is nearly instantaneous and only the frames which
+        are actually used are read from disk.
+
+        Parameters
+        ----------
+        path
+            The directory containing the store.
+        camera
+            A model of the camera used to capture these images.
+        timeline
+            The sequence of NSROC events associated with these images.
+        mmap_mode
+            The mode used to open the pixel data, see :func:`numpy.load`.
+            If :obj:`None`, the entire store is read into memory.
+        """
+        path = pathlib.Path(path)
+
+        metadata = json.loads((path / "metadata.json").read_text())
+
+        with np.load(path / "inputs.npz", allow_pickle=False) as f:
+            arrays = dict(f)
+
+        inputs = msfc_ccd.ImageHeader(
+            **{
+                name: _decode(description, name, arrays)
+                for name, description in metadata["inputs"].items()
+            }
+        )
+
+        outputs = np.load(path / "outputs.npy", mmap_mode=mmap_mode)
+        outputs = na.ScalarArray(outputs, axes=metadata["axes"])
+
+        unit = metadata["unit"]
+        if unit is not None:
+            outputs = outputs << u.Unit(unit)
+
+        return cls(
+            inputs=inputs,
+            outputs=outputs,
+            camera=camera,
+            axis_time=metadata["axis_time"],
+            axis_channel=metadata["axis_channel"],
+            axis_x=metadata["axis_x"],
+            axis_y=metadata["axis_y"],
+            timeline=timeline,
+        )
+
+    def load(
+        self,
+        workers: None | int = None,
+    ) -> Self:
+        """
+        Read the pixel data of a sequence created with ``lazy=True``.
+
+        Only the frames and pixels which remain after any indexing are read.
+        If the pixel data has already been read, this object is returned
+        unchanged.
+
+        Parameters
+        ----------
+        workers
+            The number of threads used to read the files.
+            If :obj:`None` (the default), the number of CPUs is used.
+        """
+        if self.path is None:
+            return self
+
+        _, outputs = _read(
+            path=self.path,
+            camera=self.camera,
+            axis_x=self.axis_x,
+            axis_y=self.axis_y,
+            pixel=self.inputs.pixel,
+            header=False,
+            workers=workers,
+        )
+
+        return dataclasses.replace(
+            self,
+            outputs=outputs << u.DN,
+            path=None,
+        )
+
+    def to_store(
+        self,
+        path: str | pathlib.Path,
+    ) -> None:
+        """
+        Save these images to an uncompressed store which can be memory-mapped.
+
+        The pixel data is saved as a single ``.npy`` file with the image
+        axes last, so that every frame is contiguous on disk,
+        and :attr:`inputs` is saved as a set of ``.npz`` arrays described by
+        a small JSON side-car file,
+        so that opening the store never unpickles anything.
+        The store can be opened again using :meth:`from_store`.
+
+        Parameters
+        ----------
+        path
+            The directory in which to save the store.
+            If this directory already exists, it is replaced.
+        """
+        path = pathlib.Path(path)
+        path_tmp = path.with_name(f"{path.name}.tmp")
+
+        shutil.rmtree(path_tmp, ignore_errors=True)
+        path_tmp.mkdir(parents=True)
+
+        outputs = self.load().outputs
+        unit = na.unit(outputs)
+        if unit is not None:
+            outputs = outputs.value
+
+        axes_frame = tuple(ax for ax in self.axis_xy[::-1] if ax in outputs.axes)
+        axes = tuple(ax for ax in outputs.axes if ax not in axes_frame) + axes_frame
+
+        np.save(
+            file=path_tmp / "outputs.npy",
+            arr=np.ascontiguousarray(outputs.ndarray_aligned(axes), dtype=np.float32),
+        )
 
-        return self
+        arrays = dict()
+        inputs = dict()
+        for field in dataclasses.fields(self.inputs):
+            value = getattr(self.inputs, field.name)
+            inputs[field.name] = _encode(value, field.name, arrays)
+
+        metadata = dict(
+            inputs=inputs,
+            axes=list(axes),
+            unit=None if unit is None else unit.to_string(),
+            axis_time=self.axis_time,
+            axis_channel=self.axis_channel,
+            axis_x=self.axis_x,
+            axis_y=self.axis_y,
+        )
+
+        np.savez(path_tmp / "inputs.npz", **arrays)
+        (path_tmp / "metadata.json").write_text(json.dumps(metadata, indent=4))
+
+        shutil.rmtree(path, ignore_errors=True)
+        path_tmp.rename(path)
 
     @property
     def time_mission_start(self) -> astropy.time.Time:
@@ -85,6 +712,14 @@ class Level_0(
         """One greater than the index representing the last good image."""
         return self._index_after(self.timeline.timedelta_sparcs_rlg_disable)
 
+    @property
+    def _index_lights(self) -> dict[str, slice]:
+        """The index representing the images in :attr:`lights`."""
+        axis_time = self.axis_time
+        index_start = self._index_lights_start[axis_time].ndarray
+        index_stop = self._index_lights_stop[axis_time].ndarray
+        return {axis_time: slice(index_start, index_stop)}
+
     @property
     def lights(self) -> Self:
         """
@@ -93,11 +728,7 @@ class Level_0(
         This uses only the images where the ring-laser gyroscope was enabled,
         so this should represent the images with the best-possible pointing stability.
         """
-        axis_time = self.axis_time
-        index_start = self._index_lights_start[axis_time].ndarray
-        index_stop = self._index_lights_stop[axis_time].ndarray
-        index_lights = {axis_time: slice(index_start, index_stop)}
-        return self[index_lights]
+        return self[self._index_lights]
 
     @property
     def darks_up(self) -> Self:
@@ -147,10 +778,18 @@ class Level_0(
 
         This is a concatenation of :attr:`darks_up` and :attr:`darks_down`.
         """
-        result = np.concatenate(
-            arrays=[self.darks_up, self.darks_down],
-            axis=self.axis_time,
-        )
+        arrays = [self.darks_up, self.darks_down]
+        axis = self.axis_time
+
+        if self.path is not None:
+            result = dataclasses.replace(
+                self,
+                inputs=np.concatenate([a.inputs for a in arrays], axis=axis),
+                outputs=None,
+                path=np.concatenate([a.path for a in arrays], axis=axis),
+            )
+        else:
+            result = np.concatenate(arrays, axis=axis)
 
         serial_number = result.inputs.serial_number
         for axis in serial_number.shape:
@@ -164,25 +803,61 @@ class Level_0(
 
     @property
     def dark(self) -> Self:
-        r"""
+        """
         The master dark image for each channel.
 
-        Calculated by taking the mean of :attr:`darks`.\ :attr:`despiked`
-        along :attr:`axis_time`.
+        Calculated using the :attr:`despiked_mean` of :attr:`darks`,
+        so it is only recomputed if the selection of dark frames changes.
         """
-        return self.darks.despiked.mean(axis=self.axis_time)
+        return self.darks.despiked_mean
 
     @property
     def dark_subtracted(self):
         """Subtract the master :attr:`dark` from each image in the sequence."""
-        return self - self.dark.outputs
+        dark = self.dark
+        return self.load() - dark.outputs
+
+    @property
+    def taps(self) -> msfc_ccd.TapData:
+        """Split the data into separate images for each tap."""
+        return super(Level_0, self.load()).taps
 
     @property
     def despiked(self) -> Self:
-        """Remove cosmic rays using :func:`astroscrappy.detect_cosmics`."""
-        return na.despike(
-            array=self,
-            sigclip=6,
-            objlim=3,
+        """
+        Remove cosmic rays using :func:`astroscrappy.detect_cosmics`.
+
+        Each frame is despiked in parallel using :func:`esis.data.despike`.
+        """
+        return despike(
+            array=self.load(),
             axis=(self.axis_x, self.axis_y),
+            **_kwargs_despike,
+        )
+
+    @property
+    def despiked_mean(self) -> Self:
+        """
+        The mean of :attr:`despiked` along :attr:`axis_time`.
+
+        The result is cached in :obj:`esis.memory` and keyed on the
+        serial number and sequence number of each frame,
+        the pixel indices,
+        the despiking parameters,
+        and either the paths of the FITS files, if the pixel data has not
+        been read yet, or a digest of every pixel value,
+        so any change to the frames computes a new result.
+        """
+        inputs = self.inputs
+        if self.path is not None:
+            source = self.path
+        else:
+            source = _digest(self.outputs)
+        return _despiked_mean(
+            a=self,
+            serial_number=inputs.serial_number,
+            sequence_number=inputs.sequence_number,
+            pixel=inputs.pixel,
+            source=source,
+            kwargs_despike=_kwargs_despike,
         )
@@ -2,6 +2,7 @@ import pytest
 import numpy as np
 import astropy.units as u
 import astropy.time
+import msfc_ccd
 from msfc_ccd._images._tests.test_sensor_images import AbstractTestAbstractSensorData
 import esis
 from ..abc._channel_data_test import AbstractTestAbstractChannelData
@@ -26,6 +27,24 @@ class TestLevel_0(
         a = a[{a.axis_time: slice(0, 1)}]
         super().test_despiked(a)
 
+    def test_to_store(self, a: esis.data.Level_0, tmp_path):
+        index = {
+            a.axis_x: slice(0, 100),
+            a.axis_y: slice(0, 100),
+        }
+        a = a[index]
+        path = tmp_path / "level_0"
+        a.to_store(path)
+        result = esis.data.Level_0.from_store(
+            path=path,
+            camera=a.camera,
+            timeline=a.timeline,
+        )
+        assert isinstance(result, type(a))
+        assert result.shape == a.shape
+        assert np.all(result.outputs == a.outputs)
+        assert np.all(result.inputs.time == a.inputs.time)
+
     def test_time_mission_start(self, a: esis.data.Level_0):
         result = a.time_mission_start
         assert isinstance(result, astropy.time.Time)
@@ -51,6 +70,25 @@ class TestLevel_0(
         assert np.all(result.outputs.std((a.axis_x, a.axis_y)) < 10 * u.DN)
         assert result.outputs.shape[a.axis_time] == 1
 
+    def test_despiked_mean(self, a: esis.data.Level_0):
+        index = {
+            a.axis_time: slice(0, 2),
+            a.axis_x: slice(0, 100),
+            a.axis_y: slice(0, 100),
+        }
+        a = a[index]
+        result = a.despiked_mean
+        expected = a.despiked.mean(axis=a.axis_time)
+        assert isinstance(result, type(a))
+        assert np.all(result.outputs == expected.outputs)
+        assert np.all(a.despiked_mean.outputs == result.outputs)
+        b = a.copy()
+        index_b = {a.axis_y: slice(1, None)}
+        b.outputs[index_b] = 2 * a.outputs[index_b]
+        result_b = b.despiked_mean
+        assert np.all(result_b.outputs[{a.axis_y: 0}] == result.outputs[{a.axis_y: 0}])
+        assert np.all(result_b.outputs[index_b] != result.outputs[index_b])
+
     def test_dark_subtracted(self, a: esis.data.Level_0):
         index = {
             a.axis_x: slice(0, 100),
@@ -59,3 +97,78 @@ class TestLevel_0(
         result = a[index].dark_subtracted
         assert isinstance(result, type(a))
         assert np.all(result.darks.outputs.mean() < 1 * u.DN)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_from_fits(workers: int):
+    path = esis.flights.f1.data.path_fits("time", "channel")
+    path = path[dict(time=slice(0, 2))]
+    camera = esis.optics.Camera()
+    result = esis.data.Level_0.from_fits(
+        path=path,
+        camera=camera,
+        workers=workers,
+    )
+    expected = msfc_ccd.SensorData.from_fits(
+        path=path,
+        camera=camera,
+    )
+    assert isinstance(result, esis.data.Level_0)
+    assert result.outputs.dtype == np.float32
+    assert result.outputs.shape == expected.outputs.shape
+    assert np.all(result.outputs == expected.outputs)
+    assert np.all(result.inputs.time == expected.inputs.time)
+    assert np.all(result.inputs.serial_number == expected.inputs.serial_number)
+
+
+def test_from_fits_lazy():
+    path = esis.flights.f1.data.path_fits("time", "channel")
+    path = path[dict(time=slice(0, 4))]
+    camera = esis.optics.Camera()
+    index = dict(
+        time=slice(1, 3),
+        detector_x=slice(100, 200),
+        detector_y=slice(50, 150),
+    )
+    lazy = esis.data.Level_0.from_fits(
+        path=path,
+        camera=camera,
+        lazy=True,
+    )
+    assert lazy.path is not None
+    result = lazy[index]
+    assert result.path.shape["time"] == 2
+    result = result.load()
+    assert result.path is None
+    expected = esis.data.Level_0.from_fits(
+        path=path,
+        camera=camera,
+    )
+    expected = expected[index]
+    assert np.all(result.outputs == expected.outputs)
+    assert np.all(result.inputs.time == expected.inputs.time)
+
+
+def test_from_fits_lazy_property():
+    path = esis.flights.f1.data.path_fits("time", "channel")
+    path = path[dict(time=slice(0, 2))]
+    camera = esis.optics.Camera()
+    index = dict(
+        detector_x=slice(100, 200),
+        detector_y=slice(50, 150),
+    )
+    lazy = esis.data.Level_0.from_fits(
+        path=path,
+        camera=camera,
+        lazy=True,
+    )
+    lazy = lazy[index]
+    expected = esis.data.Level_0.from_fits(
+        path=path,
+        camera=camera,
+    )
+    expected = expected[index]
+    assert lazy.shape == expected.shape
+    assert lazy.path is None
+    assert np.all(lazy.outputs == expected.outputs)
+    assert np.all(lazy.taps.outputs == expected.taps.outputs)
@@ -1,5 +1,6 @@
 from typing import Self
 import dataclasses
+import named_arrays as na
 import esis
 from .. import abc
 from .. import Level_0
@@ -28,6 +29,7 @@ class Level_1(
         cls,
         a: Level_0,
         instrument: None | esis.optics.Instrument = None,
+        num_chunk: None | int = None,
     ) -> Self:
         """
         Create a new instance of this class from an instance of :class:`Level_0`.
@@ -40,27 +42,87 @@ class Level_1(
         * Removes the dark signal using :attr:`~esis.data.Level_0.dark_subtracted`.
         * Removes the cosmic ray spikes using :meth:`~esis.data.Level_0.despiked`.
 
+        The master dark is computed once from :attr:`~esis.data.Level_0.darks`
+        using :attr:`~esis.data.Level_0.despiked_mean`, which caches it on disk,
+        and then the frames in :attr:`~esis.data.Level_0.lights` are indexed
+        from `a` and pushed through these operations in chunks of `num_chunk`
+        frames,
+        which are written into a single preallocated output array.
+        So the peak memory usage is set by the size of each chunk instead of
+        the length of the sequence.
+
         Parameters
         ----------
         a
             An instance of :class:`Level_0` to convert.
         instrument
             A model of the ESIS instrument to associate with these observations.
+        num_chunk
+            The number of frames to process at once.
+            If :obj:`None` (the default), all the frames are processed at once.
+
+        Raises
+        ------
+        ValueError
+            If `a` does not contain any of the frames in
+            :attr:`~esis.data.Level_0.lights`.
         """
-        taps = a.taps
-        taps = taps.unbiased
-        taps = taps.active
-        taps = taps.electrons
-        a = a.from_taps(taps)
-        a = a.dark_subtracted
-        a = a.lights
-        a = a.despiked
+        axis_time = a.axis_time
+
+        index_lights = a._index_lights[axis_time]
+        start_lights, stop_lights, _ = index_lights.indices(
+            a.inputs.shape[axis_time],
+        )
+        num_time = stop_lights - start_lights
+
+        if num_time <= 0:
+            raise ValueError(
+                f"`a` has no light frames along {axis_time!r}, "
+                f"so there is nothing to convert to Level-1."
+            )
+
+        inputs = a.inputs[{axis_time: index_lights}]
+
+        def _electrons(b: Level_0) -> Level_0:
+            taps = b.taps
+            taps = taps.unbiased
+            taps = taps.active
+            taps = taps.electrons
+            return b.from_taps(taps)
+
+        dark = _electrons(a.darks).despiked_mean.outputs
+
+        if num_chunk is None:
+            num_chunk = num_time
+
+        outputs = None
+
+        for start in range(0, num_time, num_chunk):
+
+            stop = min(start + num_chunk, num_time)
+            index = {axis_time: slice(start, stop)}
+
+            # only the frames in this chunk are copied out of `a`
+            index_a = {axis_time: slice(start_lights + start, start_lights + stop)}
+            chunk = _electrons(a[index_a])
+            chunk = chunk - dark
+            chunk = chunk.despiked
+
+            if outputs is None:
+                inputs = inputs.replace(pixel=chunk.inputs.pixel)
+                shape = chunk.outputs.shape | {axis_time: num_time}
+                unit = na.unit(chunk.outputs)
+                outputs = na.ScalarArray.empty(shape, dtype=chunk.outputs.dtype)
+                if unit is not None:
+                    outputs = outputs << unit
+
+            outputs[index] = chunk.outputs
 
         return cls(
-            inputs=a.inputs,
-            outputs=a.outputs[dict(detector_y=slice(None, None, -1))],
+            inputs=inputs,
+            outputs=outputs[{a.axis_y: slice(None, None, -1)}],
             instrument=instrument,
-            axis_time=a.axis_time,
+            axis_time=axis_time,
             axis_channel=a.axis_channel,
             axis_x=a.axis_x,
             axis_y=a.axis_y,
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from ..abc._channel_data_test import AbstractTestAbstractChannelData
 import esis
 
@@ -15,3 +16,18 @@ class TestLevel_1(
     AbstractTestAbstractChannelData,
 ):
     pass
+
+
+def test_from_level_0_chunked():
+    a = esis.flights.f1.data.level_0()[dict(time=slice(None, None, 8))]
+    result = esis.data.Level_1.from_level_0(a, num_chunk=2)
+    expected = esis.data.Level_1.from_level_0(a)
+    assert result.shape == expected.shape
+    assert np.allclose(result.outputs, expected.outputs)
+
+
+def test_from_level_0_no_lights():
+    a = esis.flights.f1.data.level_0(lazy=True)
+    a = a[{a.axis_time: slice(0, 2)}]
+    with pytest.raises(ValueError, match="no light frames"):
+        esis.data.Level_1.from_level_0(a)
@@ -1,12 +1,21 @@
+from typing_extensions import Self
+import io
+import os
+import base64
+import uuid
 import dataclasses
+import concurrent.futures
 import IPython.display
 import numpy as np
 import numpy.typing as npt
 import matplotlib.axes
 import matplotlib.animation
+import matplotlib.colorizer
+import matplotlib.image
 import matplotlib.pyplot as plt
 import named_arrays as na
 import msfc_ccd
+import esis
 
 __all__ = [
     "AbstractChannelData",
@@ -33,39 +42,141 @@ class AbstractChannelData(
 
     @property
     def channel(self) -> na.ScalarArray[npt.NDArray[str]]:
-        """The name of each ESIS channel in a human-readable format."""
+        """
+        The name of each ESIS channel in a human-readable format.
+
+        The channel index is looked up from the camera serial number
+        using :meth:`esis.optics.Camera.channel_from_serial_number`,
+        and the name of any unrecognized camera is :obj:`None`.
+        """
         sn = self.inputs.serial_number
-        where_1 = sn == "6"
-        where_2 = sn == "7"
-        where_3 = sn == "9"
-        where_4 = sn == "1"
+        index = esis.optics.Camera.channel_from_serial_number(sn)
+        result = "Channel " + index.astype(str).astype(object)
+        return np.where(index >= 0, result, None)
 
-        result = np.empty_like(sn, dtype=object)
+    def indices(
+        self,
+        pixel: na.AbstractCartesian2dVectorArray,
+    ) -> na.Cartesian2dVectorArray:
+        """
+        Convert pixel coordinates into fractional indices along the pixel axes.
 
-        result[where_1] = "Channel 1"
-        result[where_2] = "Channel 2"
-        result[where_3] = "Channel 3"
-        result[where_4] = "Channel 4"
+        The indices are interpolated from the pixel coordinates of each
+        column and row in :attr:`inputs`,
+        so they are correct for binned or cropped images.
+        Positions outside the image are mapped to ``-1``.
 
-        return result
+        Parameters
+        ----------
+        pixel
+            The pixel coordinates to convert.
+        """
+        coordinates = self.inputs.pixel
+        x = na.value(na.explicit(coordinates.x))
+        y = na.value(na.explicit(coordinates.y))
+        x = x[{ax: 0 for ax in x.shape if ax != self.axis_x}].ndarray
+        y = y[{ax: 0 for ax in y.shape if ax != self.axis_y}].ndarray
 
-    def animate(
+        px = na.as_named_array(na.value(pixel.x)).explicit
+        py = na.as_named_array(na.value(pixel.y)).explicit
+
+        return na.Cartesian2dVectorArray(
+            x=na.ScalarArray(_index(px.ndarray, x), axes=px.axes),
+            y=na.ScalarArray(_index(py.ndarray, y), axes=py.axes),
+        )
+
+    def _binned(self, factor: int) -> Self:
+        """
+        Average each block of `factor` by `factor` pixels into a single pixel.
+
+        Any pixels left over at the edges of each frame are discarded.
+
+        Parameters
+        ----------
+        factor
+            The number of pixels along each axis to combine.
+        """
+        if factor == 1:
+            return self
+
+        axis_x = self.axis_x
+        axis_y = self.axis_y
+
+        num_x = self.num_x // factor * factor
+        num_y = self.num_y // factor * factor
+
+        outputs = 0
+        for i in range(factor):
+            for j in range(factor):
+                outputs = outputs + self.outputs[
+                    {
+                        axis_x: slice(i, num_x, factor),
+                        axis_y: slice(j, num_y, factor),
+                    }
+                ]
+        outputs = outputs / factor**2
+
+        pixel = self.inputs.pixel
+        offset = (factor - 1) / 2
+        pixel = pixel.replace(
+            x=na.explicit(pixel.x)[{axis_x: slice(0, num_x, factor)}] + offset,
+            y=na.explicit(pixel.y)[{axis_y: slice(0, num_y, factor)}] + offset,
+        )
+
+        return dataclasses.replace(
+            self,
+            inputs=self.inputs.replace(pixel=pixel),
+            outputs=outputs,
+        )
+
+    def _subplots(
+        self,
+        cbar_fraction: float,
+    ) -> na.ScalarArray:
+        """
+        Create a column of axes, one for each channel, sized to fit the images.
+
+        Parameters
+        ----------
+        cbar_fraction
+            The fraction of the space to use for the colorbar axes.
+        """
+        axis_channel = self.axis_channel
+
+        figwidth = plt.rcParams["figure.figsize"][0]
+        figwidth_eff = figwidth * (1 - 2 * cbar_fraction)
+        shape = self.shape
+        num_channel = shape[axis_channel]
+        num_x = shape[self.axis_x]
+        num_y = shape[self.axis_y]
+        figheight = num_channel * figwidth_eff * num_y / num_x
+        fig, ax = na.plt.subplots(
+            axis_rows=axis_channel,
+            nrows=num_channel,
+            sharex=True,
+            sharey=True,
+            constrained_layout=True,
+            figsize=(figwidth, figheight),
+            origin="upper",
+            squeeze=False,
+        )
+        na.plt.set_xlabel("detector $x$ (pix)", ax=ax[{axis_channel: ~0}])
+        na.plt.set_ylabel("detector $y$ (pix)", ax=ax)
+
+        return ax
+
+    def _colorizer(
         self,
-        ax: None | matplotlib.axes.Axes | na.AbstractArray = None,
         cmap: None | str | matplotlib.colors.Colormap = None,
         norm: None | str | matplotlib.colors.Normalize = None,
         vmin: None | na.ArrayLike = None,
         vmax: None | na.ArrayLike = None,
-        cbar_fraction: float = 0.1,
-    ) -> matplotlib.animation.FuncAnimation:
+    ) -> matplotlib.colorizer.Colorizer:
         """
-        Create an animation using the frames in this dataset.
+        Create the object which maps the data in this dataset to colors.
 
         Parameters
         ----------
-        ax
-            The :class:`~matplotlib.axes.Axes` instance(s) to use.
-            If :obj:`None`, a new set of axes will be created.
         cmap
             The colormap used to map scalar data to colors.
         norm
@@ -77,33 +188,7 @@ class AbstractChannelData(
         vmax
             The maximum value of the data range.
             If `norm` is :obj:`None`, this parameter will be ignored.
-        cbar_fraction
-            The fraction of the space to use for the colorbar axes.
         """
-        axis_time = self.axis_time
-        axis_channel = self.axis_channel
-
-        if ax is None:
-            figwidth = plt.rcParams["figure.figsize"][0]
-            figwidth_eff = figwidth * (1 - 2 * cbar_fraction)
-            shape = self.shape
-            num_channel = shape[axis_channel]
-            num_x = shape[self.axis_x]
-            num_y = shape[self.axis_y]
-            figheight = num_channel * figwidth_eff * num_y / num_x
-            fig, ax = na.plt.subplots(
-                axis_rows=axis_channel,
-                nrows=num_channel,
-                sharex=True,
-                sharey=True,
-                constrained_layout=True,
-                figsize=(figwidth, figheight),
-                origin="upper",
-                squeeze=False,
-            )
-            na.plt.set_xlabel("detector $x$ (pix)", ax=ax[{axis_channel: ~0}])
-            na.plt.set_ylabel("detector $y$ (pix)", ax=ax)
-
         data = self.outputs
         unit = na.unit(data)
 
@@ -122,28 +207,31 @@ class AbstractChannelData(
                 vmax=vmax,
             )
 
-        colorizer = plt.Colorizer(
+        return plt.Colorizer(
             cmap=cmap,
             norm=norm,
         )
 
-        pixel = self.inputs.pixel
+    def _decorate(
+        self,
+        ax: na.AbstractScalarArray,
+        colorizer: matplotlib.colorizer.Colorizer,
+        cbar_fraction: float,
+    ) -> None:
+        """
+        Label each channel, fix the aspect ratio, and add a colorbar.
 
-        time = self.inputs.time
-        if axis_channel in time.shape:
-            time = time.mean(axis_channel)
+        Parameters
+        ----------
+        ax
+            The axes to decorate.
+        colorizer
+            The object used to map the data to colors.
+        cbar_fraction
+            The fraction of the space to use for the colorbar axes.
+        """
+        unit = na.unit(self.outputs)
 
-        ani = na.plt.pcolormovie(
-            time,
-            pixel.x,
-            pixel.y,
-            C=data,
-            axis_time=axis_time,
-            ax=ax,
-            kwargs_pcolormesh=dict(
-                colorizer=colorizer,
-            ),
-        )
         na.plt.text(
             x=0.5,
             y=1.01,
@@ -162,6 +250,74 @@ class AbstractChannelData(
             fraction=cbar_fraction,
         )
 
+    def animate(
+        self,
+        ax: None | matplotlib.axes.Axes | na.AbstractArray = None,
+        cmap: None | str | matplotlib.colors.Colormap = None,
+        norm: None | str | matplotlib.colors.Normalize = None,
+        vmin: None | na.ArrayLike = None,
+        vmax: None | na.ArrayLike = None,
+        cbar_fraction: float = 0.1,
+    ) -> matplotlib.animation.FuncAnimation:
+        """
+        Create an animation using the frames in this dataset.
+
+        Parameters
+        ----------
+        ax
+            The :class:`~matplotlib.axes.Axes` instance(s) to use.
+            If :obj:`None`, a new set of axes will be created.
+        cmap
+            The colormap used to map scalar data to colors.
+        norm
+            The normalization method used to scale data into the range [0, 1] before
+            mapping to colors.
+        vmin
+            The minimum value of the data range.
+            If `norm` is :obj:`None`, this parameter will be ignored.
+        vmax
+            The maximum value of the data range.
+            If `norm` is :obj:`None`, this parameter will be ignored.
+        cbar_fraction
+            The fraction of the space to use for the colorbar axes.
+        """
+        axis_time = self.axis_time
+        axis_channel = self.axis_channel
+
+        if ax is None:
+            ax = self._subplots(cbar_fraction)
+
+        colorizer = self._colorizer(
+            cmap=cmap,
+            norm=norm,
+            vmin=vmin,
+            vmax=vmax,
+        )
+
+        pixel = self.inputs.pixel
+
+        time = self.inputs.time
+        if axis_channel in time.shape:
+            time = time.mean(axis_channel)
+
+        ani = na.plt.pcolormovie(
+            time,
+            pixel.x,
+            pixel.y,
+            C=self.outputs,
+            axis_time=axis_time,
+            ax=ax,
+            kwargs_pcolormesh=dict(
+                colorizer=colorizer,
+            ),
+        )
+
+        self._decorate(
+            ax=ax,
+            colorizer=colorizer,
+            cbar_fraction=cbar_fraction,
+        )
+
         return ani
 
     def to_jshtml(
@@ -173,18 +329,27 @@ class AbstractChannelData(
         vmax: None | na.ArrayLike = None,
         cbar_fraction: float = 0.1,
         fps: None | float = None,
+        factor_bin: int = 1,
+        workers: None | int = None,
     ) -> IPython.display.HTML:
         """
         Create a Javascript animation ready to be displayed in a Jupyter notebook.
 
-        Converts the output of :meth:`animate` to Javascript using
-        :meth:`matplotlib.animation.Animation.to_jshtml`,
-        and then wraps the html string in :class:`IPython.display.HTML`.
+        Unlike :meth:`animate`, the frames are not drawn using
+        :func:`matplotlib.pyplot.pcolormesh`.
+        Instead, the axes, labels, and colorbar are drawn only once,
+        and then each frame is colormapped directly into an RGBA buffer,
+        resampled onto the pixels of each axes, and pasted into a copy of
+        the drawn figure.
+        These frames are encoded as PNG images by a pool of threads and
+        wrapped in the same Javascript player used by
+        :meth:`matplotlib.animation.Animation.to_jshtml`.
 
         Parameters
         ----------
         ax
-            The :class:`~matplotlib.axes.Axes` instance(s) to use.
+            The :class:`~matplotlib.axes.Axes` instance(s) to use,
+            one for each channel along :attr:`axis_channel`.
             If :obj:`None`, a new set of axes will be created.
         cmap
             The colormap used to map scalar data to colors.
@@ -201,19 +366,178 @@ class AbstractChannelData(
             The fraction of the space to use for the colorbar axes.
         fps
             The frames per second of the animation.
+            If :obj:`None` (the default), 5 frames per second are used,
+            the same as :class:`matplotlib.animation.FuncAnimation`.
+        factor_bin
+            The number of pixels along each axis to average together before
+            rendering, which reduces the size of the animation.
+        workers
+            The number of threads used to render the frames.
+            If :obj:`None` (the default), the number of CPUs is used.
+
+        Raises
+        ------
+        ValueError
+            If `ax` does not have exactly one axes for each channel.
         """
-        ani = self.animate(
-            ax=ax,
+        if fps is None:
+            fps = 5
+
+        if workers is None:
+            workers = os.cpu_count()
+
+        a = self._binned(factor_bin)
+
+        axis_time = a.axis_time
+        axis_channel = a.axis_channel
+        axis_x = a.axis_x
+        axis_y = a.axis_y
+
+        if ax is None:
+            ax = a._subplots(cbar_fraction)
+        ax = na.asanyarray(ax)
+
+        num_channel = a.shape.get(axis_channel, 1)
+        if ax.shape.get(axis_channel, 1) != num_channel or ax.size != num_channel:
+            raise ValueError(
+                f"`ax` must have one axes for each of the {num_channel} channels "
+                f"along {axis_channel!r}, got shape {ax.shape}."
+            )
+
+        fig = ax.ndarray.flat[0].figure
+
+        colorizer = a._colorizer(
             cmap=cmap,
             norm=norm,
             vmin=vmin,
             vmax=vmax,
+        )
+
+        data = a.outputs
+        if na.unit(data) is not None:
+            data = data.value
+
+        pixel = a.inputs.pixel
+        x = na.explicit(pixel.x)
+        y = na.explicit(pixel.y)
+        na.plt.set_xlim(x.min() - factor_bin / 2, x.max() + factor_bin / 2, ax=ax)
+        na.plt.set_ylim(y.min() - factor_bin / 2, y.max() + factor_bin / 2, ax=ax)
+
+        a._decorate(
+            ax=ax,
+            colorizer=colorizer,
             cbar_fraction=cbar_fraction,
         )
 
-        result = ani.to_jshtml(fps=fps)
-        result = IPython.display.HTML(result)
+        time = a.inputs.time
+        if axis_channel in time.shape:
+            time = time.mean(axis_channel)
+
+        text = fig.text(
+            x=0.99,
+            y=0.01,
+            s=time[{axis_time: 0}].ndarray,
+            ha="right",
+            va="bottom",
+            fontsize="medium",
+            animated=True,
+        )
+
+        fig.canvas.draw()
+        background = fig.canvas.copy_from_bbox(fig.bbox)
+        buffer = np.array(fig.canvas.buffer_rgba())
+        height = buffer.shape[0]
+
+        regions = []
+        for index in ax.ndindex():
+            bbox = ax[index].ndarray.get_window_extent()
+            rows = slice(height - round(bbox.y1), height - round(bbox.y0))
+            cols = slice(round(bbox.x0), round(bbox.x1))
+            num_rows = rows.stop - rows.start
+            num_cols = cols.stop - cols.start
+            num_x = data.shape[axis_x]
+            num_y = data.shape[axis_y]
+            ix = (np.arange(num_cols) + 0.5) * num_x / num_cols
+            iy = (np.arange(num_rows) + 0.5) * num_y / num_rows
+            ix = ix.astype(int)
+            iy = num_y - 1 - iy.astype(int)
+            regions.append((index, rows, cols, np.ix_(iy, ix)))
+
+        # Only the timestamp changes between frames outside of the images,
+        # so draw it onto the background and keep the strip which contains it
+        bbox = text.get_window_extent()
+        rows_text = slice(
+            max(height - int(np.ceil(bbox.y1)) - 1, 0),
+            height - int(np.floor(bbox.y0)) + 1,
+        )
+        num_time = a.shape[axis_time]
+        strips = []
+        for t in range(num_time):
+            fig.canvas.restore_region(background)
+            text.set_text(time[{axis_time: t}].ndarray)
+            fig.draw_artist(text)
+            strips.append(np.array(fig.canvas.buffer_rgba()[rows_text]))
+
+        plt.close(fig)
 
-        plt.close(ani._fig)
+        def _render(t: int) -> str:
+            result = buffer.copy()
+            result[rows_text] = strips[t]
+            for index, rows, cols, item in regions:
+                frame = data[index | {axis_time: t}]
+                frame = frame.ndarray_aligned((axis_y, axis_x))
+                result[rows, cols] = colorizer.to_rgba(frame[item], bytes=True)
+            file = io.BytesIO()
+            matplotlib.image.imsave(file, result, format="png")
+            return base64.b64encode(file.getvalue()).decode("ascii")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            frames = list(executor.map(_render, range(num_time)))
+
+        fill_frames = "\n" + "".join(
+            f'  frames[{i}] = "data:image/png;base64,{frame}"\n'
+            for i, frame in enumerate(frames)
+        )
+
+        result = matplotlib.animation.DISPLAY_TEMPLATE.format(
+            id=uuid.uuid4().hex,
+            Nframes=num_time,
+            fill_frames=fill_frames,
+            interval=int(1000 // fps),
+            once_checked="",
+            loop_checked="checked",
+            reflect_checked="",
+        )
+        result = "".join(
+            [
+                matplotlib.animation.JS_INCLUDE,
+                matplotlib.animation.STYLE_INCLUDE,
+                result,
+            ]
+        )
+        result = IPython.display.HTML(result)
 
         return result
+
+
+def _index(
+    position: np.ndarray,
+    coordinates: np.ndarray,
+) -> np.ndarray:
+    """
+    Convert pixel coordinates into fractional array indices.
+
+    Positions outside the array are mapped to ``-1``.
+
+    Parameters
+    ----------
+    position
+        The pixel coordinates to convert.
+    coordinates
+        The pixel coordinate of each element of the array.
+    """
+    index = np.arange(len(coordinates))
+    if coordinates[0] > coordinates[~0]:
+        coordinates = coordinates[::-1]
+        index = index[::-1]
+    return np.interp(position, coordinates, index, left=-1, right=-1)
@@ -1,4 +1,6 @@
+import pytest
 import IPython.display
+import matplotlib.pyplot as plt
 import named_arrays as na
 from msfc_ccd._images._tests.test_images import AbstractTestAbstractImageData
 import esis
@@ -12,12 +14,25 @@ class AbstractTestAbstractChannelData(
         result = a.channel
         assert isinstance(result, na.ScalarArray)
 
-    def test_to_jshtml(self, a: esis.data.abc.AbstractChannelData):
+    @pytest.mark.parametrize("factor_bin", [1, 4])
+    def test_to_jshtml(
+        self,
+        a: esis.data.abc.AbstractChannelData,
+        factor_bin: int,
+    ):
         index = {
-            a.axis_time: slice(0, 1),
+            a.axis_time: slice(0, 2),
             a.axis_x: slice(0, 100),
             a.axis_y: slice(0, 100),
         }
         a = a[index]
-        result = a.to_jshtml()
+        result = a.to_jshtml(factor_bin=factor_bin)
         assert isinstance(result, IPython.display.HTML)
+        assert result.data.count("data:image/png;base64,") == 2
+
+    def test_to_jshtml_ax(self, a: esis.data.abc.AbstractChannelData):
+        if a.shape.get(a.axis_channel, 1) > 1:
+            fig, ax = plt.subplots()
+            with pytest.raises(ValueError, match="one axes for each"):
+                a.to_jshtml(ax=ax)
+            plt.close(fig)
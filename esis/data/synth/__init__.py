@@ -2,8 +2,12 @@
 
 from ._scene_aia import scene_aia
 from ._scene_iris import scene_iris
+from ._forward_models import ForwardModel
+from ._noise_models import NoiseModel
 
 __all__ = [
     "scene_aia",
     "scene_iris",
+    "ForwardModel",
+    "NoiseModel",
 ]
@@ -0,0 +1,5 @@
+from ._forward_models import ForwardModel
+
+__all__ = [
+    "ForwardModel",
+]
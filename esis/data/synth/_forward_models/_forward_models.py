@@ -0,0 +1,342 @@
+from __future__ import annotations
+import functools
+import dataclasses
+import joblib
+import numpy as np
+import scipy.signal
+import astropy.units as u
+import astropy.constants
+import named_arrays as na
+import esis
+
+__all__ = [
+    "ForwardModel",
+]
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class ForwardModel:
+    """
+    A fast radiometric model of the images formed by an ESIS instrument.
+
+    Instead of tracing rays through the instrument for every scene,
+    as in :meth:`optika.systems.SequentialSystem.image`,
+    each grid of scene coordinates is mapped onto the detectors using
+    :class:`esis.optics.ProjectionOperator`,
+    which contains the effective area and the distortion of each channel
+    and is cached on disk.
+    The spectral radiance of the scene is converted to the expected number of
+    electrons in each cell of the scene using the quantum yield of the sensor,
+    projected onto the detectors with a single sparse matrix product,
+    and convolved with :attr:`kernel` using the overlap-add method.
+
+    The result is a noiseless image in electrons,
+    analogous to :class:`esis.data.Level_1`.
+    The small negative roundoff errors of the overlap-add method are clipped,
+    so the result is never negative.
+
+    Examples
+    --------
+    Compute the image of a uniform O V scene formed by the ESIS-I design.
+
+    .. jupyter-execute::
+
+        import astropy.units as u
+        import named_arrays as na
+        import esis
+
+        instrument = esis.flights.f1.optics.design(num_distribution=0)
+
+        scene = na.FunctionArray(
+            inputs=na.SpectralPositionalVectorArray(
+                wavelength=na.linspace(629.6, 629.9, axis="wavelength", num=2) * u.AA,
+                position=na.Cartesian2dVectorLinearSpace(
+                    start=instrument.system.field_min,
+                    stop=instrument.system.field_max,
+                    axis=na.Cartesian2dVectorArray("field_x", "field_y"),
+                    num=257,
+                ),
+            ),
+            outputs=1e-3 * u.erg / (u.cm**2 * u.sr * u.s * u.AA),
+        )
+
+        model = esis.data.synth.ForwardModel(instrument)
+
+        image = model(
+            scene=scene,
+            axis_wavelength="wavelength",
+            axis_field=("field_x", "field_y"),
+        )
+
+        fig, ax = na.plt.subplots(
+            axis_rows="channel",
+            nrows=image.outputs.shape["channel"],
+            sharex=True,
+            constrained_layout=True,
+            origin="upper",
+        )
+        na.plt.set_aspect("equal", ax=ax)
+        na.plt.pcolormesh(
+            image.inputs.x,
+            image.inputs.y,
+            C=image.outputs.value,
+            ax=ax,
+        );
+    """
+
+    instrument: esis.optics.abc.AbstractInstrument
+    """
+    The model of the optical system.
+    This should not have any uncertain parameters.
+    """
+
+    kernel: None | na.AbstractScalar | esis.optics.PointSpreadFunctionLibrary = None
+    """
+    The point-spread function sampled on the pixel grid,
+    the fraction of the light landing in a pixel which reaches each of the
+    pixels around it.
+    The center of the kernel is at index ``n // 2`` along each of
+    :attr:`axis_kernel`, and any other axes, such as the channel axis,
+    are broadcast against the image.
+    If this is an instance of :class:`esis.optics.PointSpreadFunctionLibrary`,
+    the image is convolved with the shift-variant point-spread function
+    using :meth:`~esis.optics.PointSpreadFunctionLibrary.convolve`.
+    If :obj:`None` (the default), the image is not blurred.
+    """
+
+    axis_kernel: tuple[str, str] = ("kernel_x", "kernel_y")
+    """The logical axes of :attr:`kernel` along the detector pixel axes."""
+
+    timedelta: None | u.Quantity | na.AbstractScalar = None
+    """
+    The exposure time of each frame.
+    If :obj:`None` (the default), the exposure time of the camera is used.
+    """
+
+    degree: int = 2
+    """
+    The degree of the polynomial distortion and vignetting models used by
+    :meth:`esis.optics.ProjectionOperator.from_instrument`.
+    """
+
+    @functools.cached_property
+    def _projections(self) -> dict[str, esis.optics.ProjectionOperator]:
+        return dict()
+
+    def projection(
+        self,
+        coordinates: na.SpectralPositionalVectorArray,
+        axis_wavelength: str,
+        axis_field: tuple[str, str],
+    ) -> esis.optics.ProjectionOperator:
+        """
+        Compute the projection operator for a given grid of scene coordinates.
+
+        Each operator is stored in :obj:`esis.cache` and memoized in this
+        object keyed on the coordinates,
+        so a sequence of frames on the same grid only computes the operator
+        once.
+
+        Parameters
+        ----------
+        coordinates
+            The vertices of each cell of the scene.
+        axis_wavelength
+            The logical axis corresponding to changing wavelength coordinate.
+        axis_field
+            The logical axes corresponding to changing field coordinate.
+        """
+        key = joblib.hash((coordinates, axis_wavelength, axis_field))
+        if key not in self._projections:
+            self._projections[key] = esis.optics.ProjectionOperator.from_instrument(
+                instrument=self.instrument,
+                coordinates=coordinates,
+                axis_wavelength=axis_wavelength,
+                axis_field=axis_field,
+                degree=self.degree,
+            )
+        return self._projections[key]
+
+    @property
+    def coordinates_sensor(self) -> na.Cartesian2dVectorLinearSpace:
+        """The vertices of the detector pixels in pixel coordinates."""
+        sensor = self.instrument.system.sensor
+        return na.Cartesian2dVectorLinearSpace(
+            start=sensor.pixels(sensor.aperture.bound_lower.xy),
+            stop=sensor.pixels(sensor.aperture.bound_upper.xy),
+            axis=sensor.axis_pixel,
+            num=sensor.num_pixel + 1,
+        )
+
+    def electrons(
+        self,
+        scene: na.FunctionArray[na.SpectralPositionalVectorArray, na.AbstractScalar],
+        axis_wavelength: str,
+        axis_field: tuple[str, str],
+    ) -> na.AbstractScalar:
+        """
+        Compute the expected electrons per unit area from each cell of a scene.
+
+        Parameters
+        ----------
+        scene
+            The spectral radiance of the scene,
+            sampled on the vertices of each cell.
+        axis_wavelength
+            The logical axis corresponding to changing wavelength coordinate.
+        axis_field
+            The logical axes corresponding to changing field coordinate.
+        """
+        camera = self.instrument.camera
+
+        timedelta = self.timedelta
+        if timedelta is None:
+            timedelta = camera.timedelta_exposure
+
+        coordinates = scene.inputs
+        wavelength = coordinates.wavelength.cell_centers(axis_wavelength)
+
+        result = scene.outputs * coordinates.volume_cell(
+            (axis_wavelength, *axis_field),
+        )
+
+        unit = na.unit_normalized(scene.outputs)
+        if not unit.is_equivalent(u.ph / (u.s * u.cm**2 * u.sr * u.AA)):
+            h = astropy.constants.h
+            c = astropy.constants.c
+            result = result / (h * c / wavelength) * u.ph
+
+        yield_quantum = camera.sensor.material.signal(
+            photons=1 * u.ph,
+            wavelength=wavelength,
+            noise=False,
+        )
+
+        return result * yield_quantum / u.ph * timedelta
+
+    def convolve(
+        self,
+        image: na.AbstractScalar,
+    ) -> na.ScalarArray:
+        """
+        Convolve an image with :attr:`kernel`.
+
+        Parameters
+        ----------
+        image
+            An image with the detector pixel axes.
+        """
+        if isinstance(self.kernel, esis.optics.PointSpreadFunctionLibrary):
+            return self.kernel.convolve(image)
+
+        axis_pixel = self.instrument.system.sensor.axis_pixel
+        axis_xy = (axis_pixel.x, axis_pixel.y)
+
+        image = na.asanyarray(image)
+        kernel = na.as_named_array(self.kernel)
+
+        shape = na.broadcast_shapes(
+            {ax: n for ax, n in image.shape.items() if ax not in axis_xy},
+            {ax: n for ax, n in kernel.shape.items() if ax not in self.axis_kernel},
+        )
+        axes = tuple(shape)
+
+        unit = na.unit(image)
+
+        result = scipy.signal.oaconvolve(
+            in1=na.value(image).ndarray_aligned(axes + axis_xy),
+            in2=na.value(kernel).ndarray_aligned(axes + self.axis_kernel),
+            mode="same",
+            axes=(~1, ~0),
+        )
+
+        result = na.ScalarArray(result, axes=axes + axis_xy)
+        if unit is not None:
+            result = result << unit
+
+        return result
+
+    def __call__(
+        self,
+        scene: na.FunctionArray[na.SpectralPositionalVectorArray, na.AbstractScalar],
+        axis_wavelength: str,
+        axis_field: tuple[str, str],
+    ) -> na.FunctionArray[na.Cartesian2dVectorArray, na.ScalarArray]:
+        """
+        Compute the expected electrons measured in each pixel of each channel.
+
+        Parameters
+        ----------
+        scene
+            The spectral radiance of the scene,
+            such as the output of :func:`esis.data.synth.scene_aia`,
+            sampled on the vertices of each cell.
+            Each grid of coordinates along the remaining axes of
+            ``scene.inputs``, such as time or spectral line,
+            is projected separately,
+            except for the channel axis of the instrument,
+            which gives each channel its own grid,
+            and any axes of ``scene.outputs`` which are not in
+            ``scene.inputs``, such as time if the scene does not move,
+            are projected in a single sparse matrix product.
+            The contributions of each spectral line are summed.
+        axis_wavelength
+            The logical axis corresponding to changing wavelength coordinate.
+        axis_field
+            The logical axes corresponding to changing field coordinate.
+        """
+        scene = scene.explicit
+
+        coordinates = scene.inputs.spectral_positional
+        radiance = na.asanyarray(scene.outputs)
+
+        axis_grid = (axis_wavelength, self.instrument.axis_channel, *axis_field)
+
+        shape = coordinates.shape
+        shape_loop = {ax: shape[ax] for ax in shape if ax not in axis_grid}
+
+        axis_sum = tuple(
+            ax for ax in na.shape(coordinates.wavelength) if ax in shape_loop
+        )
+
+        result = None
+
+        for index in na.ndindex(shape_loop):
+
+            c = coordinates[index]
+            r = radiance[{ax: index[ax] for ax in index if ax in radiance.shape}]
+
+            electrons = self.electrons(
+                scene=na.FunctionArray(c, r),
+                axis_wavelength=axis_wavelength,
+                axis_field=axis_field,
+            )
+
+            projection = self.projection(
+                coordinates=c,
+                axis_wavelength=axis_wavelength,
+                axis_field=axis_field,
+            )
+
+            image = projection.forward(electrons).to(u.electron)
+
+            index_result = {ax: index[ax] for ax in index if ax not in axis_sum}
+
+            if result is None:
+                shape_result = {ax: shape_loop[ax] for ax in index_result}
+                shape_result = shape_result | image.shape
+                result = na.ScalarArray(
+                    ndarray=np.zeros(tuple(shape_result.values())) << u.electron,
+                    axes=tuple(shape_result),
+                )
+
+            result[index_result] = result[index_result] + image
+
+        if self.kernel is not None:
+            result = self.convolve(result)
+            result = np.maximum(result, 0 * u.electron)
+
+        return na.FunctionArray(
+            inputs=self.coordinates_sensor,
+            outputs=result,
+        )
@@ -0,0 +1,99 @@
+import pytest
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import esis
+
+_instrument = esis.flights.f1.optics.design(num_distribution=0)
+
+_scene = na.FunctionArray(
+    inputs=na.SpectralPositionalVectorArray(
+        wavelength=na.linspace(629.6, 629.9, axis="wavelength", num=2) * u.AA,
+        position=na.Cartesian2dVectorLinearSpace(
+            start=_instrument.system.field_min,
+            stop=_instrument.system.field_max,
+            axis=na.Cartesian2dVectorArray("field_x", "field_y"),
+            num=11,
+        ),
+    ),
+    outputs=na.ScalarArray(np.ones(2), axes="time")
+    * u.erg
+    / (u.cm**2 * u.sr * u.s * u.AA),
+)
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.data.synth.ForwardModel(_instrument),
+        esis.data.synth.ForwardModel(
+            instrument=_instrument,
+            kernel=na.ScalarArray(
+                ndarray=np.full((3, 3), 1 / 9),
+                axes=("kernel_x", "kernel_y"),
+            ),
+        ),
+    ],
+)
+class TestForwardModel:
+
+    def test__call__(self, a: esis.data.synth.ForwardModel):
+        result = a(
+            scene=_scene,
+            axis_wavelength="wavelength",
+            axis_field=("field_x", "field_y"),
+        )
+        assert isinstance(result, na.FunctionArray)
+        assert "time" in result.outputs.shape
+        assert "channel" in result.outputs.shape
+        assert np.all(result.outputs >= 0 * u.electron)
+        assert np.sum(result.outputs) > 0 * u.electron
+
+    def test_convolve(self, a: esis.data.synth.ForwardModel):
+        if a.kernel is None:
+            return
+        image = na.ScalarArray(
+            ndarray=np.zeros((5, 5)),
+            axes=("detector_x", "detector_y"),
+        )
+        image[dict(detector_x=2, detector_y=2)] = 1
+        result = a.convolve(image)
+        assert result.shape == image.shape
+        assert np.allclose(result.sum(), 1)
+
+
+def test_image():
+    scene = na.FunctionArray(
+        inputs=na.SpectralPositionalVectorArray(
+            wavelength=na.linspace(629.6, 629.9, axis="wavelength", num=2) * u.AA,
+            position=na.Cartesian2dVectorLinearSpace(
+                start=_instrument.system.field_min / 2,
+                stop=_instrument.system.field_max / 2,
+                axis=na.Cartesian2dVectorArray("field_x", "field_y"),
+                num=11,
+            ),
+        ),
+        outputs=1 * u.erg / (u.cm**2 * u.sr * u.s * u.AA),
+    )
+    axis_field = ("field_x", "field_y")
+    result = esis.data.synth.ForwardModel(_instrument)(
+        scene=scene,
+        axis_wavelength="wavelength",
+        axis_field=axis_field,
+    ).outputs
+    axis_pupil = ("pupil_x", "pupil_y")
+    expected = _instrument.system.image(
+        scene,
+        axis_wavelength="wavelength",
+        axis_field=axis_field,
+        noise=False,
+        pupil=na.Cartesian2dVectorLinearSpace(
+            start=-1,
+            stop=1,
+            axis=na.Cartesian2dVectorArray(*axis_pupil),
+            num=11,
+        ),
+        axis_pupil=axis_pupil,
+    ).outputs
+    axis = ("detector_x", "detector_y")
+    assert np.allclose(result.sum(axis), expected.sum(axis), rtol=0.05)
@@ -0,0 +1,5 @@
+from ._noise_models import NoiseModel
+
+__all__ = [
+    "NoiseModel",
+]
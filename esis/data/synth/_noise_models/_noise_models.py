@@ -0,0 +1,432 @@
+from __future__ import annotations
+import os
+import dataclasses
+import concurrent.futures
+import numpy as np
+import astropy.units as u
+import astropy.time
+import named_arrays as na
+import msfc_ccd
+import esis
+
+__all__ = [
+    "NoiseModel",
+]
+
+
+def _frame(
+    a: float | u.Quantity | na.AbstractScalar,
+    index: dict[str, int],
+    axes: tuple[str, ...],
+    unit: u.UnitBase,
+) -> np.ndarray:
+    """
+    Select one frame of a parameter which may vary from frame to frame.
+
+    The result is a :mod:`numpy` array which broadcasts against the pixels
+    of the frame.
+
+    Parameters
+    ----------
+    a
+        The parameter to select.
+    index
+        The index of the frame.
+    axes
+        The logical axes of the pixels in the frame.
+    unit
+        The unit of the result.
+    """
+    a = na.as_named_array(a << unit)
+    a = a[{ax: index[ax] for ax in index if ax in a.shape}]
+    return a.ndarray_aligned(axes).to_value(unit)
+
+
+def _layout(
+    active: np.ndarray,
+    num_blank: int,
+    num_overscan: int,
+) -> np.ndarray:
+    """
+    Arrange the active pixels of an image in the order read out by the cameras.
+
+    The left and right halves of each row are read out by separate taps,
+    each of which reads blank columns before and overscan columns after
+    its half of the active area.
+    The right tap reads its half of the row backwards,
+    so in the raw frame its blank columns are on the right.
+
+    Parameters
+    ----------
+    active
+        The active pixels of the image, with the horizontal axis first.
+    num_blank
+        The number of blank columns at the start of each row read by each tap.
+    num_overscan
+        The number of overscan columns at the end of each row read by each tap.
+    """
+    num_x, num_y = active.shape
+    half = num_x // 2
+    blank = np.zeros((num_blank, num_y))
+    overscan = np.zeros((num_overscan, num_y))
+    return np.concatenate(
+        [blank, active[:half], overscan, overscan, active[half:], blank],
+        axis=0,
+    )
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class NoiseModel:
+    """
+    A model of the noise added by the ESIS cameras to a noiseless image.
+
+    This is used to simulate realistic :class:`esis.data.Level_0` frames.
+
+    Each frame is simulated by the following steps:
+
+    * The number of photons absorbed in each pixel is drawn from a Poisson
+      distribution, using the quantum yield of the sensor at :attr:`wavelength`
+      to convert the expected number of electrons into photons.
+    * The photons are converted back into electrons,
+      and the Fano noise is added as a normal distribution with a variance of
+      the Fano factor of the sensor times the number of electrons.
+    * The dark current of the sensor, and optionally cosmic rays,
+      are added.
+    * The active area is flipped along the vertical axis, from the
+      orientation of :class:`esis.data.Level_1` into the orientation read out
+      by the cameras, and padded with the blank and overscan columns of each
+      tap.
+    * The readout noise of each tap is added,
+      and the result is converted to DN using the gain of each tap,
+      offset by :attr:`bias`, and digitized by the analog-to-digital
+      converter.
+
+    The serial number of each camera, from
+    :attr:`esis.optics.Camera.serial_number`, is stored in the header of the
+    frames, so that :attr:`esis.data.Level_0.channel` identifies the channels.
+
+    Each frame has its own random number generator,
+    spawned from a single :class:`numpy.random.SeedSequence`,
+    so the frames are independent and reproducible,
+    and are simulated concurrently by a pool of threads,
+    since :mod:`numpy` releases the GIL while drawing random numbers.
+    Many Monte Carlo realizations of the same image can be simulated by
+    passing `shape_random` to :meth:`__call__`.
+
+    Examples
+    --------
+    Simulate a few noisy ESIS-I frames of a uniform O V scene.
+
+    .. jupyter-execute::
+
+        import astropy.units as u
+        import named_arrays as na
+        import esis
+
+        instrument = esis.flights.f1.optics.design(num_distribution=0)
+
+        scene = na.FunctionArray(
+            inputs=na.SpectralPositionalVectorArray(
+                wavelength=na.linspace(629.6, 629.9, axis="wavelength", num=2) * u.AA,
+                position=na.Cartesian2dVectorLinearSpace(
+                    start=instrument.system.field_min,
+                    stop=instrument.system.field_max,
+                    axis=na.Cartesian2dVectorArray("field_x", "field_y"),
+                    num=257,
+                ),
+            ),
+            outputs=1e-3 * u.erg / (u.cm**2 * u.sr * u.s * u.AA),
+        )
+
+        image = esis.data.synth.ForwardModel(instrument)(
+            scene=scene,
+            axis_wavelength="wavelength",
+            axis_field=("field_x", "field_y"),
+        )
+
+        model = esis.data.synth.NoiseModel(
+            camera=instrument.camera,
+            bias=400 * u.DN,
+        )
+
+        frames = model(image, shape_random=dict(time=3), seed=42)
+
+        fig, ax = na.plt.subplots(
+            axis_rows="channel",
+            nrows=frames.outputs.shape["channel"],
+            sharex=True,
+            constrained_layout=True,
+        )
+        na.plt.imshow(
+            frames.outputs[dict(time=0)].value,
+            axis_x="detector_x",
+            axis_y="detector_y",
+            ax=ax,
+            cmap="gray",
+            origin="lower",
+        );
+    """
+
+    camera: esis.optics.Camera
+    """A model of the cameras which captured the images."""
+
+    wavelength: u.Quantity | na.AbstractScalar = 630 * u.AA
+    """
+    The representative wavelength of the light in each image,
+    used to compute the quantum yield and the Fano factor of the sensor.
+    """
+
+    bias: u.Quantity | na.AbstractScalar = 0 * u.DN
+    """
+    The bias (or pedestal) added to each pixel by the analog-to-digital
+    converter.
+    Like :attr:`esis.optics.Camera.gain`, this may depend on the tap and
+    contain the ``axis_tap_x`` and ``axis_tap_y`` axes of :attr:`camera`.
+    """
+
+    timedelta: None | u.Quantity | na.AbstractScalar = None
+    """
+    The exposure time of each frame,
+    used to compute the dark current and the number of cosmic rays.
+    If :obj:`None` (the default), the exposure time of the camera is used.
+    """
+
+    rate_cosmic_ray: u.Quantity | na.AbstractScalar = 0 / (u.cm**2 * u.s)
+    """
+    The number of cosmic rays striking the sensor per unit area per unit time.
+    If zero (the default), no cosmic rays are simulated.
+    """
+
+    electrons_cosmic_ray: u.Quantity | na.AbstractScalar = 1000 * u.electron
+    """
+    The mean number of electrons deposited by each cosmic ray.
+    The number of electrons deposited by each hit is drawn from an
+    exponential distribution,
+    and all the charge is deposited in a single pixel.
+    """
+
+    def _taps(
+        self,
+        num_x: int,
+        num_y: int,
+        axis_x: str,
+        axis_y: str,
+    ) -> tuple[na.AbstractScalar, na.AbstractScalar, na.AbstractScalar]:
+        """
+        Expand the gain, :attr:`bias`, and readout noise to every raw pixel.
+
+        Each pixel of the raw frame has the value of the tap which reads it.
+
+        Parameters
+        ----------
+        num_x
+            The number of columns in the raw frame.
+        num_y
+            The number of rows in the raw frame.
+        axis_x
+            The logical axis of the raw frame along the rows.
+        axis_y
+            The logical axis of the raw frame along the columns.
+
+        Raises
+        ------
+        ValueError
+            If the camera does not have a gain.
+        """
+        camera = self.camera
+
+        if camera.gain is None:
+            raise ValueError(
+                "`camera.gain` is `None`, so the noise model cannot convert "
+                "electrons into DN."
+            )
+
+        tap = {
+            camera.axis_tap_x: na.ScalarArray(
+                ndarray=(np.arange(num_x) >= num_x // 2).astype(int),
+                axes=axis_x,
+            ),
+            camera.axis_tap_y: na.ScalarArray(
+                ndarray=(np.arange(num_y) >= num_y // 2).astype(int),
+                axes=axis_y,
+            ),
+        }
+
+        result = []
+        for a in (camera.gain, self.bias, camera.sensor.readout_noise):
+            a = na.as_named_array(a)
+            a = a[{ax: tap[ax] for ax in tap if ax in a.shape}]
+            result.append(a)
+
+        return tuple(result)
+
+    def __call__(
+        self,
+        electrons: na.AbstractScalar | na.FunctionArray,
+        axis_x: str = "detector_x",
+        axis_y: str = "detector_y",
+        shape_random: None | dict[str, int] = None,
+        time_start: None | astropy.time.Time | na.AbstractScalar = None,
+        seed: None | int = None,
+        workers: None | int = None,
+    ) -> esis.data.Level_0:
+        """
+        Simulate the raw frames captured by the cameras for a noiseless image.
+
+        Parameters
+        ----------
+        electrons
+            The expected number of electrons in each active pixel,
+            such as the output of :class:`esis.data.synth.ForwardModel`.
+            This is in the orientation of :class:`esis.data.Level_1`,
+            which is the orientation of the sensor in the optical model,
+            so converting the result back to Level-1 recovers this image.
+            If this is an instance of :class:`named_arrays.FunctionArray`,
+            only the outputs are used.
+        axis_x
+            The name of the logical axis representing the horizontal dimension
+            of the images.
+        axis_y
+            The name of the logical axis representing the vertical dimension
+            of the images.
+        shape_random
+            Additional axes along which to simulate independent realizations
+            of the same image.
+        time_start
+            The time at which each frame started exposing.
+            If :obj:`None` (the default), J2000 is used.
+        seed
+            The entropy used to initialize the random number generators.
+            If :obj:`None` (the default), fresh entropy is drawn from the
+            operating system.
+        workers
+            The number of threads used to simulate the frames.
+            If :obj:`None` (the default), the number of CPUs is used.
+        """
+        if isinstance(electrons, na.FunctionArray):
+            electrons = electrons.outputs
+
+        electrons = na.as_named_array(electrons << u.electron)
+
+        if shape_random is None:
+            shape_random = dict()
+
+        if workers is None:
+            workers = os.cpu_count()
+
+        camera = self.camera
+        sensor = camera.sensor
+        material = sensor.material
+
+        timedelta = self.timedelta
+        if timedelta is None:
+            timedelta = camera.timedelta_exposure
+
+        if time_start is None:
+            time_start = astropy.time.Time("J2000", format="jyear_str")
+            time_start.format = "isot"
+
+        axes = (axis_x, axis_y)
+
+        shape = na.broadcast_shapes(electrons.shape, shape_random)
+        shape_frames = {ax: shape[ax] for ax in shape if ax not in axes}
+
+        num_x = shape[axis_x]
+        num_y = shape[axis_y]
+        num_blank = sensor.num_blank
+        num_overscan = sensor.num_overscan
+        num_x_raw = num_x + 2 * (num_blank + num_overscan)
+
+        shape_raw = shape_frames | {axis_x: num_x_raw, axis_y: num_y}
+
+        yield_quantum = material.signal(
+            photons=1 * u.ph,
+            wavelength=self.wavelength,
+            noise=False,
+        )
+        yield_quantum = yield_quantum / u.ph
+        fano = material.fano_factor(self.wavelength)
+
+        # the temperature may be given in degrees Celsius, as it is for ESIS-I,
+        # but the model of the dark current is in kelvin
+        temperature = sensor.temperature.to(u.K, equivalencies=u.temperature())
+        dark = sensor.dark_current(temperature) * timedelta
+        area = num_x * num_y * np.square(sensor.width_pixel)
+        num_cosmic_ray = self.rate_cosmic_ray * area * timedelta
+
+        gain, bias, noise_read = self._taps(num_x_raw, num_y, axis_x, axis_y)
+
+        value_max = 2**camera.bits_adc - 1
+
+        frames = list(na.ndindex(shape_frames))
+
+        seeds = np.random.SeedSequence(seed).spawn(len(frames))
+
+        result = na.ScalarArray.empty(shape_raw, dtype=np.float32)
+
+        def _simulate(
+            index: dict[str, int],
+            seed: np.random.SeedSequence,
+        ) -> None:
+            rng = np.random.Generator(np.random.PCG64(seed))
+
+            unit = u.electron / u.ph
+
+            e = _frame(electrons, index, axes, u.electron)
+            e = np.broadcast_to(e, (num_x, num_y))
+            y = _frame(yield_quantum, index, axes, unit)
+            f = _frame(fano, index, axes, unit)
+
+            photons = rng.poisson(np.maximum(e / y, 0))
+
+            e = photons * y
+            e = e + np.sqrt(f * e) * rng.standard_normal(e.shape)
+            e = np.maximum(e, 0)
+
+            e = e + rng.poisson(_frame(dark, index, axes, u.electron), e.shape)
+
+            n = rng.poisson(_frame(num_cosmic_ray, index, (), u.one))
+            if n > 0:
+                np.add.at(
+                    e,
+                    (rng.integers(num_x, size=n), rng.integers(num_y, size=n)),
+                    rng.exponential(
+                        scale=_frame(self.electrons_cosmic_ray, index, (), u.electron),
+                        size=n,
+                    ),
+                )
+
+            raw = _layout(e[:, ::-1], num_blank, num_overscan)
+
+            n_read = _frame(noise_read, index, axes, u.electron)
+            raw = raw + n_read * rng.standard_normal(raw.shape)
+
+            raw = raw / _frame(gain, index, axes, u.electron / u.DN)
+            raw = raw + _frame(bias, index, axes, u.DN)
+
+            raw = np.clip(np.round(raw), 0, value_max)
+
+            result[index] = na.ScalarArray(raw.astype(np.float32), axes=axes)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(_simulate, frames, seeds):
+                pass
+
+        pixel = na.indices({axis_x: num_x_raw, axis_y: num_y})
+
+        return esis.data.Level_0(
+            inputs=msfc_ccd.ImageHeader(
+                pixel=na.Cartesian2dVectorArray(
+                    x=pixel[axis_x],
+                    y=pixel[axis_y],
+                ),
+                time_start=time_start,
+                timedelta=timedelta,
+                timedelta_requested=timedelta,
+                serial_number=camera.serial_number,
+            ),
+            outputs=result << u.DN,
+            camera=camera,
+            axis_x=axis_x,
+            axis_y=axis_y,
+        )
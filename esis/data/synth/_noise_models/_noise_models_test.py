@@ -0,0 +1,96 @@
+import pytest
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import esis
+
+_electrons = na.ScalarArray(
+    ndarray=np.full((2, 8, 6), 1000) * u.electron,
+    axes=("channel", "detector_x", "detector_y"),
+)
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.data.synth.NoiseModel(
+            camera=esis.optics.Camera(),
+            bias=400 * u.DN,
+        ),
+        esis.data.synth.NoiseModel(
+            camera=esis.optics.Camera(
+                sensor=esis.optics.Sensor(
+                    readout_noise=na.ScalarArray(np.array([4, 8]), axes="tap_x")
+                    * u.electron,
+                ),
+                gain=na.ScalarArray(
+                    ndarray=np.array([[2.4, 2.5], [2.6, 2.7]]) * u.electron / u.DN,
+                    axes=("tap_x", "tap_y"),
+                ),
+            ),
+            bias=na.ScalarArray(np.array([400, 410]), axes="tap_x") * u.DN,
+            rate_cosmic_ray=1 / (u.cm**2 * u.s),
+        ),
+    ],
+)
+class TestNoiseModel:
+
+    def test__call__(self, a: esis.data.synth.NoiseModel):
+        result = a(_electrons, shape_random=dict(time=20), seed=0)
+        assert isinstance(result, esis.data.Level_0)
+        sensor = a.camera.sensor
+        num_x = 8 + 2 * (sensor.num_blank + sensor.num_overscan)
+        assert result.outputs.shape == dict(
+            channel=2,
+            time=20,
+            detector_x=num_x,
+            detector_y=6,
+        )
+        assert np.all(result.outputs >= 0 * u.DN)
+        assert np.all(result.outputs <= (2**a.camera.bits_adc - 1) * u.DN)
+        active = slice(sensor.num_blank, sensor.num_blank + 4)
+        active = result.outputs[dict(detector_x=active)]
+        assert np.median(active) > 700 * u.DN
+        blank = result.outputs[dict(detector_x=slice(0, sensor.num_blank))]
+        assert np.allclose(np.median(blank), 400 * u.DN, atol=5 * u.DN)
+
+    def test_readout_noise(self, a: esis.data.synth.NoiseModel):
+        result = a(0 * _electrons, shape_random=dict(time=50), seed=0).outputs
+        num_x = result.shape["detector_x"]
+        num_y = result.shape["detector_y"]
+        gain, bias, noise = a._taps(num_x, num_y, "detector_x", "detector_y")
+        residual = (result - bias) * gain / noise
+        num_blank = a.camera.sensor.num_blank
+        for blank in (slice(0, num_blank), slice(num_x - num_blank, num_x)):
+            std = np.std(residual[dict(detector_x=blank)].ndarray)
+            assert np.allclose(std, 1, rtol=0.1)
+
+    def test_orientation(self, a: esis.data.synth.NoiseModel):
+        x = na.arange(0, 8, axis="detector_x")
+        y = na.arange(0, 6, axis="detector_y")
+        electrons = (5000 + 1000 * x + 3000 * y) * u.electron
+        electrons = na.broadcast_to(electrons, _electrons.shape)
+        result = a(electrons, seed=0)
+        result = result.from_taps(result.taps.unbiased.active.electrons)
+        result = result.outputs[dict(detector_y=slice(None, None, -1))]
+        difference = result - electrons
+        assert np.std(difference.ndarray) < 0.1 * np.std(electrons.ndarray)
+
+    def test_seed(self, a: esis.data.synth.NoiseModel):
+        b = a(_electrons, seed=1)
+        c = a(_electrons, seed=1)
+        assert np.all(b.outputs == c.outputs)
+
+
+def test_serial_number():
+    camera = esis.flights.f1.optics.design(num_distribution=0).camera
+    model = esis.data.synth.NoiseModel(camera=camera, bias=400 * u.DN)
+    electrons = na.ScalarArray(
+        ndarray=np.full((4, 8, 6), 1000) * u.electron,
+        axes=("channel", "detector_x", "detector_y"),
+    )
+    result = model(electrons, seed=0)
+    serial_number = result.inputs.serial_number
+    assert np.all(serial_number == camera.serial_number)
+    channel = esis.optics.Camera.channel_from_serial_number(serial_number)
+    assert np.all(channel == camera.channel)
@@ -4,6 +4,7 @@ import astropy.units as u
 import astropy.time
 import named_arrays as na
 import iris
+from ..._despike import despike as _despike
 
 __all__ = [
     "scene_iris",
@@ -67,7 +68,7 @@ def scene_iris(
         The maximum doppler velocity of the simulated scene.
         Values outside this range are cropped.
     despike
-        Whether to remove cosmic ray spikes using :mod:`astroscrappy`.
+        Whether to remove cosmic ray spikes using :func:`esis.data.despike`.
     background_removal
         The background removal algorithm to remove stray light.
         Currently, the options are :obj:`None` (the default) which is no
@@ -101,7 +102,7 @@ def scene_iris(
     scene = scene.explicit
 
     if despike:
-        scene = na.despike(
+        scene = _despike(
             array=scene,
             axis=(axis_velocity, axis_detector_y),
         )
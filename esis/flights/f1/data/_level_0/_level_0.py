@@ -1,3 +1,6 @@
+import pathlib
+import shutil
+import msfc_ccd
 import esis
 from ... import nsroc, optics
 from .. import path_fits
@@ -6,16 +9,75 @@ __all__ = [
     "level_0",
 ]
 
+_paths_store = (
+    pathlib.Path(__file__).parents[1] / "_fits/*.fit.gz",
+    pathlib.Path(__file__),
+    pathlib.Path(esis.data.__file__).parent / "_level_0/_level_0.py",
+    pathlib.Path(msfc_ccd.__file__).parent / "**/*.py",
+)
+"""
+The files which the store of Level-0 images depends on:
+the raw FITS files, the code which reads and writes the store,
+and the code which calibrates the FITS headers.
+"""
+
+
+def _name_store(
+    axis_time: str,
+    axis_channel: str,
+    axis_x: str,
+    axis_y: str,
+) -> str:
+    """
+    Compute the name of the store of Level-0 images for the given axes.
+
+    The name contains the names of the axes followed by the content hash of
+    the files in :obj:`_paths_store` computed by ``esis.cache.key``,
+    so the store is rebuilt whenever the raw data or the code changes.
+
+    Parameters
+    ----------
+    axis_time
+        The name of the logical axis representing time.
+    axis_channel
+        The name of the logical axis representing the different ESIS channels.
+    axis_x
+        The name of the logical axis representing the detector's long axis.
+    axis_y
+        The name of the logical axis representing the detector's short axis.
+    """
+    key = esis.cache.key(
+        func=_name_store,
+        paths=_paths_store,
+        args=(axis_time, axis_channel, axis_x, axis_y),
+        kwargs=dict(),
+    )
+    return f"level_0-{axis_time}-{axis_channel}-{axis_x}-{axis_y}-{key}"
+
 
 def level_0(
     axis_time: str = "time",
     axis_channel: str = "channel",
     axis_x: str = "detector_x",
     axis_y: str = "detector_y",
+    lazy: bool = False,
 ) -> esis.data.Level_0:
     """
     All the raw images captured during this flight.
 
+    The first time this function is called, the FITS files are decompressed
+    into an uncompressed store in the cache directory using
+    :meth:`esis.data.Level_0.to_store`.
+    The store is keyed on the contents of the FITS files and on the code
+    which reads them, so it is rebuilt if either of them changes,
+    and any outdated stores are removed.
+    Every subsequent call memory-maps this store using
+    :meth:`esis.data.Level_0.from_store`,
+    so only the frames which are used are read from disk.
+
+    If `lazy` is :obj:`True`, the store is bypassed and only the FITS
+    headers are read, see :meth:`esis.data.Level_0.load`.
+
     Parameters
     ----------
     axis_time
@@ -26,16 +88,45 @@ def level_0(
         The name of the logical axis representing the detector's long axis.
     axis_y
         The name of the logical axis representing the detector's short axis.
+    lazy
+        Whether to defer reading the pixel data until
+        :meth:`~esis.data.Level_0.load` is called.
     """
     path = path_fits(
         axis_time=axis_time,
         axis_channel=axis_channel,
     )
 
-    return esis.data.Level_0.from_fits(
-        path=path,
-        camera=optics.as_built().camera,
-        axis_x=axis_x,
-        axis_y=axis_y,
-        timeline=nsroc.timeline(),
+    camera = optics.as_built().camera
+    timeline = nsroc.timeline()
+
+    if lazy:
+        return esis.data.Level_0.from_fits(
+            path=path,
+            camera=camera,
+            axis_x=axis_x,
+            axis_y=axis_y,
+            timeline=timeline,
+            lazy=True,
+        )
+
+    name = _name_store(axis_time, axis_channel, axis_x, axis_y)
+    path_store = pathlib.Path(esis.memory.location) / "f1" / name
+
+    if not path_store.exists():
+        prefix = name.rsplit("-", maxsplit=1)[0]
+        for path_old in path_store.parent.glob(f"{prefix}*"):
+            shutil.rmtree(path_old, ignore_errors=True)
+        esis.data.Level_0.from_fits(
+            path=path,
+            camera=camera,
+            axis_x=axis_x,
+            axis_y=axis_y,
+            timeline=timeline,
+        ).to_store(path_store)
+
+    return esis.data.Level_0.from_store(
+        path=path_store,
+        camera=camera,
+        timeline=timeline,
     )
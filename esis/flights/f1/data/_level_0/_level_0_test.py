@@ -6,3 +6,15 @@ def test_level_0():
     lvl0 = esis.flights.f1.data.level_0()
 
     assert isinstance(lvl0, esis.data.Level_0)
+
+
+def test_level_0_lazy():
+
+    lvl0 = esis.flights.f1.data.level_0(lazy=True)
+
+    assert isinstance(lvl0, esis.data.Level_0)
+    assert lvl0.path is not None
+
+    darks = lvl0.darks
+    assert darks.path is not None
+    assert darks.path.shape == darks.inputs.time.shape
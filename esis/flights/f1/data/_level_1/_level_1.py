@@ -1,13 +1,30 @@
+import pathlib
 import esis
 from ... import optics
 from .. import level_0
+from .._level_0._level_0 import _paths_store
 
 __all__ = [
     "level_1",
 ]
 
 
-@esis.memory.cache
+_path_f1 = pathlib.Path(__file__).parents[2]
+
+_path_data = pathlib.Path(esis.data.__file__).parent
+
+
+@esis.cache.memoize(
+    paths=[
+        *_paths_store,
+        _path_data / "_level_1/_level_1.py",
+        _path_data / "_despike/_despike.py",
+        _path_data / "abc/*.py",
+        _path_f1 / "nsroc/**/*.py",
+        _path_f1 / "optics/**/*.py",
+        _path_f1 / "optics/**/_data/*",
+    ],
+)
 def level_1() -> esis.data.Level_1:
     """
     Load the ESIS images and process them to the Level-1 stage.
@@ -16,6 +33,12 @@ def level_1() -> esis.data.Level_1:
     creates a new instance of :class:`esis.data.Level_1` using the
     :meth:`~esis.data.Level_1.from_level_0` classmethod,
     and then caches the result for future use.
+
+    The cached result is keyed on the same files as the store used by
+    :func:`level_0`, the raw FITS files and the code which reads them,
+    and on the processing code, the flight timeline,
+    and the model and measured optical constants of the instrument,
+    so it is recomputed if any of them change.
     """
     return esis.data.Level_1.from_level_0(
         a=level_0(),
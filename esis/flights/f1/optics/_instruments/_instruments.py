@@ -1,3 +1,4 @@
+import pathlib
 import numpy as np
 import astropy.units as u
 import named_arrays as na
@@ -16,7 +17,32 @@ __all__ = [
     "distortion_fit",
 ]
 
+_path_esis = pathlib.Path(__file__).parents[4]
 
+_directory_data = pathlib.Path(__file__).parent / "_data"
+
+_memoize = esis.cache.memoize(
+    paths=[
+        _path_esis / "optics/**/*.py",
+        _path_esis / "flights/f1/optics/**/*.py",
+        _path_esis / "flights/f1/optics/**/_data/*",
+        _path_esis / "flights/f1/spectrum/**/*.py",
+    ],
+    packages=["optika", "named_arrays"],
+    mmap_mode=None,
+)
+"""
+Store the result of each factory function in :obj:`esis.cache`.
+
+The key of each result contains the arguments of the factory,
+along with the source of the optical model and the measurements it uses,
+and the versions of :mod:`optika` and :mod:`named_arrays`,
+so editing or upgrading any of them invalidates every model built from them.
+The models are loaded without memory-mapping so that they can be modified.
+"""
+
+
+@_memoize
 def design_full(
     grid: None | optika.vectors.ObjectVectorArray = None,
     axis_channel: str = "channel",
@@ -294,6 +320,7 @@ def design_full(
     )
 
 
+@_memoize
 def design(
     grid: None | optika.vectors.ObjectVectorArray = None,
     axis_channel: str = "channel",
@@ -329,6 +356,7 @@ def design(
     return result
 
 
+@_memoize
 def design_single(
     grid: None | optika.vectors.ObjectVectorArray = None,
     axis_channel: str = "channel",
@@ -369,6 +397,7 @@ def design_single(
     return result
 
 
+@_memoize
 def as_built(
     grid: None | optika.vectors.ObjectVectorArray = None,
     axis_channel: str = "channel",
@@ -490,6 +519,7 @@ def as_built(
     return result
 
 
+@_memoize
 def distortion_fit(
     grid: None | optika.vectors.ObjectVectorArray = None,
     axis_channel: str = "channel",
@@ -498,8 +528,9 @@ def distortion_fit(
     """
     Apply the best-fit distortion parameters to the ESIS-I :func:`design`.
 
-    The parameters are hard-coded from the best distortion fit of the ESIS-I
-    flight data, optimized against the ``time=15`` frame of the 2019-09-30
+    The parameters are loaded using :class:`esis.optics.DistortionSolution`
+    from the best distortion fit of the ESIS-I flight data,
+    optimized against the ``time=15`` frame of the 2019-09-30
     flight (:func:`esis.flights.f1.data.level_1`, with a start time of
     2019-09-30T18:08:41.642 UTC). The values are per-channel and were produced
     by the ``ESISI_distortion_optimization_20260213_151715`` run.
@@ -598,74 +629,8 @@ def distortion_fit(
         axes="wavelength",
     )
 
-    model.grating.yaw = (
-        na.ScalarArray(
-            np.array([-2.693e02, -2.681e02, -2.687e02, -2.680e02]),
-            axes=axis_channel,
-        )
-        * u.arcmin
-    )
-    model.grating.pitch = (
-        na.ScalarArray(
-            np.array([3.704e00, 1.522e00, 1.316e00, 5.705e00]),
-            axes=axis_channel,
-        )
-        * u.arcmin
-    )
-    model.grating.roll = (
-        na.ScalarArray(
-            np.array([1.027e00, 2.393e-01, 3.678e-01, 1.020e00]),
-            axes=axis_channel,
-        )
-        * u.deg
-    )
-    model.field_stop.roll = (
-        na.ScalarArray(
-            np.array([-2.066e-01, -2.891e-01, -5.264e-01, 1.182e00]),
-            axes=axis_channel,
-        )
-        * u.deg
-    )
-    model.grating.rulings.spacing.coefficients[0] = (
-        na.ScalarArray(
-            np.array([3.854e-01, 3.859e-01, 3.855e-01, 3.863e-01]),
-            axes=axis_channel,
-        )
-        * u.um
-    )
-
-    # The fitted primary-mirror displacement relative to its -1000 mm nominal
-    # focal length; this hard reference is what the fit is measured from.
-    primary_displacement = (
-        na.ScalarArray(
-            np.array([-5.649e00, -2.207e-02, -2.795e00, -1.616e00]),
-            axes=axis_channel,
-        )
-        * u.mm
-    )
-    model.primary_mirror.sag.focal_length = -1000 * u.mm + primary_displacement
-    model.primary_mirror.translation.z = -primary_displacement
-
-    model.pitch = (
-        na.ScalarArray(
-            np.array([-2.024e01, -2.096e01, -1.973e01, -2.119e01]),
-            axes=axis_channel,
-        )
-        * u.arcsec
-    )
-    model.yaw = (
-        na.ScalarArray(
-            np.array([-1.832e01, -1.675e01, -1.604e01, -1.498e01]),
-            axes=axis_channel,
-        )
-        * u.arcsec
-    )
-    model.roll = (
-        na.ScalarArray(
-            np.array([-8.681e-01, -3.391e-01, -3.378e-01, -1.109e00]),
-            axes=axis_channel,
-        )
-        * u.deg
+    solution = esis.optics.DistortionSolution.from_file(
+        _directory_data / "ESISI_distortion_optimization_20260213_151715",
     )
 
-    return model
+    return solution.apply(model)
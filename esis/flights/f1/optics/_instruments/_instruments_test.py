@@ -1,4 +1,6 @@
 import pytest
+import numpy as np
+import astropy.units as u
 import esis
 
 
@@ -40,3 +42,14 @@ def test_distortion_fit(num_distribution: int):
         num_distribution=num_distribution,
     )
     assert isinstance(result, esis.optics.abc.AbstractInstrument)
+
+
+def test_as_built_cached():
+    a = esis.flights.f1.optics.as_built(num_distribution=0)
+    hits = esis.cache.hits
+    b = esis.flights.f1.optics.as_built(num_distribution=0)
+    assert esis.cache.hits == hits + 1
+    assert a is not b
+    b.grating.yaw = 1 * u.deg
+    assert a.grating.yaw != b.grating.yaw
+    assert np.all(a.camera.channel == b.camera.channel)
@@ -1,5 +1,6 @@
 import astropy.units as u
 import optika
+import esis
 
 __all__ = [
     "thin_film_design",
@@ -62,14 +63,14 @@ def thin_film_design() -> optika.materials.ThinFilmFilter:
     """
     return optika.materials.ThinFilmFilter(
         layer=optika.materials.Layer(
-            chemical="Al",
+            chemical=esis.optics.TabulatedChemical("Al"),
             thickness=100 * u.nm,
             kwargs_plot=dict(
                 color="lightgray",
             ),
         ),
         layer_oxide=optika.materials.Layer(
-            chemical=optika.chemicals.Chemical(
+            chemical=esis.optics.TabulatedChemical(
                 formula="Al2O3",
                 is_amorphous=True,
                 table="palik",
@@ -74,7 +74,7 @@ def multilayer_design() -> optika.materials.MultilayerMirror:
             ax.set_axis_off()
     """
     layer_oxide = optika.materials.Layer(
-        chemical="SiO2",
+        chemical=esis.optics.TabulatedChemical("SiO2"),
         thickness=1 * u.nm,
         interface=optika.materials.profiles.ErfInterfaceProfile(1 * u.nm),
         kwargs_plot=dict(
@@ -84,7 +84,7 @@ def multilayer_design() -> optika.materials.MultilayerMirror:
     )
 
     layer_sic = optika.materials.Layer(
-        chemical=optika.chemicals.Chemical(
+        chemical=esis.optics.TabulatedChemical(
             formula="SiC",
             is_amorphous=True,
             table="kortright",
@@ -97,7 +97,7 @@ def multilayer_design() -> optika.materials.MultilayerMirror:
     )
 
     layer_al = optika.materials.Layer(
-        chemical="Al",
+        chemical=esis.optics.TabulatedChemical("Al"),
         thickness=1 * u.nm,
         interface=optika.materials.profiles.ErfInterfaceProfile(1 * u.nm),
         kwargs_plot=dict(
@@ -107,7 +107,7 @@ def multilayer_design() -> optika.materials.MultilayerMirror:
     )
 
     layer_mg = optika.materials.Layer(
-        chemical=optika.chemicals.Chemical(
+        chemical=esis.optics.TabulatedChemical(
             formula="Mg",
             table="fernandez_perea",
         ),
@@ -119,7 +119,7 @@ def multilayer_design() -> optika.materials.MultilayerMirror:
     )
 
     layer_substrate = optika.materials.Layer(
-        chemical="SiO2",
+        chemical=esis.optics.TabulatedChemical("SiO2"),
         thickness=10 * u.mm,
         interface=optika.materials.profiles.ErfInterfaceProfile(1 * u.nm),
         kwargs_plot=dict(
@@ -244,7 +244,7 @@ def multilayer_witness_measured() -> optika.materials.MeasuredMirror:
             outputs=reflectivity,
         ),
         substrate=optika.materials.Layer(
-            chemical="Si",
+            chemical=esis.optics.TabulatedChemical("Si"),
         ),
         serial_number=serial_number,
     )
@@ -252,7 +252,13 @@ def multilayer_witness_measured() -> optika.materials.MeasuredMirror:
     return result
 
 
-@esis.memory.cache
+@esis.cache.memoize(
+    paths=[
+        pathlib.Path(__file__),
+        pathlib.Path(__file__).parent / "_data/*",
+        pathlib.Path(esis.optics.__file__).parent / "_chemicals/_chemicals.py",
+    ],
+)
 def multilayer_witness_fit() -> optika.materials.MultilayerMirror:
     r"""
     Fit a multilayer stack to the :func:`multilayer_witness_measured` measurement.
@@ -398,7 +404,7 @@ def multilayer_witness_fit() -> optika.materials.MultilayerMirror:
         result.layers.pop(0)
 
         result.substrate.interface.width = width_substrate
-        result.substrate.chemical = "Si"
+        result.substrate.chemical = esis.optics.TabulatedChemical("Si")
 
         return result
 
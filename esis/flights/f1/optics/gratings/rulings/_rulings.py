@@ -10,6 +10,37 @@ __all__ = [
 ]
 
 
+def _spacing(
+    density: u.Quantity,
+    width: u.Quantity,
+    num_distribution: int,
+) -> na.UniformUncertainScalarArray:
+    """
+    Convert a groove density and its tolerance into a ruling spacing.
+
+    The tolerance is converted to first order,
+    which is exact to within about one part in :math:`10^7` for these
+    gratings,
+    so that the spacing is an independent parameter which can be resampled
+    by :class:`esis.optics.MonteCarlo`.
+
+    Parameters
+    ----------
+    density
+        The nominal number of grooves per unit length.
+    width
+        The half-width of the uniform distribution of the groove density.
+    num_distribution
+        The number of Monte Carlo samples to draw.
+    """
+    spacing = 1 / density
+    return na.UniformUncertainScalarArray(
+        nominal=spacing.to(u.mm),
+        width=(width * np.square(spacing)).to(u.mm),
+        num_distribution=num_distribution,
+    )
+
+
 def ruling_design(
     num_distribution: int = 11,
 ) -> optika.rulings.AbstractRulings:
@@ -68,16 +99,14 @@ def ruling_design(
             ax.set_xlabel(f"wavelength ({ax.get_xlabel()})");
             ax.set_ylabel("efficiency");
     """
-    density = na.UniformUncertainScalarArray(
-        nominal=(2.586608603456000 / u.um).to(1 / u.mm),
-        width=1 / u.mm,
-        num_distribution=num_distribution,
-    )
-
     return optika.rulings.RectangularRulings(
         spacing=optika.rulings.Polynomial1dRulingSpacing(
             coefficients={
-                0: 1 / density,
+                0: _spacing(
+                    density=(2.586608603456000 / u.um).to(1 / u.mm),
+                    width=1 / u.mm,
+                    num_distribution=num_distribution,
+                ),
                 1: na.UniformUncertainScalarArray(
                     nominal=-3.3849e-5 * (u.um / u.mm),
                     width=0.0512e-5 * (u.um / u.mm),
@@ -195,15 +224,13 @@ def ruling_measurement(
     """
     design = ruling_design(num_distribution=num_distribution)
 
-    density = na.UniformUncertainScalarArray(
-        nominal=2585.5 / u.mm,
+    spacing = design.spacing
+    spacing.coefficients[0] = _spacing(
+        density=2585.5 / u.mm,
         width=1 / u.mm,
         num_distribution=num_distribution,
     )
 
-    spacing = design.spacing
-    spacing.coefficients[0] = 1 / density
-
     efficiency_total = gratings.efficiencies.efficiency_vs_wavelength()
 
     wavelength = efficiency_total.inputs.wavelength
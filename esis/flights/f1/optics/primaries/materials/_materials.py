@@ -59,7 +59,7 @@ def multilayer_design() -> optika.materials.MultilayerMirror:
     return optika.materials.MultilayerMirror(
         layers=[
             optika.materials.Layer(
-                chemical="SiO2",
+                chemical=esis.optics.TabulatedChemical("SiO2"),
                 thickness=1 * u.nm,
                 interface=optika.materials.profiles.ErfInterfaceProfile(2 * u.nm),
                 kwargs_plot=dict(
@@ -68,7 +68,7 @@ def multilayer_design() -> optika.materials.MultilayerMirror:
                 ),
             ),
             optika.materials.Layer(
-                chemical="SiC",
+                chemical=esis.optics.TabulatedChemical("SiC"),
                 thickness=25 * u.nm,
                 interface=optika.materials.profiles.ErfInterfaceProfile(2 * u.nm),
                 kwargs_plot=dict(
@@ -77,7 +77,7 @@ def multilayer_design() -> optika.materials.MultilayerMirror:
                 ),
             ),
             optika.materials.Layer(
-                chemical="Cr",
+                chemical=esis.optics.TabulatedChemical("Cr"),
                 thickness=5 * u.nm,
                 interface=optika.materials.profiles.ErfInterfaceProfile(2 * u.nm),
                 kwargs_plot=dict(
@@ -87,7 +87,7 @@ def multilayer_design() -> optika.materials.MultilayerMirror:
             ),
         ],
         substrate=optika.materials.Layer(
-            chemical="SiO2",
+            chemical=esis.optics.TabulatedChemical("SiO2"),
             thickness=30 * u.mm,
             interface=optika.materials.profiles.ErfInterfaceProfile(2 * u.nm),
             kwargs_plot=dict(
@@ -147,14 +147,20 @@ def multilayer_witness_measured() -> optika.materials.MeasuredMirror:
             outputs=reflectivity,
         ),
         substrate=optika.materials.Layer(
-            chemical="Si",
+            chemical=esis.optics.TabulatedChemical("Si"),
         ),
     )
 
     return result
 
 
-@esis.memory.cache
+@esis.cache.memoize(
+    paths=[
+        pathlib.Path(__file__),
+        pathlib.Path(__file__).parent / "_data/*",
+        pathlib.Path(esis.optics.__file__).parent / "_chemicals/_chemicals.py",
+    ],
+)
 def multilayer_witness_fit() -> optika.materials.MultilayerMirror:
     """
     Fit a multilayer stack to the :func:`multilayer_witness_measured` measurement.
@@ -253,7 +259,7 @@ def multilayer_witness_fit() -> optika.materials.MultilayerMirror:
         result.layers[2].interface.width = width_Cr * unit
         result.layers.pop(0)
         result.substrate.interface.width = width_substrate * unit
-        result.substrate.chemical = "Si"
+        result.substrate.chemical = esis.optics.TabulatedChemical("Si")
 
         return result
 
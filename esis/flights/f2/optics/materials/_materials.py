@@ -1,5 +1,6 @@
 import astropy.units as u
 import optika
+import esis
 
 __all__ = [
     "multilayer_AlSc",
@@ -52,7 +53,7 @@ def multilayer_AlSc() -> optika.materials.MultilayerMirror:
     return optika.materials.MultilayerMirror(
         layers=[
             optika.materials.Layer(
-                chemical="Al2O3",
+                chemical=esis.optics.TabulatedChemical("Al2O3"),
                 thickness=1 * u.nm,
                 interface=optika.materials.profiles.ErfInterfaceProfile(
                     width=7 * u.AA,
@@ -65,7 +66,7 @@ def multilayer_AlSc() -> optika.materials.MultilayerMirror:
             optika.materials.PeriodicLayerSequence(
                 [
                     optika.materials.Layer(
-                        chemical="Al",
+                        chemical=esis.optics.TabulatedChemical("Al"),
                         thickness=gamma * d,
                         interface=optika.materials.profiles.ErfInterfaceProfile(
                             width=7 * u.AA,
@@ -76,7 +77,7 @@ def multilayer_AlSc() -> optika.materials.MultilayerMirror:
                         ),
                     ),
                     optika.materials.Layer(
-                        chemical="Sc",
+                        chemical=esis.optics.TabulatedChemical("Sc"),
                         thickness=(1 - gamma) * d,
                         interface=optika.materials.profiles.ErfInterfaceProfile(
                             width=7 * u.AA,
@@ -91,7 +92,7 @@ def multilayer_AlSc() -> optika.materials.MultilayerMirror:
             ),
         ],
         substrate=optika.materials.Layer(
-            chemical="SiO2",
+            chemical=esis.optics.TabulatedChemical("SiO2"),
             thickness=30 * u.mm,
             interface=optika.materials.profiles.ErfInterfaceProfile(
                 7 * u.AA,
@@ -149,7 +150,7 @@ def multilayer_SiSc() -> optika.materials.MultilayerMirror:
     return optika.materials.MultilayerMirror(
         layers=[
             optika.materials.Layer(
-                chemical="SiO2",
+                chemical=esis.optics.TabulatedChemical("SiO2"),
                 thickness=1 * u.nm,
                 interface=optika.materials.profiles.ErfInterfaceProfile(
                     width=7 * u.AA,
@@ -162,7 +163,7 @@ def multilayer_SiSc() -> optika.materials.MultilayerMirror:
             optika.materials.PeriodicLayerSequence(
                 [
                     optika.materials.Layer(
-                        chemical="Si",
+                        chemical=esis.optics.TabulatedChemical("Si"),
                         thickness=gamma * d,
                         interface=optika.materials.profiles.ErfInterfaceProfile(
                             width=7 * u.AA,
@@ -173,7 +174,7 @@ def multilayer_SiSc() -> optika.materials.MultilayerMirror:
                         ),
                     ),
                     optika.materials.Layer(
-                        chemical="Sc",
+                        chemical=esis.optics.TabulatedChemical("Sc"),
                         thickness=(1 - gamma) * d,
                         interface=optika.materials.profiles.ErfInterfaceProfile(
                             width=7 * u.AA,
@@ -188,7 +189,7 @@ def multilayer_SiSc() -> optika.materials.MultilayerMirror:
             ),
         ],
         substrate=optika.materials.Layer(
-            chemical="SiO2",
+            chemical=esis.optics.TabulatedChemical("SiO2"),
             thickness=30 * u.mm,
             interface=optika.materials.profiles.ErfInterfaceProfile(
                 7 * u.AA,
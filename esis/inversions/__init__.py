@@ -0,0 +1,19 @@
+"""
+Invert ESIS images into spatial-spectral cubes.
+
+Each inversion method uses an instance of :class:`esis.optics.ProjectionOperator`
+to model the instrument,
+and returns an instance of :class:`InversionResult`,
+so that the convergence of different methods can be compared directly.
+"""
+
+from . import abc
+from ._inversions import InversionResult
+from ._iterative import RichardsonLucy, MART
+
+__all__ = [
+    "abc",
+    "InversionResult",
+    "RichardsonLucy",
+    "MART",
+]
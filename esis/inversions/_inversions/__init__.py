@@ -0,0 +1,6 @@
+from ._inversions import InversionResult, AbstractInversion
+
+__all__ = [
+    "InversionResult",
+    "AbstractInversion",
+]
@@ -0,0 +1,209 @@
+from __future__ import annotations
+import abc
+import math
+import pathlib
+import dataclasses
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import esis
+
+__all__ = [
+    "InversionResult",
+    "AbstractInversion",
+]
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class InversionResult:
+    """
+    The spectral scene recovered by an inversion method.
+
+    The history of the convergence of the method is stored alongside
+    the scene.
+    """
+
+    scene: na.ScalarArray
+    """
+    The recovered scene,
+    in units of the inverted images divided by the units of the projection.
+    """
+
+    merit: na.ScalarArray
+    """
+    The value of :meth:`AbstractInversion.merit` after each iteration.
+
+    Iterations which were skipped because the inversion of a frame
+    stopped early are :obj:`numpy.nan`.
+    """
+
+    path: None | pathlib.Path = None
+    """The directory containing the intermediate scenes, if they were saved."""
+
+    axis_iteration: str = dataclasses.field(default="iteration", kw_only=True)
+    """The logical axis corresponding to changing iteration number."""
+
+    @property
+    def shape_batch(self) -> dict[str, int]:
+        """The shape of the frames which were inverted, such as time."""
+        shape = self.merit.shape
+        return {ax: shape[ax] for ax in shape if ax != self.axis_iteration}
+
+    @property
+    def num_iteration(self) -> int:
+        """The maximum number of iterations used to invert each frame."""
+        return self.merit.shape[self.axis_iteration]
+
+    def iterate(self, index: int) -> na.ScalarArray:
+        """
+        Load the scene saved after a given iteration.
+
+        Parameters
+        ----------
+        index
+            The iteration number of the scene to load.
+
+        Raises
+        ------
+        ValueError
+            If the intermediate scenes were not saved.
+        """
+        if self.path is None:
+            raise ValueError("The intermediate scenes were not saved.")
+
+        shape_batch = self.shape_batch
+        shape_scene = {
+            ax: num for ax, num in self.scene.shape.items() if ax not in shape_batch
+        }
+
+        result = np.stack(
+            arrays=[
+                np.load(self.path / f"{i:06d}" / f"{index:04d}.npy")
+                for i in range(math.prod(shape_batch.values()))
+            ],
+            axis=~0,
+        )
+
+        result = esis.optics.ProjectionOperator.unravel(
+            a=result,
+            shape_batch=shape_batch,
+            shape=shape_scene,
+        )
+
+        return result << na.unit(self.scene)
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class AbstractInversion(
+    abc.ABC,
+):
+    """
+    An interface describing an algorithm which inverts a set of ESIS images.
+
+    The result of the inversion is an estimate of the spectral scene.
+    """
+
+    projection: esis.optics.ProjectionOperator
+    """The model of the instrument used to project the scene onto the images."""
+
+    @abc.abstractmethod
+    def __call__(
+        self,
+        a: esis.data.abc.AbstractChannelData | na.AbstractScalar,
+    ) -> InversionResult:
+        """
+        Invert a sequence of images.
+
+        Parameters
+        ----------
+        a
+            The images to invert.
+            The logical axes must match
+            :attr:`~esis.optics.ProjectionOperator.shape_image`,
+            and any other axes, such as time, are inverted independently.
+        """
+
+    def forward(
+        self,
+        scene: na.AbstractScalar,
+    ) -> na.ScalarArray:
+        """
+        Project a scene onto the detectors using :attr:`projection`.
+
+        Parameters
+        ----------
+        scene
+            The scene to project.
+        """
+        return self.projection.forward(scene)
+
+    def backward(
+        self,
+        image: na.AbstractScalar,
+    ) -> na.ScalarArray:
+        """
+        Back-project an image into the scene using :attr:`projection`.
+
+        Parameters
+        ----------
+        image
+            The image to back-project.
+        """
+        return self.projection.backward(image)
+
+    def merit(
+        self,
+        scene: na.AbstractScalar,
+        image: na.AbstractScalar,
+    ) -> na.ScalarArray:
+        r"""
+        Compute how well a scene reproduces a set of images.
+
+        This is the mean of the squared residuals divided by the model image,
+        which is the reduced :math:`\chi^2` if the images are Poisson-distributed
+        counts.
+        Pixels which the scene does not illuminate are ignored.
+
+        Parameters
+        ----------
+        scene
+            The candidate scene.
+        image
+            The measured images.
+        """
+        projection = self.projection
+        shape_image = projection.shape_image
+
+        image = na.asanyarray(image)
+        unit = na.unit(image, unit_dimensionless=u.dimensionless_unscaled)
+        image, shape_batch = projection.ravel(na.value(image), shape_image)
+
+        model = self.forward(scene).to(unit).value
+        model = na.broadcast_to(model, shape_batch | shape_image)
+        model, _ = projection.ravel(model, shape_image)
+
+        return na.ScalarArray(
+            ndarray=self._merit(image, model).reshape(tuple(shape_batch.values())),
+            axes=tuple(shape_batch),
+        )
+
+    @staticmethod
+    def _merit(
+        image: np.ndarray,
+        model: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Compute :meth:`merit` for each column of a flattened set of images.
+
+        Parameters
+        ----------
+        image
+            The measured images, flattened by
+            :meth:`~esis.optics.ProjectionOperator.ravel`.
+        model
+            The projected scene, in the same layout as `image`.
+        """
+        where = model > 0
+        residual = np.square(image - model) / np.where(where, model, 1)
+        residual = np.where(where, residual, 0)
+        return residual.sum(axis=0) / np.maximum(where.sum(axis=0), 1)
@@ -0,0 +1,39 @@
+import abc
+import numpy as np
+import named_arrays as na
+import esis
+
+
+class AbstractTestAbstractInversion(
+    abc.ABC,
+):
+    def test_projection(self, a: esis.inversions.abc.AbstractInversion):
+        result = a.projection
+        assert isinstance(result, esis.optics.ProjectionOperator)
+
+    def test_merit(self, a: esis.inversions.abc.AbstractInversion):
+        projection = a.projection
+        scene = na.random.uniform(1, 2, shape_random=projection.shape_scene)
+        image = projection.forward(scene)
+        result = a.merit(scene, image)
+        assert np.allclose(result, 0)
+        result = a.merit(2 * scene, image)
+        assert np.all(result > 0)
+
+    def test__call__(self, a: esis.inversions.abc.AbstractInversion):
+        projection = a.projection
+        scene = na.random.uniform(
+            low=1,
+            high=2,
+            shape_random=dict(time=2) | projection.shape_scene,
+            seed=1,
+        )
+        image = projection.forward(scene)
+        result = a(image)
+        assert isinstance(result, esis.inversions.InversionResult)
+        assert result.scene.shape == scene.shape
+        assert result.shape_batch == dict(time=2)
+        merit = result.merit
+        axis = result.axis_iteration
+        best = np.nanmin(merit.ndarray, axis=merit.axes.index(axis))
+        assert np.all(best < merit[{axis: 0}].ndarray)
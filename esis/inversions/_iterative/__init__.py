@@ -0,0 +1,7 @@
+from ._iterative import AbstractIterativeInversion, RichardsonLucy, MART
+
+__all__ = [
+    "AbstractIterativeInversion",
+    "RichardsonLucy",
+    "MART",
+]
@@ -0,0 +1,597 @@
+from __future__ import annotations
+from typing import Callable
+import abc
+import os
+import pathlib
+import functools
+import dataclasses
+import multiprocessing
+import concurrent.futures
+import numpy as np
+import scipy.sparse
+import astropy.units as u
+import named_arrays as na
+import esis
+from .._inversions import InversionResult, AbstractInversion
+
+__all__ = [
+    "AbstractIterativeInversion",
+    "RichardsonLucy",
+    "MART",
+]
+
+_inversion: None | AbstractIterativeInversion = None
+"""The inversion being computed by the current worker process."""
+
+
+def _initialize(inversion: AbstractIterativeInversion) -> None:
+    global _inversion
+    _inversion = inversion
+
+
+def _solve_segment(*args) -> tuple[np.ndarray, np.ndarray]:
+    return _inversion._solve_segment(*args)
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class AbstractIterativeInversion(
+    AbstractInversion,
+):
+    """
+    An interface describing iterative inversion methods.
+
+    These methods refine an estimate of the scene
+    using repeated projection and back-projection.
+
+    The images are flattened using
+    :meth:`esis.optics.ProjectionOperator.ravel`,
+    so that each iteration is a handful of sparse matrix products,
+    and batches of :attr:`num_batch` frames are distributed across
+    a pool of processes.
+    """
+
+    @property
+    @abc.abstractmethod
+    def num_iteration(self) -> int:
+        """The maximum number of iterations used to invert each frame."""
+
+    @property
+    @abc.abstractmethod
+    def tolerance(self) -> None | float:
+        """
+        The relative change in :meth:`merit` below which the iterations stop.
+
+        If :obj:`None`, :attr:`num_iteration` iterations are always used.
+        """
+
+    @property
+    @abc.abstractmethod
+    def num_batch(self) -> int:
+        """
+        The number of frames inverted at once.
+
+        Each batch is stacked into a matrix with one column for each frame,
+        so projecting the batch is a single sparse matrix-matrix product,
+        which is much faster than projecting each frame separately.
+        """
+
+    @property
+    @abc.abstractmethod
+    def warm_start(self) -> bool:
+        """
+        Whether to start each batch of frames from the previous solution.
+
+        If :obj:`True`, each batch starts from the solution of the last
+        frame in the previous batch,
+        scaled by the ratio of the total signal in the two frames,
+        instead of the back-projection of the images.
+
+        Consecutive frames of a sequence are very similar,
+        so together with :attr:`tolerance`,
+        this can greatly reduce the number of iterations needed for each frame.
+        Since the batches then depend on each other,
+        the sequence is split into one contiguous segment per worker,
+        and the batches within each segment are inverted in order.
+        """
+
+    @property
+    @abc.abstractmethod
+    def callback(self) -> None | Callable[[int, np.ndarray], None | bool]:
+        """
+        A function called after each iteration.
+
+        The function is called with the iteration number and
+        the value of :meth:`merit` for each frame being inverted.
+        If it returns :obj:`True`, the inversion of these frames stops early.
+        This function must be picklable if :attr:`workers` is not ``1``.
+        """
+
+    @property
+    @abc.abstractmethod
+    def path(self) -> None | pathlib.Path:
+        """
+        A directory to save the scene after each iteration.
+
+        The saved scenes can be loaded using :meth:`InversionResult.iterate`.
+        If :obj:`None`, the intermediate scenes are not saved.
+        """
+
+    @property
+    @abc.abstractmethod
+    def workers(self) -> None | int:
+        """
+        The number of processes used to invert the frames.
+
+        If :obj:`None`, the number of CPUs is used.
+        If ``1``, the frames are inverted serially in this process.
+        The processes are started using the ``"forkserver"`` method,
+        since forking after the threads started by the dependencies of
+        :mod:`esis` can deadlock.
+        """
+
+    @functools.cached_property
+    def _normalization(self) -> np.ndarray:
+        """The back-projection of a uniform image."""
+        matrix = self.projection.matrix
+        return matrix.T @ np.ones((matrix.shape[0], 1))
+
+    def _initial(self, image: np.ndarray) -> np.ndarray:
+        """
+        Compute the first estimate of the scene.
+
+        The first estimate is the back-projection of the images
+        normalized by :attr:`_normalization`.
+
+        Parameters
+        ----------
+        image
+            The flattened images to invert.
+        """
+        normalization = self._normalization
+        result = self.projection.matrix.T @ image
+        where = normalization > 0
+        return np.where(where, result / np.where(where, normalization, 1), 0)
+
+    @abc.abstractmethod
+    def _update(
+        self,
+        scene: np.ndarray,
+        image: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Compute the next estimate of the scene.
+
+        Parameters
+        ----------
+        scene
+            The current estimate of the scene, flattened by
+            :meth:`~esis.optics.ProjectionOperator.ravel`.
+        image
+            The flattened images to invert.
+        """
+
+    def _solve(
+        self,
+        image: np.ndarray,
+        scene: np.ndarray,
+        index: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Iterate on a batch of frames until the stopping criteria are met.
+
+        The iterations stop when :attr:`num_iteration` is reached,
+        the change in the merit is smaller than :attr:`tolerance`,
+        or :attr:`callback` returns :obj:`True`.
+
+        Parameters
+        ----------
+        image
+            The flattened images to invert,
+            with one column for each frame.
+        scene
+            The initial estimate of the scene for each frame.
+        index
+            The index of the first frame in this batch,
+            used to name the saved intermediate scenes.
+        """
+        matrix = self.projection.matrix
+        tolerance = self.tolerance
+        callback = self.callback
+        path = self.path
+
+        merit = np.full((self.num_iteration, image.shape[1]), np.nan)
+
+        for i in range(self.num_iteration):
+
+            scene = self._update(scene, image)
+
+            merit[i] = self._merit(image, matrix @ scene)
+
+            if path is not None:
+                for j in range(scene.shape[1]):
+                    path_frame = path / f"{index + j:06d}"
+                    path_frame.mkdir(parents=True, exist_ok=True)
+                    np.save(path_frame / f"{i:04d}.npy", scene[:, j])
+
+            if callback is not None:
+                if callback(i, merit[i]):
+                    break
+
+            if tolerance is not None and i > 0:
+                change = np.abs(merit[i - 1] - merit[i])
+                if np.all(change <= tolerance * merit[i - 1]):
+                    break
+
+        return scene, merit
+
+    def _solve_segment(
+        self,
+        image: np.ndarray,
+        index: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Invert a contiguous segment of frames in batches of :attr:`num_batch`.
+
+        Parameters
+        ----------
+        image
+            The flattened images to invert,
+            with one column for each frame.
+        index
+            The index of the first frame in this segment.
+        """
+        num_batch = self.num_batch
+        num_frame = image.shape[1]
+
+        scenes = []
+        merits = []
+
+        for start in range(0, num_frame, num_batch):
+
+            image_batch = image[:, start : start + num_batch]
+
+            if self.warm_start and scenes:
+                scale = image_batch.sum(axis=0)
+                signal = image[:, start - 1].sum()
+                scale = scale / signal if signal > 0 else np.ones_like(scale)
+                scene = scenes[~0][:, [~0]] * scale
+            else:
+                scene = self._initial(image_batch)
+
+            scene, merit = self._solve(image_batch, scene, index + start)
+
+            scenes.append(scene)
+            merits.append(merit)
+
+        return np.concatenate(scenes, axis=1), np.concatenate(merits, axis=1)
+
+    def __call__(
+        self,
+        a: esis.data.abc.AbstractChannelData | na.AbstractScalar,
+    ) -> InversionResult:
+
+        projection = self.projection
+
+        if isinstance(a, esis.data.abc.AbstractChannelData):
+            a = a.outputs
+
+        a = na.asanyarray(a)
+        unit = na.unit(a, unit_dimensionless=u.dimensionless_unscaled)
+
+        image, shape_batch = projection.ravel(na.value(a), projection.shape_image)
+        image = np.maximum(image, 0)
+
+        num_frame = image.shape[1]
+
+        workers = self.workers
+        if workers is None:
+            workers = os.cpu_count()
+
+        if self.warm_start:
+            bounds = np.linspace(0, num_frame, num=min(workers, num_frame) + 1)
+            bounds = bounds.astype(int)
+        else:
+            bounds = np.arange(0, num_frame + self.num_batch, self.num_batch)
+            bounds = np.minimum(bounds, num_frame)
+
+        args = [
+            (image[:, start:stop], start)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+            if stop > start
+        ]
+
+        if workers == 1 or len(args) == 1:
+            results = [self._solve_segment(*arg) for arg in args]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_initialize,
+                initargs=(self,),
+            ) as executor:
+                results = list(executor.map(_solve_segment, *zip(*args)))
+
+        scene = np.concatenate([r[0] for r in results], axis=1)
+        merit = np.concatenate([r[1] for r in results], axis=1)
+
+        return self._result(scene, merit, shape_batch, unit)
+
+    def _result(
+        self,
+        scene: np.ndarray,
+        merit: np.ndarray,
+        shape_batch: dict[str, int],
+        unit: u.UnitBase,
+    ) -> InversionResult:
+        """
+        Restore the flattened scene and merit into an :class:`InversionResult`.
+
+        Parameters
+        ----------
+        scene
+            The flattened scene for each frame.
+        merit
+            The merit of each frame after each iteration.
+        shape_batch
+            The shape of the frames.
+        unit
+            The units of the inverted images.
+        """
+        projection = self.projection
+        axis_iteration = "iteration"
+
+        scene = projection.unravel(scene, shape_batch, projection.shape_scene)
+
+        merit = na.ScalarArray(
+            ndarray=merit.reshape(-1, *shape_batch.values()),
+            axes=(axis_iteration, *shape_batch),
+        )
+
+        return InversionResult(
+            scene=scene << (unit / projection.unit),
+            merit=merit,
+            path=self.path,
+            axis_iteration=axis_iteration,
+        )
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class RichardsonLucy(
+    AbstractIterativeInversion,
+):
+    r"""
+    Invert images using the Richardson-Lucy algorithm.
+
+    Each iteration multiplies the scene by the back-projection of the ratio
+    of the measured images to the projected scene,
+
+    .. math::
+
+        x \leftarrow x \frac{A^T (y / A x)}{A^T 1},
+
+    where :math:`A` is :attr:`~esis.optics.ProjectionOperator.matrix`.
+    This is the maximum-likelihood update for Poisson-distributed images,
+    and it keeps the scene positive.
+
+    Examples
+    --------
+    Invert a scene projected through a random sparse matrix.
+
+    .. jupyter-execute::
+
+        import numpy as np
+        import scipy.sparse
+        import named_arrays as na
+        import esis
+
+        projection = esis.optics.ProjectionOperator(
+            matrix=scipy.sparse.random(
+                m=400,
+                n=100,
+                density=0.1,
+                format="csr",
+                random_state=1,
+            ),
+            shape_scene=dict(wavelength=4, field_x=5, field_y=5),
+            shape_image=dict(channel=4, detector_x=10, detector_y=10),
+        )
+
+        scene = na.random.uniform(1, 2, shape_random=projection.shape_scene)
+
+        image = projection.forward(scene)
+
+        inversion = esis.inversions.RichardsonLucy(projection, workers=1)
+
+        result = inversion(image)
+
+        result.merit
+    """
+
+    num_iteration: int = 20
+    """The maximum number of iterations used to invert each frame."""
+
+    tolerance: None | float = None
+    """
+    The relative change in :meth:`merit` below which the iterations stop.
+    If :obj:`None`, :attr:`num_iteration` iterations are always used.
+    """
+
+    num_batch: int = 1
+    """The number of frames inverted at once."""
+
+    warm_start: bool = False
+    """Whether to start each batch of frames from the solution of the last."""
+
+    callback: None | Callable[[int, np.ndarray], None | bool] = None
+    """
+    A function called after each iteration with the iteration number and
+    the value of :meth:`merit` for each frame being inverted.
+    If it returns :obj:`True`, the inversion of these frames stops early.
+    """
+
+    path: None | pathlib.Path = None
+    """A directory to save the scene after each iteration."""
+
+    workers: None | int = None
+    """The number of processes used to invert the frames."""
+
+    def _update(
+        self,
+        scene: np.ndarray,
+        image: np.ndarray,
+    ) -> np.ndarray:
+        matrix = self.projection.matrix
+        normalization = self._normalization
+
+        model = matrix @ scene
+        where = model > 0
+        ratio = np.where(where, image / np.where(where, model, 1), 0)
+
+        where = normalization > 0
+        correction = matrix.T @ ratio
+        correction = correction / np.where(where, normalization, 1)
+
+        return np.where(where, scene * correction, scene)
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class MART(
+    AbstractIterativeInversion,
+):
+    r"""
+    Invert images using the multiplicative algebraic reconstruction technique.
+
+    Unlike :class:`RichardsonLucy`, which corrects the scene using all the
+    channels at once,
+    each iteration of this method corrects the scene using each channel in turn,
+
+    .. math::
+
+        x \leftarrow x \left( \frac{A_c^T (y_c / A_c x)}{A_c^T 1} \right)^\lambda,
+
+    where :math:`A_c` are the rows of
+    :attr:`~esis.optics.ProjectionOperator.matrix` belonging to
+    channel :math:`c` and :math:`\lambda` is :attr:`relaxation`.
+    This usually converges in fewer iterations,
+    since each channel sees the scene already corrected by the previous ones.
+
+    Examples
+    --------
+    Invert a scene projected through a random sparse matrix.
+
+    .. jupyter-execute::
+
+        import numpy as np
+        import scipy.sparse
+        import named_arrays as na
+        import esis
+
+        projection = esis.optics.ProjectionOperator(
+            matrix=scipy.sparse.random(
+                m=400,
+                n=100,
+                density=0.1,
+                format="csr",
+                random_state=1,
+            ),
+            shape_scene=dict(wavelength=4, field_x=5, field_y=5),
+            shape_image=dict(channel=4, detector_x=10, detector_y=10),
+        )
+
+        scene = na.random.uniform(1, 2, shape_random=projection.shape_scene)
+
+        image = projection.forward(scene)
+
+        inversion = esis.inversions.MART(projection, workers=1)
+
+        result = inversion(image)
+
+        result.merit
+    """
+
+    num_iteration: int = 20
+    """The maximum number of iterations used to invert each frame."""
+
+    relaxation: float = 1
+    """The exponent applied to the correction from each channel."""
+
+    axis_channel: str = "channel"
+    """
+    The logical axis of
+    :attr:`~esis.optics.ProjectionOperator.shape_image`
+    corresponding to changing channel.
+    """
+
+    tolerance: None | float = None
+    """
+    The relative change in :meth:`merit` below which the iterations stop.
+    If :obj:`None`, :attr:`num_iteration` iterations are always used.
+    """
+
+    num_batch: int = 1
+    """The number of frames inverted at once."""
+
+    warm_start: bool = False
+    """Whether to start each batch of frames from the solution of the last."""
+
+    callback: None | Callable[[int, np.ndarray], None | bool] = None
+    """
+    A function called after each iteration with the iteration number and
+    the value of :meth:`merit` for each frame being inverted.
+    If it returns :obj:`True`, the inversion of these frames stops early.
+    """
+
+    path: None | pathlib.Path = None
+    """A directory to save the scene after each iteration."""
+
+    workers: None | int = None
+    """The number of processes used to invert the frames."""
+
+    @functools.cached_property
+    def _blocks(
+        self,
+    ) -> list[tuple[np.ndarray, scipy.sparse.csr_array, np.ndarray]]:
+        """
+        The rows of the projection matrix belonging to each channel.
+
+        Each block is stored along with the indices of its rows and
+        its back-projection of a uniform image.
+        The channels are found using :attr:`axis_channel`,
+        so the channel axis can be anywhere in
+        :attr:`~esis.optics.ProjectionOperator.shape_image`.
+        """
+        projection = self.projection
+        matrix = projection.matrix
+        shape_image = projection.shape_image
+        axis = list(shape_image).index(self.axis_channel)
+        rows = np.arange(matrix.shape[0]).reshape(tuple(shape_image.values()))
+        result = []
+        for c in range(shape_image[self.axis_channel]):
+            rows_c = rows.take(c, axis=axis).reshape(-1)
+            block = matrix[rows_c]
+            result.append((rows_c, block, block.T @ np.ones((rows_c.size, 1))))
+        return result
+
+    def _update(
+        self,
+        scene: np.ndarray,
+        image: np.ndarray,
+    ) -> np.ndarray:
+        relaxation = self.relaxation
+
+        for rows, block, normalization in self._blocks:
+
+            image_c = image[rows]
+
+            model = block @ scene
+            where = model > 0
+            ratio = np.where(where, image_c / np.where(where, model, 1), 0)
+
+            where = normalization > 0
+            correction = block.T @ ratio
+            correction = correction / np.where(where, normalization, 1)
+            correction = np.where(where, correction, 1)
+
+            scene = scene * correction**relaxation
+
+        return scene
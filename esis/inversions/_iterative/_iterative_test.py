@@ -0,0 +1,120 @@
+import pytest
+import dataclasses
+import numpy as np
+import scipy.sparse
+import named_arrays as na
+import esis
+from .._inversions._inversions_test import AbstractTestAbstractInversion
+
+_projection = esis.optics.ProjectionOperator(
+    matrix=scipy.sparse.random(
+        m=400,
+        n=100,
+        density=0.1,
+        format="csr",
+        random_state=1,
+    ),
+    shape_scene=dict(wavelength=4, field_x=5, field_y=5),
+    shape_image=dict(channel=4, detector_x=10, detector_y=10),
+)
+
+_projection_transposed = dataclasses.replace(
+    _projection,
+    shape_image=dict(detector_x=10, channel=4, detector_y=10),
+)
+
+
+class AbstractTestAbstractIterativeInversion(
+    AbstractTestAbstractInversion,
+):
+    def test_callback(self, a: esis.inversions.abc.AbstractIterativeInversion):
+        image = a.projection.forward(1)
+        a = dataclasses.replace(a, callback=_stop, workers=1)
+        result = a(image)
+        assert result.num_iteration == a.num_iteration
+        assert np.isnan(result.merit[dict(iteration=1)].ndarray)
+
+    def test_path(self, a: esis.inversions.abc.AbstractIterativeInversion, tmp_path):
+        image = a.projection.forward(na.ScalarArray(np.ones(2), axes=("time",)))
+        a = dataclasses.replace(a, path=tmp_path, tolerance=None, workers=1)
+        result = a(image)
+        iterate = result.iterate(a.num_iteration - 1)
+        assert np.all(iterate == result.scene)
+
+    def test_workers(self, a: esis.inversions.abc.AbstractIterativeInversion):
+        scene = na.random.uniform(
+            low=1,
+            high=2,
+            shape_random=dict(time=3) | a.projection.shape_scene,
+            seed=2,
+        )
+        image = a.projection.forward(scene)
+        a = dataclasses.replace(a, warm_start=False)
+        result = dataclasses.replace(a, workers=2)(image)
+        expected = dataclasses.replace(a, workers=1)(image)
+        assert np.allclose(result.scene, expected.scene)
+
+    def test_num_batch(self, a: esis.inversions.abc.AbstractIterativeInversion):
+        scene = na.random.uniform(
+            low=1,
+            high=2,
+            shape_random=dict(time=3) | a.projection.shape_scene,
+            seed=3,
+        )
+        image = a.projection.forward(scene)
+        a = dataclasses.replace(a, warm_start=False, tolerance=None)
+        result = dataclasses.replace(a, num_batch=2)(image)
+        expected = dataclasses.replace(a, num_batch=1)(image)
+        assert np.allclose(result.scene, expected.scene)
+
+    def test_warm_start(self, a: esis.inversions.abc.AbstractIterativeInversion):
+        scene = na.random.uniform(1, 2, shape_random=a.projection.shape_scene, seed=4)
+        scene = scene * na.linspace(1, 1.1, axis="time", num=4)
+        image = a.projection.forward(scene)
+        a = dataclasses.replace(a, tolerance=1e-3, num_iteration=100, workers=1)
+        warm = dataclasses.replace(a, warm_start=True)(image)
+        cold = dataclasses.replace(a, warm_start=False)(image)
+        num_warm = np.isfinite(warm.merit.ndarray).sum()
+        num_cold = np.isfinite(cold.merit.ndarray).sum()
+        assert num_warm <= num_cold
+        index = dict(iteration=0, time=slice(a.num_batch, None))
+        assert np.all(warm.merit[index] < cold.merit[index])
+
+
+def _stop(iteration: int, merit: np.ndarray) -> bool:
+    return True
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.inversions.RichardsonLucy(_projection, workers=1),
+        esis.inversions.RichardsonLucy(_projection, num_batch=2, warm_start=True),
+    ],
+)
+class TestRichardsonLucy(
+    AbstractTestAbstractIterativeInversion,
+):
+    pass
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.inversions.MART(_projection, workers=1),
+        esis.inversions.MART(_projection, relaxation=0.5, workers=1),
+        esis.inversions.MART(_projection, tolerance=1e-6, num_batch=2),
+        esis.inversions.MART(_projection_transposed, workers=1),
+    ],
+)
+class TestMART(
+    AbstractTestAbstractIterativeInversion,
+):
+    def test_blocks(self, a: esis.inversions.MART):
+        shape_image = a.projection.shape_image
+        rows = np.arange(a.projection.shape[0]).reshape(tuple(shape_image.values()))
+        rows = na.ScalarArray(rows, axes=tuple(shape_image))
+        for c, (rows_c, block, normalization) in enumerate(a._blocks):
+            expected = rows[{a.axis_channel: c}].ndarray.reshape(-1)
+            assert np.all(rows_c == expected)
+            assert block.shape == (expected.size, a.projection.shape[1])
@@ -0,0 +1,9 @@
+"""Abstract classes used in this module."""
+
+from ._inversions import AbstractInversion
+from ._iterative import AbstractIterativeInversion
+
+__all__ = [
+    "AbstractInversion",
+    "AbstractIterativeInversion",
+]
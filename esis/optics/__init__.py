@@ -2,6 +2,7 @@
 
 from . import abc
 from . import mixins
+from ._chemicals import TabulatedChemical
 from ._front_apertures import FrontAperture
 from ._central_obscurations import CentralObscuration
 from ._primary_mirrors import PrimaryMirror
@@ -12,10 +13,19 @@ from ._sensors import Sensor
 from ._cameras import Camera
 from ._requirements import Requirements
 from ._instruments import Instrument
+from ._interpolated_systems import InterpolatedSystem
+from ._throughputs import SurfaceEfficiency, Throughput
+from ._projections import ProjectionOperator
+from ._point_spread_functions import PointSpreadFunctionLibrary
+from ._monte_carlo import MonteCarloResult, MonteCarlo
+from ._distortion_fits import DistortionParameter, DistortionFitResult, DistortionFit
+from ._distortion_solutions import DistortionSolution
+from ._registrations import FieldStopRegistrationResult, FieldStopRegistration
 
 __all__ = [
     "abc",
     "mixins",
+    "TabulatedChemical",
     "FrontAperture",
     "CentralObscuration",
     "PrimaryMirror",
@@ -26,4 +36,17 @@ __all__ = [
     "Camera",
     "Requirements",
     "Instrument",
+    "InterpolatedSystem",
+    "SurfaceEfficiency",
+    "Throughput",
+    "ProjectionOperator",
+    "PointSpreadFunctionLibrary",
+    "MonteCarloResult",
+    "MonteCarlo",
+    "DistortionParameter",
+    "DistortionFitResult",
+    "DistortionFit",
+    "DistortionSolution",
+    "FieldStopRegistrationResult",
+    "FieldStopRegistration",
 ]
@@ -1,4 +1,5 @@
 import dataclasses
+import numpy as np
 import astropy.units as u
 import named_arrays as na
 import optika
@@ -9,6 +10,12 @@ __all__ = [
     "Camera",
 ]
 
+_serial_number = np.array(["1", "6", "7", "9"])
+"""The serial number reported by each camera, sorted lexically."""
+
+_channel = np.array([4, 1, 2, 3])
+"""The channel index, as used by :attr:`Camera.channel`, of each camera."""
+
 
 @dataclasses.dataclass(eq=False, repr=False)
 class Camera(
@@ -44,6 +51,53 @@ class Camera(
         if self.sensor is None:
             self.sensor = Sensor()
 
+    @staticmethod
+    def channel_from_serial_number(
+        serial_number: str | na.AbstractScalar,
+    ) -> na.ScalarArray:
+        """
+        Look up the channel index corresponding to each camera serial number.
+
+        The lookup is a binary search through a single precomputed table,
+        so new cameras only need a new entry in the table.
+
+        Parameters
+        ----------
+        serial_number
+            The serial number reported in the FITS header of each image.
+
+        Returns
+        -------
+        channel
+            The channel index of each camera,
+            using the same convention as :attr:`channel`,
+            or ``-1`` if the serial number is not recognized,
+            since ``0`` is a valid channel index.
+        """
+        serial_number = na.as_named_array(serial_number).astype(str)
+        sn = serial_number.ndarray
+        index = np.searchsorted(_serial_number, sn)
+        index = np.minimum(index, _serial_number.size - 1)
+        result = np.where(_serial_number[index] == sn, _channel[index], -1)
+        return serial_number.replace(ndarray=result)
+
+    @property
+    def serial_number(self) -> na.ScalarArray:
+        """
+        The serial number of the camera used for each channel.
+
+        This is the inverse of :meth:`channel_from_serial_number`,
+        and the serial number of any channel which does not have a known
+        camera is an empty string.
+        """
+        channel = na.as_named_array(self.channel)
+        ch = np.asarray(channel.ndarray)
+        result = np.full(ch.shape, "", dtype=_serial_number.dtype)
+        if np.issubdtype(ch.dtype, np.integer):
+            for sn, c in zip(_serial_number, _channel):
+                result[ch == c] = sn
+        return na.ScalarArray(result, axes=channel.axes)
+
     @property
     def surface(self) -> optika.sensors.AbstractImagingSensor:
         """Represent this object as an :mod:`optika` surface."""
@@ -1,4 +1,6 @@
 import pytest
+import numpy as np
+import named_arrays as na
 import optika
 from msfc_ccd._tests.test_cameras import AbstractTestAbstractCamera
 import esis
@@ -18,3 +20,44 @@ class TestCameras(
         a: esis.optics.abc.AbstractPrimaryMirror,
     ):
         assert isinstance(a.surface, optika.surfaces.AbstractSurface)
+
+
+@pytest.mark.parametrize(
+    argnames="serial_number,expected",
+    argvalues=[
+        ("6", 1),
+        ("7", 2),
+        ("9", 3),
+        ("1", 4),
+        ("2", -1),
+        (na.ScalarArray(np.array(["9", "6", "5"]), axes="t"), [3, 1, -1]),
+    ],
+)
+def test_channel_from_serial_number(
+    serial_number: str | na.AbstractScalarArray,
+    expected: int | list[int],
+):
+    result = esis.optics.Camera.channel_from_serial_number(serial_number)
+    assert isinstance(result, na.ScalarArray)
+    assert np.all(result.ndarray == np.array(expected))
+
+
+@pytest.mark.parametrize(
+    argnames="channel,expected",
+    argvalues=[
+        (1, "6"),
+        ("", ""),
+        (
+            na.ScalarArray(np.array([0, 1, 2, 3, 4, 5]), axes="channel"),
+            ["", "6", "7", "9", "1", ""],
+        ),
+    ],
+)
+def test_serial_number(
+    channel: int | str | na.AbstractScalarArray,
+    expected: str | list[str],
+):
+    camera = esis.optics.Camera(channel=channel)
+    result = camera.serial_number
+    assert isinstance(result, na.ScalarArray)
+    assert np.all(result.ndarray == np.array(expected))
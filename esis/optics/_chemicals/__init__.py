@@ -0,0 +1,5 @@
+from ._chemicals import TabulatedChemical
+
+__all__ = [
+    "TabulatedChemical",
+]
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import pathlib
+import dataclasses
+import functools
+import importlib.metadata
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import optika
+import esis
+
+__all__ = [
+    "TabulatedChemical",
+]
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class TabulatedChemical(
+    optika.chemicals.Chemical,
+):
+    """
+    A chemical with optical constants resampled onto a dense wavelength grid.
+
+    The grid is evenly spaced and the constants are only resampled once.
+
+    :meth:`optika.chemicals.Chemical.n` reads and parses the raw table of
+    optical constants every time it is called,
+    which dominates the cost of computing the efficiency of a multilayer
+    for a few wavelengths.
+    This class computes the complex index of refraction on :attr:`num`
+    wavelengths between :attr:`wavelength_min` and :attr:`wavelength_max`
+    once, stores the table in :obj:`esis.cache` as a memory-mapped array,
+    and interpolates the table in memory afterward.
+    The most recently used tables are also kept in memory by this process.
+
+    Wavelengths outside of the grid fall back to the raw table.
+
+    Examples
+    --------
+    Compare the index of refraction of aluminum computed from the raw table
+    and from the resampled table.
+
+    .. jupyter-execute::
+
+        import matplotlib.pyplot as plt
+        import astropy.units as u
+        import named_arrays as na
+        import optika
+        import esis
+
+        wavelength = na.linspace(500, 700, axis="wavelength", num=1001) * u.AA
+
+        n_raw = optika.chemicals.Chemical("Al").index_refraction(wavelength)
+        n_tabulated = esis.optics.TabulatedChemical("Al").index_refraction(wavelength)
+
+        fig, ax = plt.subplots(constrained_layout=True)
+        na.plt.plot(wavelength, n_raw, label="raw");
+        na.plt.plot(wavelength, n_tabulated, label="tabulated", linestyle="--");
+        ax.set_xlabel(f"wavelength ({wavelength.unit:latex_inline})");
+        ax.set_ylabel("index of refraction");
+        ax.legend();
+    """
+
+    wavelength_min: u.Quantity = 100 * u.AA
+    """The shortest wavelength of the table."""
+
+    wavelength_max: u.Quantity = 1000 * u.AA
+    """The longest wavelength of the table."""
+
+    num: int = 9001
+    """The number of wavelengths in the table."""
+
+    @property
+    def table_nk(self) -> np.ndarray:
+        """The complex index of refraction at each wavelength of the grid."""
+        key = (
+            self.formula,
+            self.is_amorphous,
+            self.table,
+            self.wavelength_min.to_value(u.AA),
+            self.wavelength_max.to_value(u.AA),
+            self.num,
+        )
+        return _table_nk(
+            *key,
+            version=importlib.metadata.version("optika"),
+        )
+
+    def n(
+        self,
+        wavelength: u.Quantity | na.AbstractScalar,
+    ) -> na.AbstractScalar:
+        """
+        Compute the complex index of refraction for a given wavelength.
+
+        Parameters
+        ----------
+        wavelength
+            The wavelength of light in vacuum.
+        """
+        if not isinstance(self.formula, str):
+            return super().n(wavelength)
+
+        wavelength_min = self.wavelength_min
+        wavelength_max = self.wavelength_max
+
+        if np.any(wavelength < wavelength_min) or np.any(wavelength > wavelength_max):
+            return super().n(wavelength)
+
+        axis = "_wavelength_table"
+
+        grid = na.linspace(
+            start=wavelength_min.to_value(u.AA),
+            stop=wavelength_max.to_value(u.AA),
+            axis=axis,
+            num=self.num,
+        )
+
+        return na.interp(
+            x=wavelength,
+            xp=grid << u.AA,
+            fp=na.ScalarArray(self.table_nk, axes=axis),
+        )
+
+
+@functools.lru_cache(maxsize=32)
+@esis.cache.memoize(paths=[pathlib.Path(__file__)])
+def _table_nk(
+    formula: str,
+    is_amorphous: bool,
+    table: None | str,
+    wavelength_min: float,
+    wavelength_max: float,
+    num: int,
+    version: str,
+) -> np.ndarray:
+    chemical = optika.chemicals.Chemical(
+        formula=formula,
+        is_amorphous=is_amorphous,
+        table=table,
+    )
+    wavelength = na.linspace(wavelength_min, wavelength_max, axis="wavelength", num=num)
+    result = chemical.n(wavelength << u.AA)
+    return na.as_named_array(result).ndarray
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import optika
+import esis
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.TabulatedChemical("Al"),
+        esis.optics.TabulatedChemical(
+            formula="SiC",
+            is_amorphous=True,
+            table="kortright",
+        ),
+    ],
+)
+class TestTabulatedChemical:
+
+    def test_table_nk(self, a: esis.optics.TabulatedChemical):
+        result = a.table_nk
+        assert result.shape == (a.num,)
+        assert np.iscomplexobj(result)
+        assert a.table_nk is result
+
+    @pytest.mark.parametrize(
+        argnames="wavelength",
+        argvalues=[
+            na.linspace(550, 650, axis="wavelength", num=11) * u.AA,
+            na.linspace(50, 150, axis="wavelength", num=11) * u.AA,
+        ],
+    )
+    def test_n(
+        self,
+        a: esis.optics.TabulatedChemical,
+        wavelength: na.AbstractScalar,
+    ):
+        result = a.n(wavelength)
+        expected = optika.chemicals.Chemical(
+            formula=a.formula,
+            is_amorphous=a.is_amorphous,
+            table=a.table,
+        ).n(wavelength)
+        assert np.allclose(result, expected, rtol=1e-3)
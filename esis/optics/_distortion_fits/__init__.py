@@ -0,0 +1,11 @@
+from ._distortion_fits import (
+    DistortionParameter,
+    DistortionFitResult,
+    DistortionFit,
+)
+
+__all__ = [
+    "DistortionParameter",
+    "DistortionFitResult",
+    "DistortionFit",
+]
@@ -0,0 +1,467 @@
+from __future__ import annotations
+from typing import Any
+import re
+import functools
+import dataclasses
+import numpy as np
+import scipy.ndimage
+import astropy.units as u
+import named_arrays as na
+import esis
+
+__all__ = [
+    "DistortionParameter",
+    "DistortionFitResult",
+    "DistortionFit",
+]
+
+
+def _parse(name: str) -> list[str | int]:
+    """
+    Split the name of a parameter into attribute names and item keys.
+
+    Parameters
+    ----------
+    name
+        A dotted attribute path,
+        where integer item keys are given in square brackets,
+        such as ``"grating.rulings.spacing.coefficients[0]"``.
+    """
+    return [
+        attr if attr else int(key)
+        for attr, key in re.findall(r"(\w+)|\[(-?\d+)\]", name)
+    ]
+
+
+def _replace(obj: Any, path: list[str | int], value: Any) -> Any:
+    """
+    Return a copy of an object with the attribute at the given path replaced.
+
+    Each dataclass along the path is copied using :func:`dataclasses.replace`,
+    so the original object is not modified,
+    and cached properties like :attr:`esis.optics.Instrument.system`
+    are recomputed for the copy.
+
+    Parameters
+    ----------
+    obj
+        The object to copy.
+    path
+        The path to the attribute, computed by :func:`_parse`.
+    value
+        The new value of the attribute.
+    """
+    if not path:
+        return value
+
+    key, *path = path
+
+    if isinstance(key, int):
+        result = type(obj)(obj)
+        result[key] = _replace(obj[key], path, value)
+        return result
+
+    return dataclasses.replace(
+        obj,
+        **{key: _replace(getattr(obj, key), path, value)},
+    )
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class DistortionParameter:
+    """A parameter of an instrument which is varied to fit the distortion."""
+
+    name: str
+    """
+    The path to the parameter relative to the instrument,
+    such as ``"grating.yaw"`` or ``"grating.rulings.spacing.coefficients[0]"``.
+    """
+
+    step: u.Quantity
+    """
+    The step used to compute the finite-difference derivative
+    with respect to this parameter.
+    """
+
+    def get(
+        self,
+        instrument: esis.optics.abc.AbstractInstrument,
+    ) -> u.Quantity | na.AbstractScalar:
+        """
+        Get the value of this parameter.
+
+        Parameters
+        ----------
+        instrument
+            The instrument to get the value from.
+        """
+        result = instrument
+        for key in _parse(self.name):
+            if isinstance(key, int):
+                result = result[key]
+            else:
+                result = getattr(result, key)
+        return result
+
+    def replace(
+        self,
+        instrument: esis.optics.abc.AbstractInstrument,
+        value: u.Quantity | na.AbstractScalar,
+    ) -> esis.optics.abc.AbstractInstrument:
+        """
+        Return a copy of an instrument with a new value of this parameter.
+
+        Parameters
+        ----------
+        instrument
+            The instrument to copy.
+        value
+            The new value of this parameter.
+        """
+        return _replace(instrument, _parse(self.name), value)
+
+
+def _parameters_default() -> tuple[DistortionParameter, ...]:
+    # The image of the field stop only depends on the distance between the
+    # focus of the primary mirror and the field stop, so a change in the focal
+    # length of the primary is indistinguishable from a piston of the same
+    # size. Only the piston is fit, and the focal length is held at its
+    # design value, so the two are never free at the same time.
+    return (
+        DistortionParameter("grating.yaw", 0.1 * u.arcmin),
+        DistortionParameter("grating.pitch", 0.1 * u.arcmin),
+        DistortionParameter("grating.roll", 0.01 * u.deg),
+        DistortionParameter("field_stop.roll", 0.01 * u.deg),
+        DistortionParameter("grating.rulings.spacing.coefficients[0]", 1e-4 * u.um),
+        DistortionParameter("primary_mirror.translation.z", 0.01 * u.mm),
+        DistortionParameter("pitch", 1 * u.arcsec),
+        DistortionParameter("yaw", 1 * u.arcsec),
+        DistortionParameter("roll", 0.01 * u.deg),
+    )
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class DistortionFitResult:
+    """The instrument found by :meth:`DistortionFit.fit`."""
+
+    instrument: esis.optics.abc.AbstractInstrument
+    """The instrument with the best-fit parameters."""
+
+    parameters: tuple[DistortionParameter, ...]
+    """The parameters which were varied."""
+
+    merit: na.ScalarArray
+    """The value of :meth:`DistortionFit.merit` for each channel at each step."""
+
+    @property
+    def values(self) -> dict[str, u.Quantity | na.AbstractScalar]:
+        """The best-fit value of each parameter."""
+        return {p.name: p.get(self.instrument) for p in self.parameters}
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class DistortionFit:
+    """
+    Fit the parameters of an instrument to an observed image of the field stop.
+
+    The parameters are varied until the ray-traced image of the field stop
+    lands on the observed image of the field stop.
+    The residual of each ray is one minus the normalized brightness of the
+    observed image at the position where the ray lands on the detector,
+    so the merit function is smallest when the footprint of the field stop
+    overlaps the brightest region of each channel.
+
+    Each step of the fit is a Levenberg-Marquardt update computed
+    independently for each channel.
+    A step is only accepted if it decreases the merit function of that
+    channel, in which case the damping factor is decreased by a factor of ten,
+    otherwise the step is rejected and the damping factor is increased
+    by a factor of ten.
+    The Jacobian is computed using finite differences,
+    but instead of tracing the instrument once for each parameter,
+    every perturbation is stacked along :attr:`axis_perturbation`
+    and the instrument is traced once,
+    so each step costs a single vectorized ray trace.
+    Since the channels do not interact,
+    each parameter is perturbed in every channel at once.
+
+    Examples
+    --------
+    Fit the ESIS-I design to a Level-1 frame.
+
+    .. jupyter-execute::
+
+        import esis
+
+        data = esis.flights.f1.data.level_1()[dict(time=15)]
+
+        fit = esis.optics.DistortionFit(
+            instrument=esis.flights.f1.optics.design(num_distribution=0),
+            data=data,
+            num_iteration=2,
+        )
+
+        result = fit.fit()
+
+        result.merit
+    """
+
+    instrument: esis.optics.abc.AbstractInstrument
+    """
+    The initial instrument.
+    This should not have any uncertain parameters,
+    since every sample would be traced for each perturbation.
+    """
+
+    data: esis.data.abc.AbstractChannelData
+    """A single frame of observations to fit."""
+
+    parameters: tuple[DistortionParameter, ...] = dataclasses.field(
+        default_factory=_parameters_default,
+    )
+    """The parameters to vary, each of which is fit separately for each channel."""
+
+    num_iteration: int = 10
+    """The maximum number of steps to take."""
+
+    damping: float = 1e-3
+    """The initial Levenberg-Marquardt damping factor."""
+
+    tolerance: float = 1e-6
+    """
+    The relative decrease in the merit function below which a channel
+    has converged.
+
+    The fit stops once an accepted step in every channel decreases the merit
+    by less than this fraction.
+    """
+
+    sigma: float = 2
+    """
+    The standard deviation in pixels of the Gaussian kernel used to smooth
+    the observed image,
+    which widens the basin of convergence.
+    """
+
+    axis_perturbation: str = "perturbation"
+    """The logical axis along which the perturbed instruments are stacked."""
+
+    @functools.cached_property
+    def _image(self) -> np.ndarray:
+        """The normalized and smoothed image of each channel."""
+        data = self.data
+        axis_channel = data.axis_channel
+        axis_x = data.axis_x
+        axis_y = data.axis_y
+
+        shape = data.outputs.shape
+        shape = {ax: shape[ax] for ax in (axis_channel, axis_x, axis_y)}
+
+        image = na.broadcast_to(na.value(data.outputs), shape).ndarray
+        image = image.astype(float)
+        image = image / np.percentile(image, 99, axis=(1, 2), keepdims=True)
+        image = scipy.ndimage.gaussian_filter(image, sigma=(0, self.sigma, self.sigma))
+
+        return image
+
+    def _sample(
+        self,
+        pixel: na.AbstractCartesian2dVectorArray,
+    ) -> na.ScalarArray:
+        """
+        Interpolate the smoothed image of each channel at the given positions.
+
+        Parameters
+        ----------
+        pixel
+            The fractional pixel coordinates on the detector of each channel.
+        """
+        image = self._image
+        axis_channel = self.data.axis_channel
+
+        index = self.data.indices(pixel)
+
+        shape = na.shape_broadcasted(index.x, index.y)
+        shape = {axis_channel: shape[axis_channel]} | shape
+
+        ix = na.broadcast_to(index.x, shape).ndarray
+        iy = na.broadcast_to(index.y, shape).ndarray
+
+        result = np.empty(ix.shape)
+        for c in range(shape[axis_channel]):
+            result[c] = scipy.ndimage.map_coordinates(
+                input=image[c],
+                coordinates=[ix[c], iy[c]],
+                order=1,
+                cval=0,
+            )
+
+        return na.ScalarArray(result, axes=tuple(shape))
+
+    def residual(
+        self,
+        instrument: esis.optics.abc.AbstractInstrument,
+    ) -> na.AbstractScalar:
+        """
+        Compute the residual of each ray traced through an instrument.
+
+        Parameters
+        ----------
+        instrument
+            The instrument to trace.
+        """
+        system = instrument.system
+        rays = system.rayfunction_default.outputs
+        pixel = system.sensor.pixels(rays.position.xy)
+        result = 1 - self._sample(pixel)
+        return np.where(rays.unvignetted, result, 0)
+
+    def merit(
+        self,
+        instrument: esis.optics.abc.AbstractInstrument,
+    ) -> na.AbstractScalar:
+        """
+        Compute the sum of the squared residuals for each channel.
+
+        Parameters
+        ----------
+        instrument
+            The instrument to evaluate.
+        """
+        residual = self.residual(instrument)
+        axis = tuple(ax for ax in residual.shape if ax != instrument.axis_channel)
+        return np.square(residual).sum(axis=axis)
+
+    def perturbed(
+        self,
+        instrument: esis.optics.abc.AbstractInstrument,
+    ) -> esis.optics.abc.AbstractInstrument:
+        """
+        Stack an instrument along with a perturbed copy for each parameter.
+
+        The copies are stacked along :attr:`axis_perturbation`,
+        and each parameter is perturbed by its step.
+        Index ``0`` along the new axis is the unperturbed instrument,
+        and index ``p + 1`` is the instrument with parameter ``p`` perturbed.
+
+        Parameters
+        ----------
+        instrument
+            The instrument to perturb.
+        """
+        parameters = self.parameters
+        num = len(parameters) + 1
+        for p, parameter in enumerate(parameters):
+            delta = na.ScalarArray(np.arange(num) == p + 1, axes=self.axis_perturbation)
+            value = parameter.get(instrument) + delta * parameter.step
+            instrument = parameter.replace(instrument, value)
+        return instrument
+
+    def jacobian(
+        self,
+        instrument: esis.optics.abc.AbstractInstrument,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the residuals and their finite-difference Jacobian.
+
+        Every perturbed instrument is computed using a single ray trace.
+
+        Parameters
+        ----------
+        instrument
+            The instrument at which to evaluate the Jacobian.
+
+        Returns
+        -------
+        residual
+            The residual of each ray for each channel.
+        jacobian
+            The change in the residual of each ray for each channel
+            after a step in each parameter.
+        """
+        axis = self.axis_perturbation
+        axis_channel = instrument.axis_channel
+
+        residual = self.residual(self.perturbed(instrument))
+
+        shape = residual.shape
+        shape = {axis: shape[axis], axis_channel: shape[axis_channel]} | shape
+
+        residual = na.broadcast_to(residual, shape).ndarray
+        residual = residual.reshape(shape[axis], shape[axis_channel], -1)
+
+        return residual[0], residual[1:] - residual[0]
+
+    def fit(self) -> DistortionFitResult:
+        """
+        Take Levenberg-Marquardt steps until the fit converges.
+
+        At most :attr:`num_iteration` steps are taken,
+        and the fit stops early once every channel has converged
+        according to :attr:`tolerance`.
+        The merit of the initial instrument and of the instrument after
+        each step are stored in :attr:`DistortionFitResult.merit`.
+        """
+        instrument = self.instrument
+        parameters = self.parameters
+        axis_channel = instrument.axis_channel
+
+        identity = np.identity(len(parameters))
+
+        residual, jacobian = self.jacobian(instrument)
+        chi2 = np.square(residual).sum(axis=~0)
+
+        damping = np.full_like(chi2, self.damping)
+        converged = np.zeros(chi2.shape, dtype=bool)
+
+        merit = [chi2]
+
+        for i in range(self.num_iteration):
+
+            hessian = np.einsum("pcn,qcn->cpq", jacobian, jacobian)
+            gradient = np.einsum("pcn,cn->cp", jacobian, residual)
+
+            diagonal = np.einsum("cpp->cp", hessian)
+            diagonal = damping[..., np.newaxis] * diagonal
+            hessian = hessian + diagonal[..., np.newaxis] * identity
+
+            delta = -np.einsum("cpq,cq->cp", np.linalg.pinv(hessian), gradient)
+
+            trial = instrument
+            for p, parameter in enumerate(parameters):
+                step = na.ScalarArray(delta[:, p], axes=axis_channel) * parameter.step
+                value = parameter.get(trial) + step
+                trial = parameter.replace(trial, value)
+
+            residual_trial, jacobian_trial = self.jacobian(trial)
+            chi2_trial = np.square(residual_trial).sum(axis=~0)
+
+            accept = chi2_trial < chi2
+            decrease = np.where(accept, chi2 - chi2_trial, np.inf)
+            converged = converged | (decrease <= self.tolerance * chi2)
+
+            where = na.ScalarArray(accept, axes=axis_channel)
+            for parameter in parameters:
+                value = np.where(
+                    where,
+                    parameter.get(trial),
+                    parameter.get(instrument),
+                )
+                instrument = parameter.replace(instrument, value)
+
+            residual = np.where(accept[..., np.newaxis], residual_trial, residual)
+            jacobian = np.where(accept[..., np.newaxis], jacobian_trial, jacobian)
+            chi2 = np.where(accept, chi2_trial, chi2)
+            damping = np.where(accept, damping / 10, damping * 10)
+
+            merit.append(chi2)
+
+            if np.all(converged):
+                break
+
+        return DistortionFitResult(
+            instrument=instrument,
+            parameters=parameters,
+            merit=na.ScalarArray(np.stack(merit), axes=("iteration", axis_channel)),
+        )
+
@@ -0,0 +1,133 @@
+import pytest
+import numpy as np
+import scipy.spatial
+import matplotlib.path
+import astropy.units as u
+import astropy.time
+import named_arrays as na
+import msfc_ccd
+import esis
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.DistortionParameter("grating.yaw", 0.1 * u.arcmin),
+        esis.optics.DistortionParameter(
+            name="grating.rulings.spacing.coefficients[0]",
+            step=1e-4 * u.um,
+        ),
+    ],
+)
+class TestDistortionParameter:
+
+    def test_get(self, a: esis.optics.DistortionParameter):
+        instrument = esis.flights.f1.optics.design(num_distribution=0)
+        result = a.get(instrument)
+        assert isinstance(na.as_named_array(result), na.AbstractScalar)
+
+    def test_replace(self, a: esis.optics.DistortionParameter):
+        instrument = esis.flights.f1.optics.design(num_distribution=0)
+        value = a.get(instrument)
+        result = a.replace(instrument, value + a.step)
+        assert np.all(a.get(result) == value + a.step)
+        assert np.all(a.get(instrument) == value)
+
+
+_data = esis.flights.f1.data.level_1()[dict(time=15)]
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.DistortionFit(
+            instrument=esis.flights.f1.optics.design(num_distribution=0),
+            data=_data,
+            parameters=(
+                esis.optics.DistortionParameter("grating.yaw", 0.1 * u.arcmin),
+                esis.optics.DistortionParameter("grating.pitch", 0.1 * u.arcmin),
+            ),
+            num_iteration=2,
+        ),
+    ],
+)
+class TestDistortionFit:
+
+    def test_residual(self, a: esis.optics.DistortionFit):
+        result = a.residual(a.instrument)
+        assert np.all(result <= 1)
+
+    def test_jacobian(self, a: esis.optics.DistortionFit):
+        residual, jacobian = a.jacobian(a.instrument)
+        assert jacobian.shape[0] == len(a.parameters)
+        assert jacobian.shape[1:] == residual.shape
+
+    def test_fit(self, a: esis.optics.DistortionFit):
+        result = a.fit()
+        assert isinstance(result, esis.optics.DistortionFitResult)
+        merit = result.merit.ndarray
+        assert 2 <= merit.shape[0] <= a.num_iteration + 1
+        assert np.all(np.diff(merit, axis=0) <= 0)
+        assert set(result.values) == {p.name for p in a.parameters}
+
+
+def _field_stop_image(
+    instrument: esis.optics.abc.AbstractInstrument,
+) -> esis.data.Level_1:
+    system = instrument.system
+    rays = system.rayfunction_default.outputs
+    pixel = system.sensor.pixels(rays.position.xy)
+    where = rays.unvignetted
+
+    shape = na.shape_broadcasted(pixel.x, where)
+    num_channel = shape[instrument.axis_channel]
+    px = na.broadcast_to(na.value(pixel.x), shape).ndarray.reshape(num_channel, -1)
+    py = na.broadcast_to(na.value(pixel.y), shape).ndarray.reshape(num_channel, -1)
+    where = na.broadcast_to(where, shape).ndarray.reshape(num_channel, -1)
+
+    x = np.arange(2, 2048, 4)
+    y = np.arange(2, 1024, 4)
+    grid_x, grid_y = np.meshgrid(x, y, indexing="ij")
+    points = np.stack([grid_x.ravel(), grid_y.ravel()], axis=~0)
+
+    image = np.empty((num_channel, x.size, y.size))
+    for c in range(num_channel):
+        vertices = np.stack([px[c][where[c]], py[c][where[c]]], axis=~0)
+        hull = scipy.spatial.ConvexHull(vertices)
+        path = matplotlib.path.Path(vertices[hull.vertices])
+        image[c] = path.contains_points(points).reshape(grid_x.shape)
+
+    return esis.data.Level_1(
+        inputs=msfc_ccd.ImageHeader(
+            pixel=na.Cartesian2dVectorArray(
+                x=na.ScalarArray(x * u.pix, axes="detector_x"),
+                y=na.ScalarArray(y * u.pix, axes="detector_y"),
+            ),
+            time_start=astropy.time.Time("2019-09-30T18:00:00"),
+            timedelta=10 * u.s,
+            timedelta_requested=10 * u.s,
+        ),
+        outputs=na.ScalarArray(
+            ndarray=image,
+            axes=(instrument.axis_channel, "detector_x", "detector_y"),
+        ),
+    )
+
+
+def test_fit_primary_translation():
+    instrument = esis.flights.f1.optics.design(num_distribution=0)
+    parameter = esis.optics.DistortionParameter(
+        name="primary_mirror.translation.z",
+        step=0.01 * u.mm,
+    )
+    fit = esis.optics.DistortionFit(
+        instrument=parameter.replace(instrument, 0.3 * u.mm),
+        data=_field_stop_image(instrument),
+        parameters=(parameter,),
+        num_iteration=10,
+    )
+    result = fit.fit()
+    merit = result.merit.ndarray
+    assert np.all(np.diff(merit, axis=0) <= 0)
+    assert np.all(merit[~0] <= fit.merit(instrument).ndarray)
+    assert np.all(np.abs(parameter.get(result.instrument)) < 0.1 * u.mm)
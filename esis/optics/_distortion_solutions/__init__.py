@@ -0,0 +1,5 @@
+from ._distortion_solutions import DistortionSolution
+
+__all__ = [
+    "DistortionSolution",
+]
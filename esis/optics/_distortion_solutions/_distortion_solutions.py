@@ -0,0 +1,232 @@
+from __future__ import annotations
+from typing import Any, ClassVar
+from typing_extensions import Self
+import os
+import json
+import pathlib
+import dataclasses
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import esis
+
+__all__ = [
+    "DistortionSolution",
+]
+
+_solutions: dict[tuple[str, int, int, int, int], DistortionSolution] = dict()
+"""
+Each solution which has been read by this process,
+keyed on the path, size, and modification time of its files.
+"""
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class DistortionSolution:
+    """
+    A set of fitted instrument parameters.
+
+    A solution can be stored on disk and applied to any instrument.
+
+    Each solution is stored as a pair of files which share the same stem:
+    a ``.npz`` file containing the value of each parameter,
+    and a ``.json`` file containing the units and logical axes of each
+    parameter along with any other metadata describing the fit.
+
+    Examples
+    --------
+    Save the result of a distortion fit and apply it to another instrument.
+
+    .. code-block:: python
+
+        import esis
+
+        fit = esis.optics.DistortionFit(
+            instrument=esis.flights.f1.optics.design(num_distribution=0),
+            data=esis.flights.f1.data.level_1()[dict(time=15)],
+        )
+
+        solution = esis.optics.DistortionSolution.from_result(
+            result=fit.fit(),
+            name="example",
+        )
+        solution.to_file("example")
+
+        instrument = esis.optics.DistortionSolution.from_file("example").apply(
+            instrument=esis.flights.f1.optics.design(num_distribution=11),
+        )
+    """
+
+    version: ClassVar[int] = 1
+    """The version of the file format written by :meth:`to_file`."""
+
+    values: dict[str, u.Quantity | na.AbstractScalar]
+    """
+    The value of each parameter,
+    keyed on the path to the parameter relative to the instrument,
+    see :attr:`esis.optics.DistortionParameter.name`.
+    """
+
+    axis_channel: str = "channel"
+    """The logical axis of :attr:`values` corresponding to changing channel."""
+
+    metadata: dict[str, Any] = dataclasses.field(default_factory=dict)
+    """
+    Any JSON-serializable information describing the fit,
+    such as the name of the run or the frame it was fit against.
+    """
+
+    @classmethod
+    def from_result(
+        cls,
+        result: esis.optics.DistortionFitResult,
+        **metadata: Any,
+    ) -> Self:
+        """
+        Create a new solution from the result of a distortion fit.
+
+        Parameters
+        ----------
+        result
+            The result of :meth:`esis.optics.DistortionFit.fit`.
+        metadata
+            Any other information to store with the solution.
+        """
+        return cls(
+            values=result.values,
+            axis_channel=result.instrument.axis_channel,
+            metadata=metadata,
+        )
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | pathlib.Path,
+    ) -> Self:
+        """
+        Read a solution written by :meth:`to_file`.
+
+        The result is memoized on the size and modification time of the files,
+        so switching between solutions does not reread them unless they change.
+
+        Parameters
+        ----------
+        path
+            The path to the solution, with or without a suffix.
+
+        Raises
+        ------
+        ValueError
+            If the solution was written by a newer version of this class.
+        """
+        path = pathlib.Path(path)
+        path_json = path.with_suffix(".json")
+        path_npz = path.with_suffix(".npz")
+
+        stat_json = os.stat(path_json)
+        stat_npz = os.stat(path_npz)
+
+        key = (
+            str(path_json.resolve()),
+            stat_json.st_size,
+            stat_json.st_mtime_ns,
+            stat_npz.st_size,
+            stat_npz.st_mtime_ns,
+        )
+
+        if key in _solutions:
+            return _solutions[key]
+
+        header = json.loads(path_json.read_text())
+
+        if header["version"] > cls.version:
+            raise ValueError(
+                f"{path_json} has version {header['version']}, "
+                f"but only versions up to {cls.version} are supported."
+            )
+
+        values = dict()
+        with np.load(path_npz, allow_pickle=False) as arrays:
+            for name, parameter in header["parameters"].items():
+                value = arrays[name]
+                axes = parameter["axes"]
+                if axes is not None:
+                    value = na.ScalarArray(value, axes=tuple(axes))
+                values[name] = value << u.Unit(parameter["unit"])
+
+        result = cls(
+            values=values,
+            axis_channel=header["axis_channel"],
+            metadata=header["metadata"],
+        )
+
+        _solutions[key] = result
+
+        return result
+
+    def to_file(
+        self,
+        path: str | pathlib.Path,
+    ) -> None:
+        """
+        Write this solution to disk.
+
+        Parameters
+        ----------
+        path
+            The path to the solution, with or without a suffix.
+        """
+        path = pathlib.Path(path)
+
+        arrays = dict()
+        parameters = dict()
+        for name, value in self.values.items():
+            value = na.nominal(value)
+            unit = na.unit(value, unit_dimensionless=u.dimensionless_unscaled)
+            value = na.value(value)
+            if isinstance(value, na.AbstractArray):
+                axes = list(value.axes)
+                value = value.ndarray
+            else:
+                axes = None
+            arrays[name] = np.asarray(value)
+            parameters[name] = dict(unit=unit.to_string(), axes=axes)
+
+        header = dict(
+            version=self.version,
+            axis_channel=self.axis_channel,
+            parameters=parameters,
+            metadata=self.metadata,
+        )
+
+        np.savez(path.with_suffix(".npz"), **arrays)
+        path.with_suffix(".json").write_text(json.dumps(header, indent=4))
+
+    def apply(
+        self,
+        instrument: esis.optics.abc.AbstractInstrument,
+    ) -> esis.optics.abc.AbstractInstrument:
+        """
+        Return a copy of an instrument with the parameters of this solution.
+
+        The channel axis of :attr:`values` is renamed to the channel axis
+        of the instrument, and the instrument is not modified.
+
+        Parameters
+        ----------
+        instrument
+            The instrument to modify.
+        """
+        axis_channel = instrument.axis_channel
+        for name, value in self.values.items():
+            if isinstance(value, na.ScalarArray):
+                axes = tuple(
+                    axis_channel if ax == self.axis_channel else ax
+                    for ax in value.axes
+                )
+                value = na.ScalarArray(value.ndarray.copy(), axes=axes)
+            else:
+                value = value.copy()
+            parameter = esis.optics.DistortionParameter(name, step=0)
+            instrument = parameter.replace(instrument, value)
+        return instrument
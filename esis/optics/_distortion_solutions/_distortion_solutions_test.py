@@ -0,0 +1,64 @@
+import json
+import pathlib
+import pytest
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import esis
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.DistortionSolution(
+            values={
+                "grating.yaw": na.ScalarArray(
+                    ndarray=np.array([-269, -268, -268, -267]) * u.arcmin,
+                    axes="channel",
+                ),
+                "grating.rulings.spacing.coefficients[0]": 0.3855 * u.um,
+            },
+            metadata=dict(name="test"),
+        ),
+    ],
+)
+class TestDistortionSolution:
+
+    def test_to_file(
+        self,
+        a: esis.optics.DistortionSolution,
+        tmp_path: pathlib.Path,
+    ):
+        path = tmp_path / "solution"
+        a.to_file(path)
+        b = esis.optics.DistortionSolution.from_file(path)
+        assert b.metadata == a.metadata
+        assert b.axis_channel == a.axis_channel
+        for name in a.values:
+            assert np.all(b.values[name] == a.values[name])
+        assert esis.optics.DistortionSolution.from_file(path) is b
+
+    def test_apply(self, a: esis.optics.DistortionSolution):
+        instrument = esis.flights.f1.optics.design(
+            axis_channel="c",
+            num_distribution=0,
+        )
+        yaw = instrument.grating.yaw
+        result = a.apply(instrument)
+        assert isinstance(result, esis.optics.abc.AbstractInstrument)
+        assert "c" in result.grating.yaw.shape
+        assert np.all(instrument.grating.yaw == yaw)
+
+    def test_from_file_version(
+        self,
+        a: esis.optics.DistortionSolution,
+        tmp_path: pathlib.Path,
+    ):
+        path = tmp_path / "solution"
+        a.to_file(path)
+        path_json = path.with_suffix(".json")
+        header = json.loads(path_json.read_text())
+        header["version"] = a.version + 1
+        path_json.write_text(json.dumps(header))
+        with pytest.raises(ValueError, match="version"):
+            esis.optics.DistortionSolution.from_file(path)
@@ -1,8 +1,7 @@
 from __future__ import annotations
-from typing import Any
+from typing import Any, Callable
 import abc
 import dataclasses
-import functools
 import numpy as np
 import scipy.spatial
 import matplotlib.axes
@@ -18,6 +17,39 @@ __all__ = [
 ]
 
 
+def _fingerprint(a: Any) -> Any:
+    """
+    Summarize the current value of an object as a comparable tuple.
+
+    This recurses through the fields of dataclasses and the elements of
+    lists, tuples, and dictionaries,
+    and copies the contents of every array,
+    so modifying any attribute of an object, even in place,
+    changes its fingerprint.
+    This is several times faster than hashing the object using
+    :func:`joblib.hash`.
+    Any other objects are only compared by identity.
+
+    Parameters
+    ----------
+    a
+        The object to summarize.
+    """
+    if a is None or isinstance(a, (str, int, float, complex, u.UnitBase)):
+        return a
+    if isinstance(a, np.ndarray):
+        unit = getattr(a, "unit", None)
+        return a.shape, a.dtype.str, unit, np.asarray(a).tobytes()
+    if type(a) in (list, tuple):
+        return type(a), tuple(_fingerprint(v) for v in a)
+    if isinstance(a, dict):
+        return dict, tuple((k, _fingerprint(v)) for k, v in a.items())
+    if dataclasses.is_dataclass(a) and not isinstance(a, type):
+        fields = dataclasses.fields(a)
+        return type(a), tuple(_fingerprint(getattr(a, f.name)) for f in fields)
+    return type(a), id(a)
+
+
 @dataclasses.dataclass(eq=False, repr=False)
 class AbstractInstrument(
     na.Indexable,
@@ -102,31 +134,103 @@ class AbstractInstrument(
     def kwargs_plot(self):
         """Extra keyword arguments used to plot the optical system."""
 
+    def _cached(
+        self,
+        name: str,
+        key: Any,
+        func: Callable[[], Any],
+    ) -> Any:
+        """
+        Compute a value once for each state of this instrument.
+
+        The value is stored on this instrument along with `key`,
+        and is recomputed if the key changes,
+        so modifying an optical element in place invalidates the value.
+
+        Parameters
+        ----------
+        name
+            The name of the value.
+        key
+            The fingerprint of the attributes the value depends on,
+            computed using :func:`_fingerprint`.
+        func
+            A function which computes the value.
+        """
+        cache = self.__dict__.setdefault("_cache", dict())
+        if name in cache:
+            key_cached, result = cache[name]
+            if key_cached == key:
+                return result
+        result = func()
+        cache[name] = key, result
+        return result
+
     @property
-    def angle_grating_input(self) -> na.AbstractScalar:
+    def _geometry(self) -> dict[str, na.AbstractScalar]:
         """
-        The angle between the grating normal and the direction of the incident light.
+        The incidence and diffraction angles on the grating.
 
-        This is the incidence angle :math:`theta_i` in the
-        `diffraction grating equation <https://en.wikipedia.org/wiki/Diffraction_grating>`_.
+        The resulting wavelength bounds are computed in the same pass.
+        The result is cached and only recomputed if the field stop,
+        the grating, or the camera changes.
         """
-        fs = self.field_stop.surface
+        return self._cached(
+            name="_geometry",
+            key=_fingerprint((self.field_stop, self.grating, self.camera)),
+            func=self._compute_geometry,
+        )
+
+    def _compute_geometry(self) -> dict[str, na.AbstractScalar]:
         grating = self.grating.surface
         position = na.Cartesian3dVectorArray() * u.mm
         normal_surface = grating.sag.normal(position)
-        normal_rulings = grating.rulings.spacing_(position, normal_surface).normalized
-        transformation = grating.transformation.inverse @ fs.transformation
-        wire = np.moveaxis(
-            a=fs.aperture.wire(),
-            source="wire",
-            destination="wire_grating_input",
-        )
-        wire = transformation(wire)
-        return np.arctan2(
-            wire @ normal_rulings,
-            wire @ normal_surface,
+        spacing = grating.rulings.spacing_(position, normal_surface)
+        normal_rulings = spacing.normalized
+
+        def angle(surface: optika.surfaces.AbstractSurface, axis: str):
+            transformation = grating.transformation.inverse @ surface.transformation
+            wire = np.moveaxis(
+                a=surface.aperture.wire(),
+                source="wire",
+                destination=axis,
+            )
+            wire = transformation(wire)
+            return np.arctan2(
+                wire @ normal_rulings,
+                wire @ normal_surface,
+            )
+
+        axis_input = "wire_grating_input"
+        axis_output = "wire_grating_output"
+
+        a = angle(self.field_stop.surface, axis_input)
+        b = angle(self.camera.surface, axis_output)
+
+        m = grating.rulings.diffraction_order
+        d = spacing.length
+        wavelength = np.abs((np.sin(a) + np.sin(b)) * d / m).to(u.AA)
+
+        result = dict(
+            angle_grating_input=a,
+            angle_grating_output=b,
+            wavelength_test_grid=wavelength,
+            wavelength_min=wavelength.min(axis=(axis_input, axis_output)),
+            wavelength_max=wavelength.max(axis=(axis_input, axis_output)),
         )
 
+        return result
+
+    @property
+    def angle_grating_input(self) -> na.AbstractScalar:
+        """
+        The angle between the grating normal and the direction of the incident light.
+
+        This is the incidence angle :math:`theta_i` in the
+        `diffraction grating equation <https://en.wikipedia.org/wiki/Diffraction_grating>`_.
+        """
+        return self._geometry["angle_grating_input"]
+
     @property
     def angle_grating_output(self) -> na.AbstractScalar:
         """
@@ -135,48 +239,21 @@ class AbstractInstrument(
         This is an analogue to the diffracted angle in the
         `diffraction grating equation <https://en.wikipedia.org/wiki/Diffraction_grating>`_.
         """
-        detector = self.camera.surface
-        grating = self.grating.surface
-        position = na.Cartesian3dVectorArray() * u.mm
-        normal_surface = grating.sag.normal(position)
-        normal_rulings = grating.rulings.spacing_(position, normal_surface).normalized
-        transformation = grating.transformation.inverse @ detector.transformation
-        wire = np.moveaxis(
-            a=detector.aperture.wire(),
-            source="wire",
-            destination="wire_grating_output",
-        )
-        wire = transformation(wire)
-        return np.arctan2(
-            wire @ normal_rulings,
-            wire @ normal_surface,
-        )
+        return self._geometry["angle_grating_output"]
 
     @property
     def _wavelength_test_grid(self) -> na.AbstractScalar:
-        position = na.Cartesian3dVectorArray() * u.mm
-        grating = self.grating.surface
-        normal = grating.sag.normal(position)
-        m = grating.rulings.diffraction_order
-        d = grating.rulings.spacing_(position, normal).length
-        a = self.angle_grating_input
-        b = self.angle_grating_output
-        result = np.abs((np.sin(a) + np.sin(b)) * d / m)
-        return result.to(u.AA)
+        return self._geometry["wavelength_test_grid"]
 
     @property
     def wavelength_min(self) -> u.Quantity | na.AbstractScalar:
         """The minimum wavelength permitted through the system."""
-        return self._wavelength_test_grid.min(
-            axis=("wire_grating_input", "wire_grating_output"),
-        )
+        return self._geometry["wavelength_min"]
 
     @property
     def wavelength_max(self) -> u.Quantity | na.AbstractScalar:
         """The maximum wavelength permitted through the system."""
-        return self._wavelength_test_grid.max(
-            axis=("wire_grating_input", "wire_grating_output"),
-        )
+        return self._geometry["wavelength_max"]
 
     @property
     def wavelength_physical(self) -> na.ScalarArray:
@@ -189,13 +266,16 @@ class AbstractInstrument(
             wavelength = wavelength_range * (wavelength + 1) / 2 + wavelength_min
         return wavelength
 
-    @functools.cached_property
+    @property
     def system(self) -> optika.systems.SequentialSystem:
         """
         Convert this model into an instance of :class:`optika.systems.SequentialSystem`.
 
-        This is a cached property that is only computed once.
+        The result is cached and only recomputed if this instrument changes.
         """
+        return self._cached("system", _fingerprint(self), self._compute_system)
+
+    def _compute_system(self) -> optika.systems.SequentialSystem:
         surfaces = []
         surfaces += [self.front_aperture.surface]
         surfaces += [self.central_obscuration.surface]
@@ -218,6 +298,20 @@ class AbstractInstrument(
 
         return result
 
+    @property
+    def throughput(self) -> esis.optics.Throughput:
+        """
+        Cached lookup tables of the efficiency of each surface.
+
+        These tables can compute effective-area curves without tracing rays.
+        The tables are cached and only recomputed if this instrument changes.
+        """
+        return self._cached(
+            name="throughput",
+            key=_fingerprint(self),
+            func=lambda: esis.optics.Throughput(self),
+        )
+
     def schematic_primary(
         self,
         ax: None | matplotlib.axes.Axes = None,
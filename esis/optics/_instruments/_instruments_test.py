@@ -1,3 +1,4 @@
+import copy
 import pytest
 import numpy as np
 import matplotlib.pyplot as plt
@@ -89,6 +90,20 @@ class AbstractTestAbstractInstrument(
         assert isinstance(na.as_named_array(result), na.AbstractScalar)
         assert na.unit_normalized(result).is_equivalent(u.AA)
 
+    def test_wavelength_cached(self, a: esis.optics.abc.AbstractInstrument):
+        a = copy.deepcopy(a)
+        geometry = a._geometry
+        system = a.system
+        assert a._geometry is geometry
+        assert a.system is system
+        wavelength_min = a.wavelength_min
+        a.grating.rulings.spacing.coefficients[0] = 2 * na.nominal(
+            a.grating.rulings.spacing.coefficients[0]
+        )
+        assert a._geometry is not geometry
+        assert a.system is not system
+        assert np.all(a.wavelength_min > wavelength_min)
+
     def test_wavlength_physical(self, a: esis.optics.abc.AbstractInstrument):
         assert np.all(a.wavelength_physical > 0 * u.nm)
 
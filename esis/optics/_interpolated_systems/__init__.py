@@ -0,0 +1,5 @@
+from ._interpolated_systems import InterpolatedSystem
+
+__all__ = [
+    "InterpolatedSystem",
+]
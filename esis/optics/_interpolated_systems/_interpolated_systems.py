@@ -0,0 +1,204 @@
+from __future__ import annotations
+from typing_extensions import Self
+import pathlib
+import dataclasses
+import joblib
+import astropy.units as u
+import named_arrays as na
+import optika
+import esis
+
+__all__ = [
+    "InterpolatedSystem",
+]
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class InterpolatedSystem(
+    optika.systems.LinearSystem,
+):
+    """
+    A fast approximation of an ESIS instrument.
+
+    The optical system is traced once,
+    and polynomials are fit to the rays to map each wavelength and field
+    position to a position on the detector and a throughput,
+    separately for each channel.
+    Evaluating these polynomials is much faster than tracing rays,
+    so this model can be used for forward modeling and distortion fitting
+    where the full ray trace is too slow.
+
+    Since this class is a :class:`optika.systems.LinearSystem`,
+    it also inherits :meth:`~optika.systems.LinearSystem.image` and
+    :meth:`~optika.systems.LinearSystem.weights`.
+
+    Examples
+    --------
+    Fit an interpolated system to the ESIS-I design and compute the
+    detector position of the center of the field of view for each channel.
+
+    .. jupyter-execute::
+
+        import astropy.units as u
+        import named_arrays as na
+        import esis
+
+        instrument = esis.flights.f1.optics.design(num_distribution=0)
+
+        system = esis.optics.InterpolatedSystem.from_instrument(instrument)
+
+        coordinates = na.SpectralPositionalVectorArray(
+            wavelength=instrument.wavelength_physical,
+            position=na.Cartesian2dVectorArray(0, 0) * u.arcsec,
+        )
+
+        system.position(coordinates)
+    """
+
+    @classmethod
+    def from_instrument(
+        cls,
+        instrument: esis.optics.abc.AbstractInstrument,
+        wavelength: None | u.Quantity | na.AbstractScalar = None,
+        field: None | na.AbstractCartesian2dVectorArray = None,
+        pupil: None | na.AbstractCartesian2dVectorArray = None,
+        degree: int = 2,
+        num_wavelength: int = 11,
+    ) -> Self:
+        """
+        Trace the rays through an instrument and fit the polynomial models.
+
+        This uses :meth:`optika.systems.SequentialSystem.linearize`,
+        which traces a single grid of rays and fits the distortion and
+        vignetting models to the same rays.
+
+        Parameters
+        ----------
+        instrument
+            The model of the optical system to approximate.
+        wavelength
+            The wavelengths at which to sample the system.
+            These must vary along a single logical axis.
+            If :obj:`None` (the default), `num_wavelength` wavelengths at the
+            centers of evenly-spaced bins between
+            :attr:`~esis.optics.abc.AbstractInstrument.wavelength_min` and
+            :attr:`~esis.optics.abc.AbstractInstrument.wavelength_max`
+            will be used,
+            which stay strictly inside the passband of the instrument.
+        field
+            The vertices of the normalized field grid.
+            If :obj:`None` (the default), the default grid of
+            :meth:`~optika.systems.SequentialSystem.linearize` will be used.
+        pupil
+            The vertices of the normalized pupil grid.
+            If :obj:`None` (the default), the default grid of
+            :meth:`~optika.systems.SequentialSystem.linearize` will be used.
+        degree
+            The degree of the polynomial distortion and vignetting models.
+        num_wavelength
+            The number of wavelengths to sample if `wavelength` is :obj:`None`.
+        """
+        if wavelength is None:
+            axis_wavelength = "_wavelength_interpolated"
+            wavelength = na.linspace(
+                start=na.nominal(instrument.wavelength_min),
+                stop=na.nominal(instrument.wavelength_max),
+                axis=axis_wavelength,
+                num=num_wavelength + 1,
+            )
+            wavelength = wavelength.cell_centers(axis_wavelength)
+
+        system = instrument.system.linearize(
+            wavelength=wavelength,
+            field=field,
+            pupil=pupil,
+            degree=degree,
+        )
+        return cls(
+            area_effective=system.area_effective,
+            distortion=system.distortion,
+            sensor=system.sensor,
+            direction=system.direction,
+            vignetting=system.vignetting,
+            field_stop=system.field_stop,
+        )
+
+    def position(
+        self,
+        coordinates: na.AbstractSpectralPositionalVectorArray,
+    ) -> na.AbstractCartesian2dVectorArray:
+        """
+        Map points in the scene to a position on the detector.
+
+        Parameters
+        ----------
+        coordinates
+            The wavelength and field position of each point in the scene.
+        """
+        return self.distortion.distort(coordinates).position
+
+    def throughput(
+        self,
+        coordinates: na.AbstractSpectralPositionalVectorArray,
+    ) -> na.AbstractScalar:
+        """
+        Compute the effective area seen by each point in the scene.
+
+        This is the product of the effective area, which depends only on
+        wavelength, and the relative illumination due to vignetting.
+
+        Parameters
+        ----------
+        coordinates
+            The wavelength and field position of each point in the scene.
+        """
+        result = self.area_effective(coordinates.wavelength)
+        if self.vignetting is not None:
+            result = result * self.vignetting(coordinates)
+        return result
+
+    def to_file(
+        self,
+        path: str | pathlib.Path,
+    ) -> None:
+        """
+        Save the fitted models to a file.
+
+        The polynomial fits are evaluated first, so that their coefficients
+        are saved and do not need to be recomputed after loading.
+
+        Parameters
+        ----------
+        path
+            The file to save the models to.
+        """
+        self.distortion.fit
+        self.distortion.fit_inverse
+        if self.vignetting is not None:
+            self.vignetting.fit
+        joblib.dump(self, path)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | pathlib.Path,
+    ) -> Self:
+        """
+        Load the fitted models saved by :meth:`to_file`.
+
+        Parameters
+        ----------
+        path
+            The file containing the models.
+
+        Raises
+        ------
+        TypeError
+            If the file does not contain an instance of this class.
+        """
+        result = joblib.load(path)
+        if not isinstance(result, cls):
+            raise TypeError(
+                f"{path} contains an instance of {type(result)}, not {cls}."
+            )
+        return result
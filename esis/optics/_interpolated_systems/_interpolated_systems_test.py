@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import esis
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.InterpolatedSystem.from_instrument(
+            instrument=esis.flights.f1.optics.design(num_distribution=0),
+        ),
+    ],
+)
+class TestInterpolatedSystem:
+
+    def test_position(self, a: esis.optics.InterpolatedSystem):
+        coordinates = na.SpectralPositionalVectorArray(
+            wavelength=630 * u.AA,
+            position=na.Cartesian2dVectorArray(0, 0) * u.arcsec,
+        )
+        result = a.position(coordinates)
+        assert isinstance(result, na.AbstractCartesian2dVectorArray)
+        assert "channel" in result.shape
+        assert np.all(np.isfinite(result.length))
+
+    def test_throughput(self, a: esis.optics.InterpolatedSystem):
+        coordinates = na.SpectralPositionalVectorArray(
+            wavelength=630 * u.AA,
+            position=na.Cartesian2dVectorArray(0, 0) * u.arcsec,
+        )
+        result = a.throughput(coordinates)
+        assert na.unit_normalized(result).is_equivalent(u.cm**2)
+        assert np.all(result >= 0 * u.cm**2)
+
+    def test_to_file(self, a: esis.optics.InterpolatedSystem, tmp_path):
+        path = tmp_path / "system.pkl"
+        a.to_file(path)
+        b = esis.optics.InterpolatedSystem.from_file(path)
+        coordinates = a.distortion.coordinates_scene
+        assert np.all(a.position(coordinates) == b.position(coordinates))
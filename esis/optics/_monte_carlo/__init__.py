@@ -0,0 +1,6 @@
+from ._monte_carlo import MonteCarloResult, MonteCarlo
+
+__all__ = [
+    "MonteCarloResult",
+    "MonteCarlo",
+]
@@ -0,0 +1,611 @@
+from __future__ import annotations
+from typing import Any, Callable, Iterator, Literal
+import os
+import math
+import functools
+import dataclasses
+import multiprocessing
+import concurrent.futures
+import numpy as np
+import scipy.stats
+import scipy.special
+import named_arrays as na
+import esis
+
+__all__ = [
+    "MonteCarloResult",
+    "MonteCarlo",
+]
+
+_axis_distribution = na.UncertainScalarArray.axis_distribution
+
+_monte_carlo: None | tuple[MonteCarlo, Callable] = None
+"""The engine and function being evaluated by the current worker process."""
+
+
+def _initialize(monte_carlo: MonteCarlo, func: Callable) -> None:
+    global _monte_carlo
+    _monte_carlo = monte_carlo, func
+
+
+def _evaluate(start: int, stop: int) -> na.AbstractScalar:
+    monte_carlo, func = _monte_carlo
+    return monte_carlo._evaluate(func, start, stop)
+
+
+def _map_uncertain(
+    obj: Any,
+    func: Callable[[na.AbstractUncertainScalarArray], na.AbstractScalar],
+) -> Any:
+    """
+    Apply a function to every uncertain scalar inside an object.
+
+    This recurses through the fields of dataclasses and the elements of
+    lists, tuples, and dictionaries,
+    which covers every component of an instrument.
+    Objects which do not contain any uncertain scalars are returned as-is,
+    so unchanged components are shared instead of copied.
+
+    Parameters
+    ----------
+    obj
+        The object to search, usually an instrument.
+    func
+        The function to apply to each uncertain scalar.
+    """
+    if isinstance(obj, na.AbstractUncertainScalarArray):
+        return func(obj)
+
+    if type(obj) in (list, tuple):
+        result = type(obj)(_map_uncertain(value, func) for value in obj)
+        if all(r is v for r, v in zip(result, obj)):
+            return obj
+        return result
+
+    if isinstance(obj, dict):
+        result = {key: _map_uncertain(value, func) for key, value in obj.items()}
+        if all(result[key] is obj[key] for key in obj):
+            return obj
+        return result
+
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        changes = dict()
+        for field in dataclasses.fields(obj):
+            if not field.init:
+                continue
+            value = getattr(obj, field.name)
+            result = _map_uncertain(value, func)
+            if result is not value:
+                changes[field.name] = result
+        if changes:
+            return dataclasses.replace(obj, **changes)
+
+    return obj
+
+
+def _find_uncertain(
+    obj: Any,
+    path: str = "",
+) -> Iterator[tuple[str, na.AbstractUncertainScalarArray]]:
+    """
+    Find every uncertain scalar inside an object.
+
+    This recurses through the same containers as :func:`_map_uncertain`.
+
+    Parameters
+    ----------
+    obj
+        The object to search, usually an instrument.
+    path
+        The name of `obj`, used as a prefix of the name of each result.
+
+    Yields
+    ------
+    name
+        The attribute path of the uncertain scalar,
+        such as ``"grating.rulings.spacing.coefficients[0]"``.
+    value
+        The uncertain scalar.
+    """
+    if isinstance(obj, na.AbstractUncertainScalarArray):
+        yield path, obj
+
+    elif type(obj) in (list, tuple):
+        for i, value in enumerate(obj):
+            yield from _find_uncertain(value, f"{path}[{i}]")
+
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from _find_uncertain(value, f"{path}[{key!r}]")
+
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        for field in dataclasses.fields(obj):
+            if field.init:
+                name = f"{path}.{field.name}" if path else field.name
+                yield from _find_uncertain(getattr(obj, field.name), name)
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class MonteCarloResult:
+    """The statistics of a quantity computed by :class:`MonteCarlo`."""
+
+    nominal: na.AbstractScalar
+    """The value of the quantity computed using the nominal instrument."""
+
+    mean: na.AbstractScalar
+    """The mean of the samples."""
+
+    variance: na.AbstractScalar
+    """The unbiased variance of the samples."""
+
+    percentile: None | na.AbstractScalar
+    """
+    The percentiles of the samples, along the ``percentile`` axis.
+
+    If :obj:`None`, no percentiles were requested.
+    """
+
+    num_distribution: int
+    """The number of samples."""
+
+    error: na.AbstractScalar
+    """
+    An estimate of the standard error of :attr:`mean`,
+    computed from the scatter of the means of the independent replicates
+    drawn by :class:`MonteCarlo`.
+    """
+
+    @property
+    def std(self) -> na.AbstractScalar:
+        """The standard deviation of the samples."""
+        return np.sqrt(self.variance)
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class MonteCarlo:
+    """
+    Propagate the uncertain parameters of an instrument through a function.
+
+    The samples of the uncertain parameters are evaluated in chunks.
+
+    The instrument factories in :mod:`esis.flights.f1.optics` represent
+    uncertain parameters using :class:`named_arrays.UncertainScalarArray`,
+    so every ray trace carries the distribution axis through the whole grid,
+    and the memory usage grows linearly with the number of samples.
+
+    This class splits the distribution axis into chunks of :attr:`num_chunk`
+    samples, evaluates the function once for each chunk,
+    and keeps only the output of the function,
+    so the peak memory usage is set by the size of each chunk
+    instead of the total number of samples.
+    The nominal value is computed once using the nominal instrument,
+    and each chunk only computes the samples.
+    The mean and variance are accumulated as running moments as each chunk
+    finishes, so the samples of the output are not kept unless
+    :attr:`percentiles` are requested,
+    and the chunks can be distributed across a pool of processes.
+
+    Examples
+    --------
+    Compute the uncertainty of the effective area of the ESIS-I design.
+
+    .. jupyter-execute::
+
+        import esis
+
+        def area(instrument):
+            return instrument.system.rayfunction_default.outputs.intensity.mean()
+
+        instrument = esis.flights.f1.optics.design(num_distribution=16)
+
+        monte_carlo = esis.optics.MonteCarlo(instrument, num_chunk=4)
+
+        result = monte_carlo(area)
+
+        result.mean, result.std
+    """
+
+    instrument: esis.optics.abc.AbstractInstrument
+    """The instrument with uncertain parameters."""
+
+    num_chunk: int = 8
+    """The number of samples to evaluate at once."""
+
+    percentiles: tuple[float, ...] = ()
+    """
+    The percentiles to compute from the samples.
+
+    Computing percentiles requires every sample of the output,
+    so the samples are only kept if this is not empty.
+    """
+
+    workers: None | int = 1
+    """
+    The number of processes used to evaluate the chunks.
+
+    If :obj:`None`, the number of CPUs is used.
+    If ``1``, the chunks are evaluated serially in this process.
+    The processes are started using the ``"forkserver"`` method,
+    since forking after the threads started by the dependencies of
+    :mod:`esis` can deadlock.
+    """
+
+    sampler: Literal["random", "sobol", "halton", "latin"] = "random"
+    """
+    The method used to draw the samples of the uncertain parameters.
+
+    If ``"random"`` and :attr:`num_sample` is :obj:`None`,
+    the samples drawn by the uncertain parameters themselves are used.
+    Otherwise, the uniform and normal parameters of the instrument are
+    sampled jointly, with one dimension for each element of each parameter,
+    using a scrambled Sobol sequence (``"sobol"``),
+    a scrambled Halton sequence (``"halton"``),
+    or a Latin hypercube design (``"latin"``).
+    These cover the parameter space much more evenly than random samples,
+    so the statistics converge using far fewer ray traces.
+    """
+
+    num_sample: None | int = None
+    """
+    The number of samples to draw for each parameter.
+
+    If :obj:`None`, the number of samples of the uncertain parameters is used.
+    Sobol sequences are only balanced if they have a power of two samples,
+    so if :attr:`sampler` is ``"sobol"``, the size of each replicate is
+    rounded up to the next power of two.
+    """
+
+    num_replicate: int = 4
+    """
+    The number of independent replicates the samples are split into.
+    The scatter of the mean of each replicate is used to compute
+    :attr:`MonteCarloResult.error`,
+    which is valid for the randomized low-discrepancy sequences
+    where the usual :math:`\\sigma / \\sqrt{n}` estimate is too pessimistic.
+    """
+
+    seed: None | int = None
+    """The seed used to draw the samples."""
+
+    @functools.cached_property
+    def _instrument_nominal(self) -> esis.optics.abc.AbstractInstrument:
+        """A copy of :attr:`instrument` using the nominal value of each parameter."""
+        return _map_uncertain(self.instrument, lambda a: a.nominal)
+
+    @functools.cached_property
+    def _instrument_explicit(self) -> esis.optics.abc.AbstractInstrument:
+        """
+        A copy of :attr:`instrument` with explicit samples of each parameter.
+
+        Every uncertain parameter is converted to an explicit array,
+        so that the samples of each parameter are only drawn once,
+        and each chunk sees the same samples.
+
+        Raises
+        ------
+        ValueError
+            If :attr:`sampler` redraws the samples and a parameter has samples
+            which are not uniform or normal,
+            such as a parameter derived from another uncertain parameter.
+            The samples of such a parameter cannot be redrawn.
+        """
+        if self.sampler == "random" and self.num_sample is None:
+            return _map_uncertain(self.instrument, lambda a: a.explicit)
+
+        kinds = (na.UniformUncertainScalarArray, na.NormalUncertainScalarArray)
+
+        for name, a in _find_uncertain(self.instrument):
+            if isinstance(a, kinds):
+                continue
+            if na.shape(a.distribution).get(_axis_distribution, 1) > 1:
+                raise ValueError(
+                    f"The samples of `{name}` cannot be redrawn by the "
+                    f"'{self.sampler}' sampler since it is an instance of "
+                    f"`{type(a).__name__}`. Define it as an independent uniform "
+                    f"or normal parameter instead."
+                )
+
+        shapes = []
+        num_distribution = []
+
+        def survey(a: na.AbstractUncertainScalarArray):
+            if isinstance(a, kinds):
+                shapes.append(na.shape_broadcasted(a.nominal, a.width))
+                num_distribution.append(a.num_distribution)
+            return a
+
+        _map_uncertain(self.instrument, survey)
+
+        num_sample = self.num_sample
+        if num_sample is None:
+            num_sample = max(num_distribution, default=1)
+
+        num_dimension = sum(math.prod(shape.values()) for shape in shapes)
+
+        samples = self._unit(num_sample, num_dimension)
+
+        index = iter(np.cumsum([0] + [math.prod(s.values()) for s in shapes]))
+        start = next(index)
+
+        def sample(a: na.AbstractUncertainScalarArray):
+            nonlocal start
+            if not isinstance(a, kinds):
+                return a.explicit
+            shape = na.shape_broadcasted(a.nominal, a.width)
+            stop = next(index)
+            unit = na.ScalarArray(
+                ndarray=samples[:, start:stop].reshape(-1, *shape.values()),
+                axes=(_axis_distribution, *shape),
+            )
+            start = stop
+            if isinstance(a, na.UniformUncertainScalarArray):
+                distribution = a.nominal + (2 * unit - 1) * a.width
+            else:
+                distribution = a.nominal + scipy.special.ndtri(unit) * a.width
+            return na.UncertainScalarArray(a.nominal, distribution)
+
+        return _map_uncertain(self.instrument, sample)
+
+    def _unit(
+        self,
+        num_sample: int,
+        num_dimension: int,
+    ) -> np.ndarray:
+        """
+        Draw samples from the unit hypercube using :attr:`sampler`.
+
+        The samples are drawn as :attr:`num_replicate` independently-seeded
+        replicates which are concatenated along the first axis.
+
+        Parameters
+        ----------
+        num_sample
+            The total number of samples.
+        num_dimension
+            The number of dimensions of the hypercube.
+
+        Raises
+        ------
+        ValueError
+            If :attr:`sampler` is not recognized.
+        """
+        sampler = self.sampler
+        seeds = np.random.SeedSequence(self.seed).spawn(self.num_replicate)
+
+        result = []
+        for seed, num in zip(seeds, self._sizes(num_sample)):
+            rng = np.random.default_rng(seed)
+            if num_dimension == 0:
+                result.append(np.empty((num, 0)))
+            elif sampler == "random":
+                result.append(rng.random((num, num_dimension)))
+            elif sampler == "sobol":
+                engine = scipy.stats.qmc.Sobol(num_dimension, seed=rng)
+                result.append(engine.random_base2(int(math.log2(num))))
+            elif sampler == "halton":
+                engine = scipy.stats.qmc.Halton(num_dimension, seed=rng)
+                result.append(engine.random(num))
+            elif sampler == "latin":
+                engine = scipy.stats.qmc.LatinHypercube(num_dimension, seed=rng)
+                result.append(engine.random(num))
+            else:  # pragma: nocover
+                raise ValueError(f"unrecognized sampler '{sampler}'")
+
+        return np.concatenate(result, axis=0)
+
+    def _sizes(self, num_sample: int) -> list[int]:
+        """
+        Compute the number of samples in each replicate.
+
+        If :attr:`sampler` is ``"sobol"``, every replicate has the same size,
+        rounded up to a power of two,
+        so the total can be larger than `num_sample`.
+
+        Parameters
+        ----------
+        num_sample
+            The requested total number of samples.
+        """
+        num_replicate = min(self.num_replicate, num_sample)
+        if self.sampler == "sobol":
+            num = math.ceil(num_sample / num_replicate)
+            return [2 ** math.ceil(math.log2(num))] * num_replicate
+        return [len(i) for i in np.array_split(np.arange(num_sample), num_replicate)]
+
+    @property
+    def num_distribution(self) -> int:
+        """The number of samples of the uncertain parameters."""
+        result = [1]
+
+        def func(a: na.AbstractUncertainScalarArray):
+            result.append(na.shape(a.distribution).get(_axis_distribution, 1))
+            return a
+
+        _map_uncertain(self._instrument_explicit, func)
+
+        return max(result)
+
+    def chunk(
+        self,
+        start: int,
+        stop: int,
+    ) -> esis.optics.abc.AbstractInstrument:
+        """
+        Select a subset of the samples of :attr:`instrument`.
+
+        Parameters
+        ----------
+        start
+            The index of the first sample.
+        stop
+            The index after the last sample.
+        """
+
+        def func(a: na.AbstractUncertainScalarArray):
+            distribution = a.distribution
+            if na.shape(distribution).get(_axis_distribution, 1) > 1:
+                distribution = distribution[{_axis_distribution: slice(start, stop)}]
+            return na.UncertainScalarArray(a.nominal, distribution)
+
+        return _map_uncertain(self._instrument_explicit, func)
+
+    def _evaluate(
+        self,
+        func: Callable[[esis.optics.abc.AbstractInstrument], na.AbstractScalar],
+        start: int,
+        stop: int,
+    ) -> na.AbstractScalar:
+        """
+        Evaluate a function for a single chunk of samples.
+
+        Only the samples of each parameter are passed to `func`,
+        so the nominal value is not recomputed for every chunk.
+
+        Parameters
+        ----------
+        func
+            The function to evaluate.
+        start
+            The index of the first sample.
+        stop
+            The index after the last sample.
+        """
+        instrument = self.chunk(start, stop)
+        instrument = _map_uncertain(instrument, lambda a: a.distribution)
+
+        result = func(instrument)
+
+        if isinstance(result, na.AbstractUncertainScalarArray):
+            result = result.distribution
+
+        shape = na.shape(result) | {_axis_distribution: stop - start}
+
+        return na.broadcast_to(result, shape)
+
+    def _chunks(
+        self,
+        func: Callable[[esis.optics.abc.AbstractInstrument], na.AbstractScalar],
+    ) -> Iterator[na.AbstractScalar]:
+        """
+        Evaluate a function for each chunk of samples.
+
+        Parameters
+        ----------
+        func
+            The function to evaluate.
+
+        Yields
+        ------
+        distribution
+            The samples of the output for each chunk, in order.
+        """
+        num_distribution = self.num_distribution
+        num_chunk = self.num_chunk
+
+        start = range(0, num_distribution, num_chunk)
+        stop = [min(i + num_chunk, num_distribution) for i in start]
+
+        workers = self.workers
+        if workers is None:
+            workers = os.cpu_count()
+
+        if workers == 1 or len(start) == 1:
+            for i, j in zip(start, stop):
+                yield self._evaluate(func, i, j)
+            return
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=_initialize,
+            initargs=(self, func),
+        ) as executor:
+            yield from executor.map(_evaluate, start, stop)
+
+    def __call__(
+        self,
+        func: Callable[[esis.optics.abc.AbstractInstrument], na.AbstractScalar],
+    ) -> MonteCarloResult:
+        """
+        Compute the statistics of a function of the instrument.
+
+        Parameters
+        ----------
+        func
+            A function which computes some quantity,
+            such as the spot size or the effective area, from an instrument.
+            It must be picklable if :attr:`workers` is not ``1``.
+        """
+        axis = _axis_distribution
+
+        nominal = func(self._instrument_nominal)
+        if isinstance(nominal, na.AbstractUncertainScalarArray):
+            nominal = nominal.nominal
+
+        sizes = self._sizes(self.num_distribution)
+        bounds = np.cumsum([0] + sizes)
+        sum_replicate = [None] * len(sizes)
+
+        num_distribution = 0
+        samples = []
+
+        for distribution in self._chunks(func):
+
+            start = num_distribution
+            num = distribution.shape[axis]
+            mean_chunk = distribution.mean(axis=axis)
+            m2_chunk = np.square(distribution - mean_chunk).sum(axis=axis)
+
+            if num_distribution == 0:
+                mean = mean_chunk
+                m2 = m2_chunk
+            else:
+                total = num_distribution + num
+                delta = mean_chunk - mean
+                mean = mean + delta * num / total
+                m2 = m2 + m2_chunk + np.square(delta) * num_distribution * num / total
+            num_distribution += num
+
+            for r in range(len(sizes)):
+                i = max(bounds[r], start) - start
+                j = min(bounds[r + 1], num_distribution) - start
+                if i < j:
+                    s = distribution[{axis: slice(i, j)}].sum(axis=axis)
+                    if sum_replicate[r] is not None:
+                        s = sum_replicate[r] + s
+                    sum_replicate[r] = s
+
+            if self.percentiles:
+                samples.append(distribution)
+
+        percentiles = self.percentiles
+        if percentiles:
+            distribution = na.concatenate(samples, axis=axis)
+            percentile = na.stack(
+                arrays=[distribution.percentile(q, axis=axis) for q in percentiles],
+                axis="percentile",
+            )
+        else:
+            percentile = None
+
+        num_replicate = len(sizes)
+        if num_replicate > 1:
+            mean_replicate = na.stack(
+                arrays=[s / n for s, n in zip(sum_replicate, sizes)],
+                axis="replicate",
+            )
+            delta = mean_replicate - mean_replicate.mean(axis="replicate")
+            variance_replicate = np.square(delta).sum(axis="replicate")
+            variance_replicate = variance_replicate / (num_replicate - 1)
+            error = np.sqrt(variance_replicate / num_replicate)
+        else:
+            error = np.sqrt(m2 / max(num_distribution - 1, 1) / num_distribution)
+
+        return MonteCarloResult(
+            nominal=nominal,
+            mean=mean,
+            variance=m2 / max(num_distribution - 1, 1),
+            percentile=percentile,
+            num_distribution=num_distribution,
+            error=error,
+        )
@@ -0,0 +1,143 @@
+import pytest
+import math
+import warnings
+import dataclasses
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import esis
+
+
+def _roll(instrument: esis.optics.abc.AbstractInstrument) -> na.AbstractScalar:
+    return 2 * instrument.grating.roll
+
+
+def _spot(instrument: esis.optics.abc.AbstractInstrument) -> na.AbstractScalar:
+    return instrument.system.rayfunction_default.outputs.position.length.mean()
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.MonteCarlo(
+            instrument=esis.flights.f1.optics.design(num_distribution=10),
+            num_chunk=3,
+        ),
+        esis.optics.MonteCarlo(
+            instrument=esis.flights.f1.optics.design(num_distribution=10),
+            num_chunk=4,
+            workers=2,
+        ),
+        esis.optics.MonteCarlo(
+            instrument=esis.flights.f1.optics.design(num_distribution=10),
+            num_chunk=5,
+            sampler="sobol",
+            num_sample=16,
+            seed=1,
+        ),
+        esis.optics.MonteCarlo(
+            instrument=esis.flights.f1.optics.design(num_distribution=10),
+            sampler="sobol",
+            seed=3,
+        ),
+        esis.optics.MonteCarlo(
+            instrument=esis.flights.f1.optics.design(num_distribution=10),
+            sampler="latin",
+            num_replicate=2,
+            seed=2,
+            percentiles=(2.5, 50, 97.5),
+        ),
+    ],
+)
+class TestMonteCarlo:
+
+    def test_num_distribution(self, a: esis.optics.MonteCarlo):
+        num_sample = 10 if a.num_sample is None else a.num_sample
+        if a.sampler == "sobol":
+            assert a.num_distribution >= num_sample
+        else:
+            assert a.num_distribution == num_sample
+
+    def test_sizes(self, a: esis.optics.MonteCarlo):
+        a = dataclasses.replace(a)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            num_distribution = a.num_distribution
+        sizes = a._sizes(num_distribution)
+        assert sum(sizes) == num_distribution
+        if a.sampler == "sobol":
+            assert all(math.log2(size).is_integer() for size in sizes)
+
+    def test_samples(self, a: esis.optics.MonteCarlo):
+        roll = a.instrument.grating.roll
+        result = a._instrument_explicit.grating.roll
+        assert np.all(result.distribution >= roll.nominal - roll.width)
+        assert np.all(result.distribution <= roll.nominal + roll.width)
+
+    def test_chunk(self, a: esis.optics.MonteCarlo):
+        result = a.chunk(0, 2)
+        assert isinstance(result, type(a.instrument))
+        roll = result.grating.roll
+        assert roll.distribution.shape[roll.axis_distribution] == 2
+
+    def test__call__(self, a: esis.optics.MonteCarlo):
+        result = a(_roll)
+        assert isinstance(result, esis.optics.MonteCarloResult)
+        assert result.num_distribution == a.num_distribution
+        expected = _roll(a._instrument_explicit)
+        axis = expected.axis_distribution
+        mean = expected.distribution.mean(axis=axis)
+        variance = np.square(expected.distribution - mean).sum(axis=axis)
+        variance = variance / (a.num_distribution - 1)
+        assert np.allclose(result.mean, mean)
+        assert np.allclose(result.variance, variance)
+        assert np.allclose(result.nominal, expected.nominal)
+        if a.percentiles:
+            assert result.percentile.shape["percentile"] == len(a.percentiles)
+        else:
+            assert result.percentile is None
+        assert np.all(result.std > 0 * u.deg)
+        assert np.all(result.error > 0 * u.deg)
+        assert np.all(result.error < result.std)
+
+
+def test_ray_trace():
+    instrument = esis.flights.f1.optics.design(num_distribution=4)
+    monte_carlo = esis.optics.MonteCarlo(instrument, num_chunk=3)
+    result = monte_carlo(_spot)
+    expected = _spot(monte_carlo._instrument_explicit)
+    axis = expected.axis_distribution
+    assert result.num_distribution == 4
+    assert np.allclose(result.nominal, expected.nominal)
+    assert np.allclose(result.mean, expected.distribution.mean(axis=axis))
+
+
+@pytest.mark.parametrize("sampler", ["sobol", "halton", "latin"])
+def test_ray_trace_quasi_random(sampler: str):
+    instrument = esis.flights.f1.optics.design(num_distribution=4)
+    monte_carlo = esis.optics.MonteCarlo(
+        instrument=instrument,
+        num_chunk=3,
+        sampler=sampler,
+        num_sample=8,
+        num_replicate=2,
+        seed=1,
+    )
+    result = monte_carlo(_spot)
+    expected = _spot(monte_carlo._instrument_explicit)
+    axis = expected.axis_distribution
+    assert result.num_distribution == 8
+    assert np.allclose(result.mean, expected.distribution.mean(axis=axis))
+
+
+def test_derived():
+    instrument = esis.flights.f1.optics.design(num_distribution=4)
+    density = na.UniformUncertainScalarArray(
+        nominal=2586 / u.mm,
+        width=1 / u.mm,
+        num_distribution=4,
+    )
+    instrument.grating.rulings.spacing.coefficients[0] = 1 / density
+    monte_carlo = esis.optics.MonteCarlo(instrument, sampler="sobol", num_sample=8)
+    with pytest.raises(ValueError, match="grating.rulings.spacing.coefficients"):
+        monte_carlo.chunk(0, 4)
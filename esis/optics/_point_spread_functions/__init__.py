@@ -0,0 +1,5 @@
+from ._point_spread_functions import PointSpreadFunctionLibrary
+
+__all__ = [
+    "PointSpreadFunctionLibrary",
+]
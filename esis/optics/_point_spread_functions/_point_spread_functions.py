@@ -0,0 +1,464 @@
+from __future__ import annotations
+from typing_extensions import Self
+import pathlib
+import functools
+import dataclasses
+import joblib
+import numpy as np
+import scipy.signal
+import named_arrays as na
+import esis
+
+__all__ = [
+    "PointSpreadFunctionLibrary",
+]
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class PointSpreadFunctionLibrary:
+    """
+    A precomputed set of pixel-sampled point-spread functions of each channel.
+
+    The point-spread functions are sampled on a regular grid of field positions.
+
+    The instrument is traced once over the field grid,
+    and the spot diagram of each field position is binned into a kernel
+    centered on the centroid of the spot,
+    so the library can be stored on disk and reused by every forward model.
+    The kernel at any other field position is found using bilinear
+    interpolation,
+    and a shift-variant convolution is approximated by splitting the image
+    into blocks which are each convolved with the kernel at their center
+    using FFTs.
+
+    Examples
+    --------
+    Compute the point-spread functions of the ESIS-I design and plot the
+    kernel at the center of the field of view.
+
+    .. jupyter-execute::
+
+        import named_arrays as na
+        import esis
+
+        instrument = esis.flights.f1.optics.design(num_distribution=0)
+
+        psf = esis.optics.PointSpreadFunctionLibrary.from_instrument(instrument)
+
+        kernel = psf(na.Cartesian2dVectorArray(0, 0))
+
+        fig, ax = na.plt.subplots(
+            axis_cols="channel",
+            ncols=kernel.shape["channel"],
+            sharey=True,
+            constrained_layout=True,
+        )
+        na.plt.imshow(
+            kernel,
+            axis_x="kernel_x",
+            axis_y="kernel_y",
+            ax=ax,
+            cmap="gray",
+            origin="lower",
+        );
+    """
+
+    kernel: na.AbstractScalar
+    """
+    The fraction of the light from each field position which lands in each
+    pixel around the centroid of its image.
+    The centroid lies in the center of the element at index ``n // 2``
+    along each of :attr:`axis_kernel`.
+    """
+
+    field: na.AbstractCartesian2dVectorArray
+    """
+    The regular grid of normalized field positions at which :attr:`kernel`
+    is sampled.
+    """
+
+    position: na.AbstractCartesian2dVectorArray
+    """
+    The centroid of the image of each field position in fractional pixel
+    indices, where an integer is the center of a pixel.
+    """
+
+    axis_channel: str = "channel"
+    """The logical axis corresponding to changing channel."""
+
+    axis_field: tuple[str, str] = ("field_x", "field_y")
+    """The logical axes of :attr:`field` along each field coordinate."""
+
+    axis_kernel: tuple[str, str] = ("kernel_x", "kernel_y")
+    """The logical axes of :attr:`kernel` along each detector pixel axis."""
+
+    axis_pixel: tuple[str, str] = ("detector_x", "detector_y")
+    """The logical axes of the images convolved using :meth:`convolve`."""
+
+    @classmethod
+    def from_instrument(
+        cls,
+        instrument: esis.optics.abc.AbstractInstrument,
+        num_field: int = 11,
+        num_pupil: int = 21,
+        num_kernel: int = 15,
+    ) -> Self:
+        """
+        Trace rays through an instrument and bin each spot diagram into a kernel.
+
+        The result is stored in :obj:`esis.cache`,
+        keyed on the parameters of the instrument and the sampling,
+        so the ray trace only runs once for each instrument.
+
+        Parameters
+        ----------
+        instrument
+            The model of the optical system.
+            The kernels are computed at each wavelength of
+            :attr:`~esis.optics.abc.AbstractInstrument.system`.
+        num_field
+            The number of field positions along each axis of the field grid.
+        num_pupil
+            The number of pupil positions along each axis of the pupil grid.
+        num_kernel
+            The number of pixels along each axis of each kernel.
+        """
+        return _from_instrument(
+            instrument=instrument,
+            num_field=num_field,
+            num_pupil=num_pupil,
+            num_kernel=num_kernel,
+        )
+
+    def __call__(
+        self,
+        field: na.AbstractCartesian2dVectorArray,
+    ) -> na.AbstractScalar:
+        """
+        Interpolate the kernel at the given field positions.
+
+        Parameters
+        ----------
+        field
+            The normalized field positions at which to evaluate the kernel.
+            Positions outside the grid use the kernel at the nearest edge.
+        """
+        axis_x, axis_y = self.axis_field
+
+        grid = self.field.explicit
+
+        weight_x = _weights(field.x, grid.x, axis_x, axis_y)
+        weight_y = _weights(field.y, grid.y, axis_y, axis_x)
+
+        return (weight_x * weight_y * self.kernel).sum(self.axis_field)
+
+    @functools.cached_property
+    def _field_from_position(self) -> np.ndarray:
+        """
+        The affine transformation from pixel indices to normalized field position.
+
+        This is an array of shape ``(channel, 3, 2)`` fit to :attr:`position`
+        separately for each channel.
+        """
+        axis_channel = self.axis_channel
+
+        field = self.field.explicit
+        position = self.position
+
+        shape = na.shape_broadcasted(field, position)
+        shape = {axis_channel: shape.get(axis_channel, 1)} | shape
+        num_channel = shape[axis_channel]
+
+        def _flat(a: na.AbstractScalar) -> np.ndarray:
+            a = na.nominal(na.value(a))
+            return na.broadcast_to(a, shape).ndarray.reshape(num_channel, -1)
+
+        px = _flat(position.x)
+        py = _flat(position.y)
+        fx = _flat(field.x)
+        fy = _flat(field.y)
+
+        result = []
+        for c in range(num_channel):
+            where = np.isfinite(px[c]) & np.isfinite(py[c])
+            a = np.stack([px[c], py[c], np.ones_like(px[c])], axis=~0)
+            b = np.stack([fx[c], fy[c]], axis=~0)
+            solution, *_ = np.linalg.lstsq(a[where], b[where], rcond=None)
+            result.append(solution)
+
+        return np.stack(result)
+
+    def convolve(
+        self,
+        image: na.AbstractScalar,
+        num_block: int = 8,
+    ) -> na.ScalarArray:
+        """
+        Convolve an image with the shift-variant point-spread function.
+
+        The image is split into ``num_block`` by ``num_block`` blocks,
+        and each block is convolved with the kernel at its center using
+        the overlap-add method,
+        so the cost is the same as a single FFT convolution of the whole image.
+
+        Parameters
+        ----------
+        image
+            An image with the pixel axes in :attr:`axis_pixel`,
+            such as the output of :class:`esis.data.synth.ForwardModel`.
+            Any other axes, such as the channel or time, are convolved
+            independently.
+        num_block
+            The number of blocks along each pixel axis.
+        """
+        axis_channel = self.axis_channel
+        axis_x, axis_y = self.axis_pixel
+        axis_block = ("_block_x", "_block_y")
+
+        image = na.asanyarray(image)
+        unit = na.unit(image)
+
+        shape = image.shape
+        num_x = shape[axis_x]
+        num_y = shape[axis_y]
+
+        size_x = -(-num_x // num_block)
+        size_y = -(-num_y // num_block)
+
+        center_x = (np.arange(num_block) + 0.5) * size_x - 0.5
+        center_y = (np.arange(num_block) + 0.5) * size_y - 0.5
+        center_x = center_x[np.newaxis, :, np.newaxis]
+        center_y = center_y[np.newaxis, np.newaxis, :]
+
+        affine = self._field_from_position[:, :, :, np.newaxis, np.newaxis]
+        field_x = affine[:, 0, 0] * center_x + affine[:, 1, 0] * center_y
+        field_y = affine[:, 0, 1] * center_x + affine[:, 1, 1] * center_y
+        field_x = field_x + affine[:, 2, 0]
+        field_y = field_y + affine[:, 2, 1]
+
+        axes_field = (axis_channel,) + axis_block
+        kernel = self(
+            na.Cartesian2dVectorArray(
+                x=na.ScalarArray(field_x, axes=axes_field),
+                y=na.ScalarArray(field_y, axes=axes_field),
+            )
+        )
+
+        axis_mean = tuple(
+            ax for ax in kernel.shape if ax not in axes_field + self.axis_kernel
+        )
+        if axis_mean:
+            kernel = kernel.mean(axis_mean)
+
+        shape_batch = na.broadcast_shapes(
+            {ax: n for ax, n in shape.items() if ax not in self.axis_pixel},
+            {axis_channel: kernel.shape[axis_channel]},
+        )
+        axes = tuple(shape_batch)
+
+        a = na.value(image).ndarray_aligned(axes + self.axis_pixel)
+        k = kernel.ndarray_aligned(axes + axis_block + self.axis_kernel)
+
+        a = np.pad(
+            array=a,
+            pad_width=[(0, 0)] * len(axes)
+            + [(0, num_block * size_x - num_x), (0, num_block * size_y - num_y)],
+        )
+        a = a.reshape(*a.shape[:~1], num_block, size_x, num_block, size_y)
+        a = np.moveaxis(a, ~2, ~1)
+
+        blocks = scipy.signal.fftconvolve(a, k, mode="full", axes=(~1, ~0))
+
+        num_kx, num_ky = k.shape[~1:]
+        result = np.zeros(
+            blocks.shape[:~3]
+            + (num_block * size_x + num_kx - 1, num_block * size_y + num_ky - 1)
+        )
+        for i in range(num_block):
+            for j in range(num_block):
+                sx = slice(i * size_x, (i + 1) * size_x + num_kx - 1)
+                sy = slice(j * size_y, (j + 1) * size_y + num_ky - 1)
+                result[..., sx, sy] += blocks[..., i, j, :, :]
+
+        result = result[
+            ...,
+            num_kx // 2 : num_kx // 2 + num_x,
+            num_ky // 2 : num_ky // 2 + num_y,
+        ]
+
+        result = na.ScalarArray(result, axes=axes + self.axis_pixel)
+        if unit is not None:
+            result = result << unit
+
+        return result
+
+    def to_file(
+        self,
+        path: str | pathlib.Path,
+    ) -> None:
+        """
+        Save this library to a file.
+
+        Parameters
+        ----------
+        path
+            The file to save the library to.
+        """
+        joblib.dump(self, path)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | pathlib.Path,
+    ) -> Self:
+        """
+        Load a library saved by :meth:`to_file`.
+
+        Parameters
+        ----------
+        path
+            The file containing the library.
+
+        Raises
+        ------
+        TypeError
+            If the file does not contain an instance of this class.
+        """
+        result = joblib.load(path)
+        if not isinstance(result, cls):
+            raise TypeError(
+                f"{path} contains an instance of {type(result)}, not {cls}."
+            )
+        return result
+
+
+def _weights(
+    x: float | na.AbstractScalar,
+    grid: na.AbstractScalar,
+    axis: str,
+    axis_other: str,
+) -> na.AbstractScalar:
+    """
+    Compute the bilinear interpolation weights of each point of a regular grid.
+
+    Parameters
+    ----------
+    x
+        The coordinates at which to interpolate.
+    grid
+        The regular grid of coordinates.
+    axis
+        The logical axis of `grid` corresponding to changing `x`.
+    axis_other
+        The other logical axis of the grid, which `grid` is constant along.
+    """
+    if axis_other in grid.shape:
+        grid = grid[{axis_other: 0}]
+    num = grid.shape[axis]
+    start = grid[{axis: 0}]
+    step = grid[{axis: 1}] - start if num > 1 else 1
+    index = (x - start) / step
+    index = np.minimum(np.maximum(index, 0), num - 1)
+    weight = 1 - np.abs(index - na.arange(0, num, axis=axis))
+    return np.maximum(weight, 0)
+
+
+@esis.cache.memoize(paths=[pathlib.Path(__file__)])
+def _from_instrument(
+    instrument: esis.optics.abc.AbstractInstrument,
+    num_field: int,
+    num_pupil: int,
+    num_kernel: int,
+) -> PointSpreadFunctionLibrary:
+
+    axis_channel = instrument.axis_channel
+    axis_field = ("field_x", "field_y")
+    axis_pupil = ("_pupil_x", "_pupil_y")
+    axis_kernel = ("kernel_x", "kernel_y")
+
+    system = instrument.system
+    sensor = system.sensor
+
+    field = na.Cartesian2dVectorLinearSpace(
+        start=-1,
+        stop=1,
+        axis=na.Cartesian2dVectorArray(*axis_field),
+        num=num_field,
+    )
+
+    rays = system.rayfunction(
+        field=field,
+        pupil=na.Cartesian2dVectorLinearSpace(
+            start=-1,
+            stop=1,
+            axis=na.Cartesian2dVectorArray(*axis_pupil),
+            num=num_pupil,
+            centers=True,
+        ),
+        efficiency=False,
+    ).outputs
+
+    pixel = sensor.pixels(rays.position.xy)
+
+    x = na.nominal(na.value(pixel.x)) - 0.5
+    y = na.nominal(na.value(pixel.y)) - 0.5
+    where = na.nominal(rays.unvignetted)
+
+    shape = na.shape_broadcasted(x, y, where)
+    shape_pupil = {ax: shape[ax] for ax in axis_pupil}
+    shape_outer = {ax: shape[ax] for ax in shape if ax not in axis_pupil}
+    shape = shape_outer | shape_pupil
+
+    num_outer = int(np.prod(list(shape_outer.values()), dtype=int))
+
+    x = na.broadcast_to(x, shape).ndarray.reshape(num_outer, -1)
+    y = na.broadcast_to(y, shape).ndarray.reshape(num_outer, -1)
+    where = na.broadcast_to(where, shape).ndarray.reshape(num_outer, -1)
+
+    count = where.sum(axis=~0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center_x = np.where(where, x, 0).sum(axis=~0) / count
+        center_y = np.where(where, y, 0).sum(axis=~0) / count
+
+    ix = np.floor(x - center_x[..., np.newaxis] + 0.5 + num_kernel // 2)
+    iy = np.floor(y - center_y[..., np.newaxis] + 0.5 + num_kernel // 2)
+
+    valid = where & (ix >= 0) & (ix < num_kernel) & (iy >= 0) & (iy < num_kernel)
+
+    index = np.arange(num_outer)[:, np.newaxis] * num_kernel**2
+    index = index + np.where(valid, ix * num_kernel + iy, 0).astype(int)
+
+    kernel = np.bincount(
+        index[valid],
+        minlength=num_outer * num_kernel**2,
+    )
+    kernel = kernel.reshape(num_outer, num_kernel, num_kernel).astype(float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        kernel = kernel / kernel.sum(axis=(~1, ~0), keepdims=True)
+
+    kernel = kernel.reshape(*shape_outer.values(), num_kernel, num_kernel)
+
+    # field positions which are completely vignetted by the field stop
+    # use the mean kernel of the channel
+    axis_mean = tuple(tuple(shape_outer).index(ax) for ax in axis_field)
+    kernel_mean = np.nanmean(kernel, axis=axis_mean, keepdims=True)
+    kernel = np.where(np.isfinite(kernel), kernel, kernel_mean)
+
+    def _outer(a: np.ndarray) -> na.ScalarArray:
+        return na.ScalarArray(
+            ndarray=a.reshape(tuple(shape_outer.values())),
+            axes=tuple(shape_outer),
+        )
+
+    axis_pixel = sensor.axis_pixel
+
+    return PointSpreadFunctionLibrary(
+        kernel=na.ScalarArray(kernel, axes=tuple(shape_outer) + axis_kernel),
+        field=field.explicit,
+        position=na.Cartesian2dVectorArray(_outer(center_x), _outer(center_y)),
+        axis_channel=axis_channel,
+        axis_field=axis_field,
+        axis_kernel=axis_kernel,
+        axis_pixel=(axis_pixel.x, axis_pixel.y),
+    )
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+import named_arrays as na
+import esis
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.PointSpreadFunctionLibrary.from_instrument(
+            instrument=esis.flights.f1.optics.design(num_distribution=0),
+            num_field=5,
+            num_pupil=11,
+            num_kernel=7,
+        ),
+    ],
+)
+class TestPointSpreadFunctionLibrary:
+
+    def test_kernel(self, a: esis.optics.PointSpreadFunctionLibrary):
+        assert np.all(np.isfinite(a.kernel))
+        assert np.allclose(a.kernel.sum(a.axis_kernel), 1)
+
+    @pytest.mark.parametrize(
+        argnames="field",
+        argvalues=[
+            na.Cartesian2dVectorArray(0, 0),
+            na.Cartesian2dVectorArray(0.1, -0.3),
+            na.Cartesian2dVectorArray(2, 2),
+        ],
+    )
+    def test__call__(
+        self,
+        a: esis.optics.PointSpreadFunctionLibrary,
+        field: na.AbstractCartesian2dVectorArray,
+    ):
+        result = a(field)
+        assert set(a.axis_kernel).issubset(result.shape)
+        assert not set(a.axis_field).intersection(result.shape)
+        assert np.allclose(result.sum(a.axis_kernel), 1)
+
+    def test_convolve(self, a: esis.optics.PointSpreadFunctionLibrary):
+        axis_x, axis_y = a.axis_pixel
+        image = na.ScalarArray(
+            ndarray=np.ones((4, 64, 32)),
+            axes=(a.axis_channel, axis_x, axis_y),
+        )
+        result = a.convolve(image, num_block=4)
+        assert result.shape == image.shape
+        center = {axis_x: slice(16, 48), axis_y: slice(8, 24)}
+        assert np.allclose(result[center], 1, atol=0.1)
+
+    def test_to_file(self, a: esis.optics.PointSpreadFunctionLibrary, tmp_path):
+        path = tmp_path / "psf.pkl"
+        a.to_file(path)
+        b = esis.optics.PointSpreadFunctionLibrary.from_file(path)
+        assert np.all(a.kernel == b.kernel)
@@ -0,0 +1,5 @@
+from ._projections import ProjectionOperator
+
+__all__ = [
+    "ProjectionOperator",
+]
@@ -0,0 +1,420 @@
+from __future__ import annotations
+from typing_extensions import Self
+import math
+import pathlib
+import dataclasses
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+import astropy.units as u
+import named_arrays as na
+import optika
+import esis
+
+__all__ = [
+    "ProjectionOperator",
+]
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class ProjectionOperator:
+    """
+    A sparse matrix which maps a spectral scene onto the detectors.
+
+    Each row of :attr:`matrix` is a detector pixel and each column is a
+    cell of the scene,
+    so projecting a scene onto the detectors is a single sparse
+    matrix-vector product,
+    and back-projecting an image into the scene is a product with the
+    transpose.
+    This is the operator needed by iterative inversion algorithms,
+    which project and back-project many times for each frame.
+
+    The elements of the matrix are the conservative-regridding weights
+    computed by :meth:`optika.systems.LinearSystem.weights`,
+    which include the effective area and vignetting of each channel,
+    so they have units of :attr:`unit`.
+
+    Examples
+    --------
+    Build the projection operator of the ESIS-I design and project
+    a uniform scene onto the detectors.
+
+    .. jupyter-execute::
+
+        import astropy.units as u
+        import named_arrays as na
+        import esis
+
+        instrument = esis.flights.f1.optics.design(num_distribution=0)
+
+        coordinates = na.SpectralPositionalVectorArray(
+            wavelength=na.linspace(629, 631, axis="wavelength", num=3) * u.AA,
+            position=na.Cartesian2dVectorLinearSpace(
+                start=instrument.system.field_min,
+                stop=instrument.system.field_max,
+                axis=na.Cartesian2dVectorArray("field_x", "field_y"),
+                num=33,
+            ),
+        )
+
+        projection = esis.optics.ProjectionOperator.from_instrument(
+            instrument=instrument,
+            coordinates=coordinates,
+            axis_wavelength="wavelength",
+            axis_field=("field_x", "field_y"),
+        )
+
+        projection.forward(na.ScalarArray(1))
+    """
+
+    matrix: scipy.sparse.csr_array
+    """
+    The sparse projection matrix,
+    with one row for each element of :attr:`shape_image` and
+    one column for each element of :attr:`shape_scene`.
+    """
+
+    shape_scene: dict[str, int]
+    """
+    The shape of the scene,
+    the wavelength axis, any axes along which the grid of the scene varies
+    between channels, and the field axes.
+    """
+
+    shape_image: dict[str, int]
+    """
+    The shape of the projected image,
+    the channel axis followed by the detector pixel axes.
+    """
+
+    unit: u.UnitBase = u.cm**2
+    """The units of the elements of :attr:`matrix`."""
+
+    @classmethod
+    def from_weights(
+        cls,
+        weights: tuple[na.AbstractScalar, dict[str, int], dict[str, int]],
+        axis_wavelength: str,
+        axis_scene: tuple[str, ...] = (),
+        unit: u.UnitBase = u.cm**2,
+    ) -> Self:
+        """
+        Assemble the projection matrix from a set of regridding weights.
+
+        Parameters
+        ----------
+        weights
+            The regridding weights computed by
+            :meth:`optika.systems.LinearSystem.weights`.
+        axis_wavelength
+            The logical axis of the scene corresponding to changing wavelength.
+            The weights are summed along this axis.
+        axis_scene
+            The axes of the weights, such as the channel axis,
+            along which the grid of the scene varies.
+            These axes are included in :attr:`shape_scene`,
+            so each channel sees a separate set of cells.
+        unit
+            The units of the weights.
+        """
+        weights, shape_input, shape_output = weights
+
+        shape_orthogonal = weights.shape
+
+        shape_field = {
+            ax: shape_input[ax] for ax in shape_input if ax not in shape_orthogonal
+        }
+        shape_pixel = {
+            ax: shape_output[ax] for ax in shape_output if ax not in shape_orthogonal
+        }
+        shape_channel = {
+            ax: shape_orthogonal[ax]
+            for ax in shape_orthogonal
+            if ax != axis_wavelength
+        }
+
+        num_field = math.prod(shape_field.values())
+        num_pixel = math.prod(shape_pixel.values())
+
+        shape_scene = {axis_wavelength: shape_orthogonal[axis_wavelength]}
+        shape_scene = shape_scene | {ax: shape_orthogonal[ax] for ax in axis_scene}
+        shape_scene = shape_scene | shape_field
+        shape_image = shape_channel | shape_pixel
+
+        rows = []
+        cols = []
+        data = []
+        for index in na.ndindex(shape_orthogonal):
+            index_weights = tuple(index[ax] for ax in weights.axes)
+            indices_input, indices_output, values = weights.ndarray[index_weights]
+
+            offset_image = 0
+            for ax in shape_channel:
+                offset_image = offset_image * shape_channel[ax] + index[ax]
+
+            offset_scene = 0
+            for ax in shape_scene:
+                if ax not in shape_field:
+                    offset_scene = offset_scene * shape_scene[ax] + index[ax]
+
+            rows.append(indices_output + offset_image * num_pixel)
+            cols.append(indices_input + offset_scene * num_field)
+            data.append(np.asarray(values))
+
+        matrix = scipy.sparse.csr_array(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(math.prod(shape_image.values()), math.prod(shape_scene.values())),
+        )
+
+        return cls(
+            matrix=matrix,
+            shape_scene=shape_scene,
+            shape_image=shape_image,
+            unit=unit,
+        )
+
+    @classmethod
+    def from_system(
+        cls,
+        system: optika.systems.LinearSystem,
+        coordinates: na.SpectralPositionalVectorArray,
+        axis_wavelength: str,
+        axis_field: tuple[str, str],
+    ) -> Self:
+        """
+        Compute the projection matrix of a linearized optical system.
+
+        Parameters
+        ----------
+        system
+            The linearized optical system,
+            usually an instance of :class:`esis.optics.InterpolatedSystem`.
+        coordinates
+            The vertices of each cell of the scene.
+            If the coordinates vary along the channel axis,
+            each channel sees its own grid of cells.
+        axis_wavelength
+            The logical axis corresponding to changing wavelength coordinate.
+        axis_field
+            The logical axes corresponding to changing field coordinate.
+        """
+        weights = system.weights(
+            coordinates=coordinates,
+            axis_wavelength=axis_wavelength,
+            axis_field=axis_field,
+        )
+        shape_orthogonal = weights[0].shape
+        return cls.from_weights(
+            weights=weights,
+            axis_wavelength=axis_wavelength,
+            axis_scene=tuple(
+                ax
+                for ax in coordinates.shape
+                if ax in shape_orthogonal and ax != axis_wavelength
+            ),
+            unit=system.weights_unit,
+        )
+
+    @classmethod
+    def from_instrument(
+        cls,
+        instrument: esis.optics.abc.AbstractInstrument,
+        coordinates: na.SpectralPositionalVectorArray,
+        axis_wavelength: str,
+        axis_field: tuple[str, str],
+        degree: int = 2,
+    ) -> Self:
+        """
+        Compute the projection matrix of an instrument.
+
+        The instrument is approximated using
+        :meth:`esis.optics.InterpolatedSystem.from_instrument`,
+        and the result is stored in :obj:`esis.cache`,
+        keyed on the parameters of the instrument and the grid of the scene,
+        so the ray trace and the regridding only run once for each instrument.
+
+        Parameters
+        ----------
+        instrument
+            The model of the optical system.
+        coordinates
+            The vertices of each cell of the scene.
+        axis_wavelength
+            The logical axis corresponding to changing wavelength coordinate.
+        axis_field
+            The logical axes corresponding to changing field coordinate.
+        degree
+            The degree of the polynomial distortion and vignetting models.
+        """
+        return _from_instrument(
+            instrument=instrument,
+            coordinates=coordinates,
+            axis_wavelength=axis_wavelength,
+            axis_field=axis_field,
+            degree=degree,
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """The number of rows and columns of :attr:`matrix`."""
+        return self.matrix.shape
+
+    def forward(
+        self,
+        scene: float | u.Quantity | na.AbstractScalar,
+    ) -> na.ScalarArray:
+        """
+        Project a scene onto the detectors.
+
+        Parameters
+        ----------
+        scene
+            The photon flux in each cell of the scene.
+            Any axes which are not in :attr:`shape_scene`, such as time,
+            are projected independently.
+        """
+        return self._apply(
+            matrix=self.matrix,
+            a=scene,
+            shape_input=self.shape_scene,
+            shape_output=self.shape_image,
+        )
+
+    def backward(
+        self,
+        image: float | u.Quantity | na.AbstractScalar,
+    ) -> na.ScalarArray:
+        """
+        Back-project an image into the scene.
+
+        This is a product with the transpose of :attr:`matrix`.
+
+        Parameters
+        ----------
+        image
+            The photon flux on each pixel of each detector.
+            Any axes which are not in :attr:`shape_image`, such as time,
+            are back-projected independently.
+        """
+        return self._apply(
+            matrix=self.matrix.T,
+            a=image,
+            shape_input=self.shape_image,
+            shape_output=self.shape_scene,
+        )
+
+    def _apply(
+        self,
+        matrix: scipy.sparse.sparray,
+        a: float | u.Quantity | na.AbstractScalar,
+        shape_input: dict[str, int],
+        shape_output: dict[str, int],
+    ) -> na.ScalarArray:
+
+        a = na.asanyarray(a)
+
+        unit = na.unit(a, unit_dimensionless=u.dimensionless_unscaled)
+
+        x, shape_batch = self.ravel(na.value(a), shape_input)
+
+        result = self.unravel(matrix @ x, shape_batch, shape_output)
+
+        return result << (unit * self.unit)
+
+    @staticmethod
+    def ravel(
+        a: float | na.AbstractScalar,
+        shape: dict[str, int],
+    ) -> tuple[np.ndarray, dict[str, int]]:
+        """
+        Flatten an array into a matrix with one row for each element of `shape`.
+
+        Each column of the result is one element of the remaining axes.
+        This is the layout expected by :attr:`matrix`,
+        so that many scenes or images can be projected with a single
+        matrix-matrix product.
+
+        Parameters
+        ----------
+        a
+            The array to flatten.
+        shape
+            The shape of each column,
+            usually :attr:`shape_scene` or :attr:`shape_image`.
+
+        Returns
+        -------
+        result
+            The flattened array.
+        shape_batch
+            The shape of the axes of `a` which are not in `shape`,
+            which is needed to restore the array using :meth:`unravel`.
+        """
+        a = na.asanyarray(a)
+        shape_batch = {ax: a.shape[ax] for ax in a.shape if ax not in shape}
+        result = na.broadcast_to(a, shape_batch | shape).ndarray
+        result = result.reshape(-1, math.prod(shape.values())).T
+        return result, shape_batch
+
+    @staticmethod
+    def unravel(
+        a: np.ndarray,
+        shape_batch: dict[str, int],
+        shape: dict[str, int],
+    ) -> na.ScalarArray:
+        """
+        Restore an array flattened by :meth:`ravel`.
+
+        Parameters
+        ----------
+        a
+            A matrix with one row for each element of `shape` and one column for
+            each element of `shape_batch`.
+        shape_batch
+            The shape of the columns of `a`.
+        shape
+            The shape of each column of `a`.
+        """
+        result = a.T.reshape(*shape_batch.values(), *shape.values())
+        return na.ScalarArray(
+            ndarray=result,
+            axes=tuple(shape_batch | shape),
+        )
+
+    def as_linear_operator(self) -> scipy.sparse.linalg.LinearOperator:
+        """
+        Represent this projection as a :class:`scipy.sparse.linalg.LinearOperator`.
+
+        This is the interface used by the iterative solvers in
+        :mod:`scipy.sparse.linalg`.
+        """
+        return scipy.sparse.linalg.aslinearoperator(self.matrix)
+
+
+@esis.cache.memoize(
+    paths=[
+        pathlib.Path(__file__),
+        pathlib.Path(__file__).parents[1]
+        / "_interpolated_systems/_interpolated_systems.py",
+        pathlib.Path(__file__).parents[1] / "_instruments/_instruments.py",
+    ],
+    packages=["optika", "named_arrays"],
+)
+def _from_instrument(
+    instrument: esis.optics.abc.AbstractInstrument,
+    coordinates: na.SpectralPositionalVectorArray,
+    axis_wavelength: str,
+    axis_field: tuple[str, str],
+    degree: int,
+) -> ProjectionOperator:
+    system = esis.optics.InterpolatedSystem.from_instrument(
+        instrument=instrument,
+        degree=degree,
+    )
+    return ProjectionOperator.from_system(
+        system=system,
+        coordinates=coordinates,
+        axis_wavelength=axis_wavelength,
+        axis_field=axis_field,
+    )
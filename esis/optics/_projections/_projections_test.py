@@ -0,0 +1,56 @@
+import pytest
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import esis
+
+_instrument = esis.flights.f1.optics.design(num_distribution=0)
+
+_coordinates = na.SpectralPositionalVectorArray(
+    wavelength=na.linspace(629, 631, axis="wavelength", num=3) * u.AA,
+    position=na.Cartesian2dVectorLinearSpace(
+        start=_instrument.system.field_min,
+        stop=_instrument.system.field_max,
+        axis=na.Cartesian2dVectorArray("field_x", "field_y"),
+        num=11,
+    ),
+)
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.ProjectionOperator.from_instrument(
+            instrument=_instrument,
+            coordinates=_coordinates,
+            axis_wavelength="wavelength",
+            axis_field=("field_x", "field_y"),
+        ),
+    ],
+)
+class TestProjectionOperator:
+
+    def test_shape(self, a: esis.optics.ProjectionOperator):
+        assert a.shape[0] == np.prod(list(a.shape_image.values()))
+        assert a.shape[1] == np.prod(list(a.shape_scene.values()))
+        assert "channel" in a.shape_image
+        assert a.shape_scene["wavelength"] == 2
+
+    def test_forward(self, a: esis.optics.ProjectionOperator):
+        scene = na.ScalarArray(np.ones(2), axes=("time",))
+        result = a.forward(scene)
+        assert result.shape == dict(time=2) | a.shape_image
+        assert na.unit_normalized(result).is_equivalent(u.cm**2)
+        assert np.all(result >= 0 * u.cm**2)
+        assert np.sum(result) > 0 * u.cm**2
+
+    def test_backward(self, a: esis.optics.ProjectionOperator):
+        scene = na.random.uniform(0, 1, shape_random=a.shape_scene, seed=1)
+        image = na.random.uniform(0, 1, shape_random=a.shape_image, seed=2)
+        forward = np.sum(a.forward(scene) * image)
+        backward = np.sum(scene * a.backward(image))
+        assert np.allclose(forward, backward)
+
+    def test_as_linear_operator(self, a: esis.optics.ProjectionOperator):
+        result = a.as_linear_operator()
+        assert result.shape == a.shape
@@ -0,0 +1,9 @@
+from ._registrations import (
+    FieldStopRegistrationResult,
+    FieldStopRegistration,
+)
+
+__all__ = [
+    "FieldStopRegistrationResult",
+    "FieldStopRegistration",
+]
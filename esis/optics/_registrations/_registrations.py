@@ -0,0 +1,380 @@
+from __future__ import annotations
+import functools
+import dataclasses
+import numpy as np
+import scipy.ndimage
+import scipy.spatial
+import astropy.units as u
+import named_arrays as na
+import esis
+
+__all__ = [
+    "FieldStopRegistrationResult",
+    "FieldStopRegistration",
+]
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class FieldStopRegistrationResult:
+    """
+    The rigid transformation of the image of the field stop.
+
+    This transformation moves the ray-traced image of the field stop
+    onto the observed image of the field stop, for each frame and channel.
+    """
+
+    offset: na.Cartesian2dVectorArray
+    """The translation of the observed image relative to the model."""
+
+    rotation: na.ScalarArray
+    """
+    The rotation of the observed image relative to the model,
+    about the center of the ray-traced image of the field stop.
+    """
+
+    merit: na.ScalarArray
+    """
+    The mean normalized edge strength along the transformed model,
+    which is close to one if the edges of the field stop were found.
+    """
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class FieldStopRegistration:
+    """
+    Measure the position and orientation of the image of the field stop.
+
+    The image of the field stop is measured in each channel of a sequence
+    of frames.
+
+    The edges of the field stop are found in each frame using the magnitude
+    of the Gaussian-smoothed gradient,
+    and the boundary of the ray-traced image of the field stop is rotated and
+    translated using Levenberg-Marquardt steps until it lies on top of these
+    edges.
+    A step is only accepted if it increases the edge strength along the
+    boundary, otherwise the damping factor is increased by a factor of ten.
+    The edge detection and the fit are vectorized over every frame and channel,
+    so the whole flight can be registered to track pointing jitter.
+
+    Examples
+    --------
+    Register the first few frames of the ESIS-I flight against the
+    O V image of the field stop in the distortion fit.
+
+    .. jupyter-execute::
+
+        import esis
+        from esis.flights.f1.spectrum import O_V
+
+        data = esis.flights.f1.data.level_1()[dict(time=slice(15, 18))]
+
+        registration = esis.optics.FieldStopRegistration(
+            instrument=esis.flights.f1.optics.distortion_fit(num_distribution=0),
+            wavelength=O_V.wavelength,
+        )
+
+        result = registration(data)
+
+        result.offset
+    """
+
+    instrument: esis.optics.abc.AbstractInstrument
+    """
+    The model used to compute the image of the field stop.
+    This should not have any uncertain parameters.
+    """
+
+    wavelength: None | u.Quantity = None
+    """
+    The wavelength of the spectral line which forms the image of the field
+    stop.
+    If :obj:`None` (the default),
+    the wavelength of :attr:`instrument` is used,
+    which should only contain one spectral line.
+    """
+
+    sigma: float = 2
+    """
+    The standard deviation in pixels of the Gaussian kernel used to
+    find the edges of the field stop.
+    """
+
+    num_point: int = 256
+    """The number of points on the boundary of the model of the field stop."""
+
+    num_iteration: int = 10
+    """The number of Levenberg-Marquardt steps to take."""
+
+    damping: float = 1e-3
+    """The initial Levenberg-Marquardt damping factor."""
+
+    num_batch: int = 4
+    """The number of frames to process at once, which bounds the memory usage."""
+
+    @functools.cached_property
+    def footprint(self) -> np.ndarray:
+        """
+        The boundary of the ray-traced image of the field stop in each channel.
+
+        The boundary is given in pixel coordinates.
+        This is an array of shape ``(channel, num_point, 2)`` computed from
+        the convex hull of the unvignetted rays.
+        """
+        instrument = self.instrument
+        if self.wavelength is not None:
+            instrument = dataclasses.replace(instrument, wavelength=self.wavelength)
+
+        axis_channel = instrument.axis_channel
+
+        system = instrument.system
+        rays = system.rayfunction_default.outputs
+        pixel = system.sensor.pixels(rays.position.xy)
+
+        x = na.nominal(na.value(pixel.x))
+        y = na.nominal(na.value(pixel.y))
+        where = na.nominal(rays.unvignetted)
+
+        shape = na.shape_broadcasted(x, y, where)
+        shape = {axis_channel: shape[axis_channel]} | shape
+        num_channel = shape[axis_channel]
+
+        x = na.broadcast_to(x, shape).ndarray.reshape(num_channel, -1)
+        y = na.broadcast_to(y, shape).ndarray.reshape(num_channel, -1)
+        where = na.broadcast_to(where, shape).ndarray.reshape(num_channel, -1)
+
+        result = []
+        for c in range(num_channel):
+            points = np.stack([x[c][where[c]], y[c][where[c]]], axis=~0)
+            hull = scipy.spatial.ConvexHull(points)
+            result.append(_resample(points[hull.vertices], self.num_point))
+
+        return np.stack(result)
+
+    def edges(
+        self,
+        image: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Compute the normalized edge strength of a batch of images.
+
+        Parameters
+        ----------
+        image
+            An array of images, where the last two axes are the
+            horizontal and vertical pixel axes.
+        """
+        sigma = self.sigma
+        axis = (~1, ~0)
+
+        image = image.astype(np.float32)
+
+        result = scipy.ndimage.gaussian_gradient_magnitude(image, sigma, axes=axis)
+        result = result / np.percentile(result, 99.9, axis=axis, keepdims=True)
+        result = np.minimum(result, 1)
+
+        return scipy.ndimage.gaussian_filter(result, sigma, axes=axis)
+
+    def _fit(
+        self,
+        edges: np.ndarray,
+        center: np.ndarray,
+        arm: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Fit the translation and rotation of the model to a batch of edge maps.
+
+        Parameters
+        ----------
+        edges
+            The edge strength of each image,
+            an array of shape ``(batch, x, y)``.
+        center
+            The center of the model in array indices,
+            an array of shape ``(batch, 1, 2)``.
+        arm
+            The boundary of the model relative to `center`,
+            an array of shape ``(batch, num_point, 2)``.
+
+        Returns
+        -------
+        parameters
+            The translation along each axis and the rotation in radians,
+            an array of shape ``(batch, 3)``.
+        merit
+            The mean edge strength along the transformed model.
+        """
+        num_batch = edges.shape[0]
+
+        gradient_x, gradient_y = np.gradient(edges, axis=(1, 2))
+
+        index = np.broadcast_to(np.arange(num_batch)[:, np.newaxis], arm.shape[:2])
+
+        identity = np.identity(3)
+
+        def _evaluate(parameters: np.ndarray) -> tuple[np.ndarray, ...]:
+            cos = np.cos(parameters[:, 2:])
+            sin = np.sin(parameters[:, 2:])
+            rx = cos * arm[..., 0] - sin * arm[..., 1]
+            ry = sin * arm[..., 0] + cos * arm[..., 1]
+            coordinates = np.stack(
+                arrays=[
+                    index,
+                    center[..., 0] + rx + parameters[:, 0:1],
+                    center[..., 1] + ry + parameters[:, 1:2],
+                ]
+            )
+            e = scipy.ndimage.map_coordinates(edges, coordinates, order=1)
+            return rx, ry, coordinates, e
+
+        parameters = np.zeros((num_batch, 3))
+        rx, ry, coordinates, e = _evaluate(parameters)
+        chi2 = np.square(1 - e).sum(axis=~0)
+
+        damping = np.full(num_batch, self.damping)
+
+        for i in range(self.num_iteration):
+
+            ex = scipy.ndimage.map_coordinates(gradient_x, coordinates, order=1)
+            ey = scipy.ndimage.map_coordinates(gradient_y, coordinates, order=1)
+
+            jacobian = np.stack([ex, ey, ey * rx - ex * ry], axis=~0)
+
+            hessian = np.einsum("bni,bnj->bij", jacobian, jacobian)
+            gradient = np.einsum("bni,bn->bi", jacobian, 1 - e)
+
+            diagonal = np.einsum("bii->bi", hessian)
+            diagonal = damping[..., np.newaxis] * diagonal
+            hessian = hessian + diagonal[..., np.newaxis] * identity
+
+            trial = parameters + np.einsum(
+                "bij,bj->bi",
+                np.linalg.pinv(hessian),
+                gradient,
+            )
+
+            rx_trial, ry_trial, coordinates_trial, e_trial = _evaluate(trial)
+            chi2_trial = np.square(1 - e_trial).sum(axis=~0)
+
+            accept = chi2_trial < chi2
+            where = accept[..., np.newaxis]
+
+            parameters = np.where(where, trial, parameters)
+            rx = np.where(where, rx_trial, rx)
+            ry = np.where(where, ry_trial, ry)
+            e = np.where(where, e_trial, e)
+            coordinates = np.where(where, coordinates_trial, coordinates)
+            chi2 = np.where(accept, chi2_trial, chi2)
+            damping = np.where(accept, damping / 10, damping * 10)
+
+        return parameters, e.mean(axis=~0)
+
+    def __call__(
+        self,
+        data: esis.data.abc.AbstractChannelData,
+    ) -> FieldStopRegistrationResult:
+        """
+        Register a sequence of frames.
+
+        Parameters
+        ----------
+        data
+            The frames to register.
+            Any axes other than the channel and pixel axes,
+            such as time, are registered independently.
+        """
+        axis_channel = data.axis_channel
+        axis_x = data.axis_x
+        axis_y = data.axis_y
+
+        outputs = na.value(data.outputs)
+
+        shape = outputs.shape
+        shape_frame = {ax: shape[ax] for ax in (axis_channel, axis_x, axis_y)}
+        shape_batch = {ax: shape[ax] for ax in shape if ax not in shape_frame}
+
+        num_channel, num_x, num_y = shape_frame.values()
+
+        image = na.broadcast_to(outputs, shape_batch | shape_frame).ndarray
+        image = image.reshape(-1, num_channel, num_x, num_y)
+
+        pixel = data.inputs.pixel
+        x = na.value(na.explicit(pixel.x))
+        y = na.value(na.explicit(pixel.y))
+        x = x[{ax: 0 for ax in x.shape if ax != axis_x}].ndarray
+        y = y[{ax: 0 for ax in y.shape if ax != axis_y}].ndarray
+
+        footprint = self.footprint
+        footprint = data.indices(
+            pixel=na.Cartesian2dVectorArray(
+                x=na.ScalarArray(footprint[..., 0], axes=(axis_channel, "point")),
+                y=na.ScalarArray(footprint[..., 1], axes=(axis_channel, "point")),
+            ),
+        )
+        footprint = np.stack([footprint.x.ndarray, footprint.y.ndarray], axis=~0)
+        center = footprint.mean(axis=1, keepdims=True)
+        arm = footprint - center
+
+        num_frame = image.shape[0]
+
+        parameters = np.empty((num_frame, num_channel, 3))
+        merit = np.empty((num_frame, num_channel))
+
+        for start in range(0, num_frame, self.num_batch):
+            s = slice(start, start + self.num_batch)
+            edges = self.edges(image[s])
+            num = edges.shape[0]
+            p, m = self._fit(
+                edges=edges.reshape(-1, num_x, num_y),
+                center=np.concatenate([center] * num),
+                arm=np.concatenate([arm] * num),
+            )
+            parameters[s] = p.reshape(num, num_channel, 3)
+            merit[s] = m.reshape(num, num_channel)
+
+        spacing_x = (x[~0] - x[0]) / (x.size - 1)
+        spacing_y = (y[~0] - y[0]) / (y.size - 1)
+
+        axes = tuple(shape_batch) + (axis_channel,)
+        shape_result = tuple(shape_batch.values()) + (num_channel,)
+
+        def _result(a: np.ndarray) -> na.ScalarArray:
+            return na.ScalarArray(a.reshape(shape_result), axes=axes)
+
+        return FieldStopRegistrationResult(
+            offset=na.Cartesian2dVectorArray(
+                x=_result(parameters[..., 0] * spacing_x),
+                y=_result(parameters[..., 1] * spacing_y),
+            )
+            << u.pix,
+            rotation=_result(parameters[..., 2] * np.sign(spacing_x * spacing_y))
+            << u.rad,
+            merit=_result(merit),
+        )
+
+
+def _resample(
+    vertices: np.ndarray,
+    num: int,
+) -> np.ndarray:
+    """
+    Sample points evenly spaced along the perimeter of a polygon.
+
+    Parameters
+    ----------
+    vertices
+        The vertices of the polygon, an array of shape ``(num_vertex, 2)``.
+    num
+        The number of points to sample.
+    """
+    closed = np.concatenate([vertices, vertices[:1]])
+    length = np.linalg.norm(np.diff(closed, axis=0), axis=~0)
+    s = np.concatenate([[0], np.cumsum(length)])
+    t = np.linspace(0, s[~0], num=num, endpoint=False)
+    return np.stack(
+        arrays=[
+            np.interp(t, s, closed[:, 0]),
+            np.interp(t, s, closed[:, 1]),
+        ],
+        axis=~0,
+    )
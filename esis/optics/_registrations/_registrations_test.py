@@ -0,0 +1,83 @@
+import pytest
+import dataclasses
+import numpy as np
+import astropy.units as u
+import esis
+from esis.flights.f1.spectrum import O_V
+from ._registrations import _resample
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.FieldStopRegistration(
+            instrument=esis.flights.f1.optics.distortion_fit(num_distribution=0),
+            wavelength=O_V.wavelength,
+            num_iteration=3,
+            num_batch=1,
+        ),
+    ],
+)
+class TestFieldStopRegistration:
+
+    def test_footprint(self, a: esis.optics.FieldStopRegistration):
+        result = a.footprint
+        assert result.shape[1:] == (a.num_point, 2)
+        assert np.all(np.isfinite(result))
+
+    def test_edges(self, a: esis.optics.FieldStopRegistration):
+        image = np.zeros((2, 64, 64))
+        image[:, 16:48, 16:48] = 1
+        result = a.edges(image)
+        assert result.shape == image.shape
+        assert np.all(result <= 1)
+        assert result[:, 16, 32].min() > result[:, 32, 32].max()
+
+    @pytest.mark.parametrize(
+        argnames="shift,angle",
+        argvalues=[
+            ((2.5, -1.5), 0 * u.deg),
+            ((0, 0), 2 * u.deg),
+            ((-1, 2), -1 * u.deg),
+        ],
+    )
+    def test_fit(
+        self,
+        a: esis.optics.FieldStopRegistration,
+        shift: tuple[float, float],
+        angle: u.Quantity,
+    ):
+        num = 256
+        half = 100
+        angle = angle.to_value(u.rad)
+        center = np.array([num / 2, num / 2])
+        x, y = np.meshgrid(np.arange(num), np.arange(num), indexing="ij")
+        dx = x - center[0] - shift[0]
+        dy = y - center[1] - shift[1]
+        rx = np.cos(angle) * dx + np.sin(angle) * dy
+        ry = -np.sin(angle) * dx + np.cos(angle) * dy
+        image = (np.abs(rx) < half) & (np.abs(ry) < half)
+
+        vertices = half * np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]])
+        arm = _resample(vertices, a.num_point)
+
+        a = dataclasses.replace(a, num_iteration=50)
+        parameters, merit = a._fit(
+            edges=a.edges(image[np.newaxis]),
+            center=center[np.newaxis, np.newaxis],
+            arm=arm[np.newaxis],
+        )
+        assert np.allclose(parameters[0, :2], shift, atol=0.1)
+        assert np.allclose(parameters[0, 2], angle, atol=np.deg2rad(0.05))
+        assert merit[0] > 0.5
+
+    def test__call__(self, a: esis.optics.FieldStopRegistration):
+        data = esis.flights.f1.data.level_1()[dict(time=slice(15, 17))]
+        result = a(data)
+        assert isinstance(result, esis.optics.FieldStopRegistrationResult)
+        assert result.offset.shape == {
+            data.axis_time: 2,
+            data.axis_channel: data.shape[data.axis_channel],
+        }
+        assert result.rotation.unit.is_equivalent(u.deg)
+        assert np.all(result.merit >= 0)
@@ -0,0 +1,6 @@
+from ._throughputs import SurfaceEfficiency, Throughput
+
+__all__ = [
+    "SurfaceEfficiency",
+    "Throughput",
+]
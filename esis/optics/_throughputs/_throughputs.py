@@ -0,0 +1,349 @@
+from __future__ import annotations
+from typing_extensions import Self
+import functools
+import dataclasses
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import optika
+import esis
+
+__all__ = [
+    "SurfaceEfficiency",
+    "Throughput",
+]
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class SurfaceEfficiency:
+    """
+    A lookup table of the efficiency of an optical surface.
+
+    The table is a function of wavelength and angle of incidence.
+    The efficiency is the product of the efficiency of the material
+    and, if the surface has rulings, the diffraction efficiency of the rulings.
+    """
+
+    wavelength: na.ScalarArray
+    """The evenly-spaced wavelengths of the table."""
+
+    angle: na.ScalarArray
+    """The evenly-spaced angles of incidence of the table."""
+
+    efficiency: na.AbstractScalar
+    """The efficiency at each wavelength and angle of incidence."""
+
+    axis_wavelength: str = "wavelength"
+    """The logical axis of the table corresponding to changing wavelength."""
+
+    axis_angle: str = "angle"
+    """The logical axis of the table corresponding to changing angle."""
+
+    @classmethod
+    def from_surface(
+        cls,
+        surface: optika.surfaces.AbstractSurface,
+        wavelength: na.ScalarArray,
+        angle: na.ScalarArray,
+        axis_wavelength: str = "wavelength",
+        axis_angle: str = "angle",
+    ) -> Self:
+        """
+        Compute the efficiency table of an optical surface.
+
+        Parameters
+        ----------
+        surface
+            The surface to evaluate.
+        wavelength
+            The evenly-spaced wavelengths at which to evaluate the surface.
+        angle
+            The evenly-spaced angles of incidence at which to evaluate
+            the surface.
+        axis_wavelength
+            The logical axis of `wavelength`.
+        axis_angle
+            The logical axis of `angle`.
+        """
+        rays = optika.rays.RayVectorArray(
+            wavelength=wavelength,
+            position=na.Cartesian3dVectorArray() * u.mm,
+            direction=na.Cartesian3dVectorArray(np.sin(angle), 0, np.cos(angle)),
+        )
+        normal = na.Cartesian3dVectorArray(0, 0, -1)
+
+        efficiency = 1
+        if surface.material is not None:
+            efficiency = efficiency * surface.material.efficiency(rays, normal)
+        if surface.rulings is not None:
+            efficiency = efficiency * surface.rulings.efficiency(rays, normal)
+
+        return cls(
+            wavelength=wavelength,
+            angle=angle,
+            efficiency=na.as_named_array(efficiency),
+            axis_wavelength=axis_wavelength,
+            axis_angle=axis_angle,
+        )
+
+    def __call__(
+        self,
+        wavelength: u.Quantity | na.AbstractScalar,
+        angle: u.Quantity | na.AbstractScalar,
+    ) -> na.AbstractScalar:
+        """
+        Interpolate the table.
+
+        Parameters
+        ----------
+        wavelength
+            The wavelength of the incident light.
+        angle
+            The angle of incidence of the light.
+        """
+        axis_angle = self.axis_angle
+
+        efficiency = na.broadcast_to(
+            self.efficiency,
+            na.broadcast_shapes(
+                self.efficiency.shape,
+                self.wavelength.shape,
+                self.angle.shape,
+            ),
+        )
+
+        result = na.interp(
+            x=wavelength,
+            xp=self.wavelength,
+            fp=efficiency,
+            axis=self.axis_wavelength,
+        )
+
+        num = self.angle.shape[axis_angle]
+        start = self.angle[{axis_angle: 0}]
+        step = self.angle[{axis_angle: 1}] - start if num > 1 else 1 * u.rad
+        index = ((angle - start) / step).to(u.dimensionless_unscaled).value
+        index = np.minimum(np.maximum(index, 0), num - 1)
+
+        weight = 1 - np.abs(index - na.arange(0, num, axis=axis_angle))
+
+        return (np.maximum(weight, 0) * result).sum(axis=axis_angle)
+
+
+@dataclasses.dataclass(eq=False, repr=False)
+class Throughput:
+    """
+    Fast effective-area curves computed from cached lookup tables.
+
+    The instrument is traced once on a coarse wavelength grid to find the
+    mean angle of incidence on each surface and the effective area.
+    The coarse grid lies strictly inside the passband of every channel,
+    so that some rays reach the sensor at each traced wavelength.
+    The effective area is divided by the product of the efficiency of each
+    surface to find the remaining geometric factor,
+    which includes the collecting area, vignetting, and the absorbance
+    of the sensor and varies slowly with wavelength.
+    The efficiency of each surface is tabulated on a dense grid of
+    wavelength and angle,
+    so the effective area at any wavelength is a product of interpolated
+    tables and no further ray tracing is needed.
+
+    Examples
+    --------
+    Plot the effective area of the ESIS-I design.
+
+    .. jupyter-execute::
+
+        import matplotlib.pyplot as plt
+        import astropy.units as u
+        import astropy.visualization
+        import named_arrays as na
+        import esis
+
+        instrument = esis.flights.f1.optics.design(num_distribution=0)
+
+        throughput = instrument.throughput
+
+        wavelength = na.linspace(
+            start=instrument.wavelength_min.min().ndarray,
+            stop=instrument.wavelength_max.max().ndarray,
+            axis="wavelength",
+            num=1001,
+        )
+
+        area = throughput.area_effective(wavelength)
+
+        with astropy.visualization.quantity_support():
+            fig, ax = plt.subplots(constrained_layout=True)
+            na.plt.plot(wavelength, area, axis="wavelength", ax=ax);
+            ax.set_xlabel(f"wavelength ({ax.get_xlabel()})");
+            ax.set_ylabel(f"effective area ({ax.get_ylabel()})");
+    """
+
+    instrument: esis.optics.abc.AbstractInstrument
+    """
+    The model of the optical system.
+    This should not have any uncertain parameters.
+    """
+
+    num_wavelength: int = 1001
+    """The number of wavelengths in each efficiency table."""
+
+    num_angle: int = 5
+    """The number of angles of incidence in each efficiency table."""
+
+    num_wavelength_trace: int = 11
+    """The number of wavelengths at which to trace the instrument."""
+
+    axis_wavelength: str = "_wavelength_throughput"
+    """The logical axis corresponding to changing wavelength in the tables."""
+
+    axis_angle: str = "_angle_throughput"
+    """The logical axis corresponding to changing angle in the tables."""
+
+    def _wavelength(self, num: int) -> na.ScalarArray:
+        instrument = self.instrument
+        wavelength_min = na.nominal(instrument.wavelength_min).min()
+        wavelength_max = na.nominal(instrument.wavelength_max).max()
+        return na.linspace(
+            start=na.as_named_array(wavelength_min).ndarray.to(u.AA),
+            stop=na.as_named_array(wavelength_max).ndarray.to(u.AA),
+            axis=self.axis_wavelength,
+            num=num,
+        )
+
+    @functools.cached_property
+    def _instrument_traced(self) -> esis.optics.abc.AbstractInstrument:
+        instrument = self.instrument
+        axis = self.axis_wavelength
+        wavelength_min = na.nominal(instrument.wavelength_min).max()
+        wavelength_max = na.nominal(instrument.wavelength_max).min()
+        wavelength = na.linspace(
+            start=na.as_named_array(wavelength_min).ndarray.to(u.AA),
+            stop=na.as_named_array(wavelength_max).ndarray.to(u.AA),
+            axis=axis,
+            num=self.num_wavelength_trace + 2,
+        )
+        return dataclasses.replace(
+            instrument,
+            wavelength=wavelength[{axis: slice(1, ~0)}],
+        )
+
+    @property
+    def surfaces(self) -> dict[str, optika.surfaces.AbstractSurface]:
+        """The primary mirror, the grating, and the filter, keyed by name."""
+        instrument = self._instrument_traced
+        names = [
+            instrument.primary_mirror.surface.name,
+            instrument.grating.surface.name,
+            instrument.filter.surface.name,
+        ]
+        return {s.name: s for s in instrument.system.surfaces_all if s.name in names}
+
+    @functools.cached_property
+    def angles(self) -> dict[str, na.AbstractScalar]:
+        """
+        The mean angle of incidence of the unvignetted rays on each surface.
+
+        The angles are evaluated at each of the traced wavelengths.
+        """
+        instrument = self._instrument_traced
+        system = instrument.system
+        axis_surface = system.axis_surface
+
+        rays = system.raytrace().outputs
+
+        where = rays.unvignetted[{axis_surface: ~0}]
+        axis = tuple(
+            ax
+            for ax in where.shape
+            if ax not in (self.axis_wavelength, instrument.axis_channel)
+        )
+
+        surfaces_all = system.surfaces_all
+        result = dict()
+        for name, surface in self.surfaces.items():
+            index = surfaces_all.index(surface)
+            before = surface.transformation.inverse(rays[{axis_surface: index - 1}])
+            after = surface.transformation.inverse(rays[{axis_surface: index}])
+            normal = surface.sag.normal(after.position)
+            angle = np.arccos(np.abs(before.direction @ normal)).to(u.deg)
+            result[name] = angle.mean(axis=axis, where=where)
+
+        return result
+
+    @functools.cached_property
+    def efficiencies(self) -> dict[str, SurfaceEfficiency]:
+        """The efficiency table of each surface."""
+        wavelength = self._wavelength(self.num_wavelength)
+        result = dict()
+        for name, surface in self.surfaces.items():
+            angle = self.angles[name]
+            angle_min = np.nanmin(na.as_named_array(angle).ndarray) - 0.1 * u.deg
+            angle_max = np.nanmax(na.as_named_array(angle).ndarray) + 0.1 * u.deg
+            result[name] = SurfaceEfficiency.from_surface(
+                surface=surface,
+                wavelength=wavelength,
+                angle=na.linspace(
+                    start=angle_min,
+                    stop=angle_max,
+                    axis=self.axis_angle,
+                    num=self.num_angle,
+                ),
+                axis_wavelength=self.axis_wavelength,
+                axis_angle=self.axis_angle,
+            )
+        return result
+
+    @functools.cached_property
+    def geometry(self) -> na.AbstractScalar:
+        """
+        The effective area divided by the efficiency of each surface.
+
+        This is evaluated at each of the traced wavelengths and includes
+        the collecting area, the vignetting, and the absorbance of the sensor.
+        Wherever the efficiency is zero, the geometry is taken to be zero.
+        """
+        instrument = self._instrument_traced
+        wavelength = instrument.wavelength
+        area = instrument.system.area_effective(wavelength=wavelength, seed=0)
+        area = na.nominal(area(wavelength))
+        efficiency = self._efficiency(wavelength)
+        where = efficiency > 0
+        return np.where(where, area / np.where(where, efficiency, 1), 0 * area)
+
+    def _efficiency(
+        self,
+        wavelength: u.Quantity | na.AbstractScalar,
+    ) -> na.AbstractScalar:
+        wavelength_traced = self._instrument_traced.wavelength
+        result = 1
+        for name, table in self.efficiencies.items():
+            angle = na.interp(
+                x=wavelength,
+                xp=wavelength_traced,
+                fp=self.angles[name],
+                axis=self.axis_wavelength,
+            )
+            result = result * table(wavelength, angle)
+        return result
+
+    def area_effective(
+        self,
+        wavelength: u.Quantity | na.AbstractScalar,
+    ) -> na.AbstractScalar:
+        """
+        Compute the effective area of each channel without tracing any rays.
+
+        Parameters
+        ----------
+        wavelength
+            The wavelengths at which to evaluate the effective area.
+        """
+        geometry = na.interp(
+            x=wavelength,
+            xp=self._instrument_traced.wavelength,
+            fp=self.geometry,
+            axis=self.axis_wavelength,
+        )
+        return geometry * self._efficiency(wavelength)
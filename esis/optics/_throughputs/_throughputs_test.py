@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+import astropy.units as u
+import named_arrays as na
+import esis
+
+
+@pytest.mark.parametrize(
+    argnames="a",
+    argvalues=[
+        esis.optics.Throughput(
+            instrument=esis.flights.f1.optics.design(num_distribution=0),
+            num_wavelength=101,
+            num_wavelength_trace=5,
+        ),
+    ],
+)
+class TestThroughput:
+
+    def test_angles(self, a: esis.optics.Throughput):
+        result = a.angles
+        assert len(result) == 3
+        for angle in result.values():
+            assert np.all(angle >= 0 * u.deg)
+            assert np.all(angle < 90 * u.deg)
+
+    def test_efficiencies(self, a: esis.optics.Throughput):
+        result = a.efficiencies
+        assert set(result) == set(a.angles)
+        for table in result.values():
+            assert isinstance(table, esis.optics.SurfaceEfficiency)
+            assert np.all(table.efficiency >= 0)
+            assert np.all(table.efficiency <= 1)
+
+    def test_area_effective(self, a: esis.optics.Throughput):
+        wavelength = na.linspace(
+            start=na.nominal(a.instrument.wavelength_min).min().ndarray,
+            stop=na.nominal(a.instrument.wavelength_max).max().ndarray,
+            axis="wavelength",
+            num=11,
+        )
+        result = a.area_effective(wavelength)
+        assert "wavelength" in result.shape
+        assert result.unit.is_equivalent(u.cm**2)
+        assert np.all(result >= 0 * u.cm**2)
+
+        instrument = a._instrument_traced
+        wavelength = instrument.wavelength
+        result = a.area_effective(wavelength)
+        expected = instrument.system.area_effective(wavelength=wavelength, seed=0)
+        expected = na.nominal(expected(wavelength))
+        assert np.allclose(result, expected, rtol=1e-3, atol=1e-6 * u.cm**2)